@@ -3,10 +3,15 @@ from fastapi import APIRouter
 from .routes.clients import router as clients_router
 from .routes.components import router as components_router
 from .routes.customers import router as customers_router
+from .routes.exports import router as exports_router
 from .routes.filter_plants import router as filter_plants_router
 from .routes.health import router as health_router
+from .routes.imports import router as imports_router
 from .routes.manufacturers import router as manufacturers_router
+from .routes.report_exports import router as report_exports_router
 from .routes.reports import router as reports_router
+from .routes.search import router as search_router
+from .routes.stats import router as stats_router
 
 api_router = APIRouter()
 
@@ -16,4 +21,10 @@ api_router.include_router(customers_router)
 api_router.include_router(manufacturers_router)
 api_router.include_router(filter_plants_router)
 api_router.include_router(components_router)
+# Before the reports router so /reports/exports is not taken for a report id.
+api_router.include_router(report_exports_router)
 api_router.include_router(reports_router)
+api_router.include_router(imports_router)
+api_router.include_router(exports_router)
+api_router.include_router(search_router)
+api_router.include_router(stats_router)
@@ -1,24 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
+from ...core.etag import entity_etag, not_modified, page_etag
+from ...core.pagination import PageParams, page_params
 from ...models import Client
 from ...schemas import ClientCreate, ClientRead
+from ...services.reference_data import get_reference, invalidate, list_references
+from ..routing import SessionRoute
 
-router = APIRouter(prefix="/clients", tags=["clients"])
+router = APIRouter(prefix="/clients", tags=["clients"], route_class=SessionRoute)
 
 
 @router.get("", response_model=list[ClientRead])
-def list_clients(db: Session = Depends(get_db)):
-    return db.query(Client).order_by(Client.id.asc()).all()
+def list_clients(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    items = list_references(db, Client, response, page)
+    return not_modified(request, response, page_etag(response, items)) or items
 
 
 @router.get("/{client_id}", response_model=ClientRead)
-def get_client(client_id: int, db: Session = Depends(get_db)):
-    client = db.get(Client, client_id)
+def get_client(
+    client_id: int, request: Request, response: Response, db: Session = Depends(get_db)
+):
+    client = get_reference(db, Client, client_id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found.")
-    return client
+    return not_modified(request, response, entity_etag(client)) or client
 
 
 @router.post("", response_model=ClientRead, status_code=201)
@@ -29,6 +41,7 @@ def create_client(payload: ClientCreate, db: Session = Depends(get_db)):
 
     client = Client(name=name)
     db.add(client)
+    invalidate(db, Client)
     db.commit()
     db.refresh(client)
     return client
@@ -1,25 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
+from ...core.etag import check_if_match, entity_etag, not_modified, page_etag
+from ...core.response_cache import invalidate_on_commit, tag_response
+from ...core.pagination import PageParams, page_params, paginate
 from ...models import Component, FilterPlant
-from ...schemas import ComponentCreate, ComponentRead, ComponentUpdate
+from ...schemas import (
+    BatchCreate,
+    BatchResult,
+    ComponentBatchItem,
+    ComponentCreate,
+    ComponentRead,
+    ComponentUpdate,
+)
+from ...services.batch import existing_ids, write_batch
+from ...services.deletion import delete_entity
+from ..routing import SessionRoute, cached_response
 
-router = APIRouter(tags=["components"])
+router = APIRouter(tags=["components"], route_class=SessionRoute)
 
 
 @router.get("/filter-plants/{filter_plant_id}/components", response_model=list[ComponentRead])
-def list_components(filter_plant_id: int, db: Session = Depends(get_db)):
+@cached_response
+def list_components(
+    filter_plant_id: int,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
     filter_plant = db.get(FilterPlant, filter_plant_id)
     if not filter_plant:
         raise HTTPException(status_code=404, detail="Filter plant not found.")
 
-    return (
-        db.query(Component)
-        .filter(Component.filter_plant_id == filter_plant_id)
-        .order_by(Component.id.asc())
-        .all()
+    # Tagged with the customer as well, whose deletion removes the plant.
+    tag_response(
+        request, f"filter_plant:{filter_plant_id}", f"customer:{filter_plant.customer_id}"
     )
+    items = paginate(
+        db.query(Component).filter(Component.filter_plant_id == filter_plant_id),
+        response,
+        page,
+        Component.id,
+    )
+    return not_modified(request, response, page_etag(response, items)) or items
 
 
 @router.post(
@@ -38,43 +63,92 @@ def create_component(
 
     component = Component(filter_plant_id=filter_plant_id, name=name)
     db.add(component)
+    invalidate_on_commit(db, f"filter_plant:{filter_plant_id}")
     db.commit()
     db.refresh(component)
     return component
 
 
+@router.post("/components/batch", response_model=BatchResult)
+def create_components_batch(
+    payload: BatchCreate[ComponentBatchItem], db: Session = Depends(get_db)
+):
+    filter_plants = existing_ids(
+        db, FilterPlant.id, (item.filter_plant_id for item in payload.items)
+    )
+
+    entries = []
+    errors = {}
+    for index, item in enumerate(payload.items):
+        name = item.name.strip()
+        if item.filter_plant_id not in filter_plants:
+            errors[index] = "Filter plant not found."
+        elif not name:
+            errors[index] = "Name is required."
+        else:
+            entries.append(
+                (
+                    index,
+                    {
+                        "filter_plant_id": item.filter_plant_id,
+                        "name": name,
+                        "external_ref": item.external_ref,
+                    },
+                )
+            )
+
+    result = write_batch(db, Component, "filter_plant_id", entries, errors, payload.upsert)
+    invalidate_on_commit(
+        db, *{f"filter_plant:{values['filter_plant_id']}" for _, values in entries}
+    )
+    db.commit()
+    return result
+
+
 @router.get("/components/{component_id}", response_model=ComponentRead)
-def get_component(component_id: int, db: Session = Depends(get_db)):
+def get_component(
+    component_id: int, request: Request, response: Response, db: Session = Depends(get_db)
+):
     component = db.get(Component, component_id)
     if not component:
         raise HTTPException(status_code=404, detail="Component not found.")
-    return component
+    return not_modified(request, response, entity_etag(component)) or component
 
 
 @router.patch("/components/{component_id}", response_model=ComponentRead)
 def update_component(
-    component_id: int, payload: ComponentUpdate, db: Session = Depends(get_db)
+    component_id: int,
+    payload: ComponentUpdate,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
 ):
     component = db.get(Component, component_id)
     if not component:
         raise HTTPException(status_code=404, detail="Component not found.")
+    check_if_match(request, entity_etag(component))
 
     name = payload.name.strip()
     if not name:
         raise HTTPException(status_code=400, detail="Name is required.")
 
     component.name = name
+    invalidate_on_commit(db, f"filter_plant:{component.filter_plant_id}")
     db.commit()
     db.refresh(component)
+    response.headers["ETag"] = entity_etag(component)
     return component
 
 
 @router.delete("/components/{component_id}", status_code=204)
-def delete_component(component_id: int, db: Session = Depends(get_db)):
+def delete_component(
+    component_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     component = db.get(Component, component_id)
     if not component:
         raise HTTPException(status_code=404, detail="Component not found.")
 
-    db.delete(component)
+    delete_entity(db, component, background_tasks)
+    invalidate_on_commit(db, f"filter_plant:{component.filter_plant_id}")
     db.commit()
     return None
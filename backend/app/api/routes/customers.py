@@ -1,24 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session, joinedload, load_only
 
 from ...core.database import get_db
+from ...core.etag import check_if_match, entity_etag, not_modified, page_etag
+from ...core.fieldsets import FieldSet, SparseFields
+from ...core.response_cache import invalidate_on_commit
+from ...core.pagination import PageParams, page_params, paginate
 from ...models import Client, Customer
-from ...schemas import CustomerCreate, CustomerRead, CustomerUpdate
-
-router = APIRouter(prefix="/customers", tags=["customers"])
+from ...schemas import (
+    BatchCreate,
+    BatchResult,
+    CustomerBatchItem,
+    CustomerCreate,
+    CustomerDashboardRead,
+    CustomerExpandedRead,
+    CustomerRead,
+    CustomerUpdate,
+)
+from ...services.batch import existing_ids, write_batch
+from ...services.deletion import delete_entity
+from ...services.customer_dashboard import customer_dashboard
+from ...services.reference_data import get_reference
+from ..routing import SessionRoute
+
+router = APIRouter(prefix="/customers", tags=["customers"], route_class=SessionRoute)
+
+customer_fields = SparseFields(CustomerExpandedRead, relations={"client": "client_name"})
+
+
+def _customer_options(fieldset: FieldSet) -> list:
+    options = [load_only(*fieldset.columns(Customer, "version"))]
+    if "client" in fieldset.include:
+        options.append(joinedload(Customer.client).load_only(Client.name, Client.version))
+    return options
 
 
 @router.get("", response_model=list[CustomerRead])
-def list_customers(db: Session = Depends(get_db)):
-    return db.query(Customer).order_by(Customer.id.asc()).all()
+def list_customers(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fieldset: FieldSet = Depends(customer_fields),
+    db: Session = Depends(get_db),
+):
+    items = paginate(
+        db.query(Customer).options(*_customer_options(fieldset)), response, page, Customer.id
+    )
+    etag = page_etag(response, items, key=fieldset.versions)
+    return not_modified(request, response, etag) or fieldset.render(response, items)
 
 
 @router.get("/{customer_id}", response_model=CustomerRead)
-def get_customer(customer_id: int, db: Session = Depends(get_db)):
-    customer = db.get(Customer, customer_id)
+def get_customer(
+    customer_id: int,
+    request: Request,
+    response: Response,
+    fieldset: FieldSet = Depends(customer_fields),
+    db: Session = Depends(get_db),
+):
+    customer = db.get(Customer, customer_id, options=_customer_options(fieldset))
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found.")
-    return customer
+    etag = entity_etag(customer, *fieldset.embedded(customer))
+    return not_modified(request, response, etag) or fieldset.render(response, customer)
+
+
+@router.get("/{customer_id}/dashboard", response_model=CustomerDashboardRead)
+def get_customer_dashboard(customer_id: int, db: Session = Depends(get_db)):
+    dashboard = customer_dashboard(db, customer_id)
+    if dashboard is None:
+        raise HTTPException(status_code=404, detail="Customer not found.")
+    return dashboard
 
 
 @router.post("", response_model=CustomerRead, status_code=201)
@@ -27,8 +79,7 @@ def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
     if not name:
         raise HTTPException(status_code=400, detail="Name is required.")
 
-    client = db.get(Client, payload.client_id)
-    if not client:
+    if not get_reference(db, Client, payload.client_id):
         raise HTTPException(status_code=404, detail="Client not found.")
 
     customer = Customer(name=name, client_id=payload.client_id)
@@ -38,33 +89,74 @@ def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
     return customer
 
 
+@router.post("/batch", response_model=BatchResult)
+def create_customers_batch(
+    payload: BatchCreate[CustomerBatchItem], db: Session = Depends(get_db)
+):
+    clients = existing_ids(db, Client.id, (item.client_id for item in payload.items))
+
+    entries = []
+    errors = {}
+    for index, item in enumerate(payload.items):
+        name = item.name.strip()
+        if not name:
+            errors[index] = "Name is required."
+        elif item.client_id not in clients:
+            errors[index] = "Client not found."
+        else:
+            entries.append(
+                (
+                    index,
+                    {"client_id": item.client_id, "name": name, "external_ref": item.external_ref},
+                )
+            )
+
+    result = write_batch(db, Customer, "client_id", entries, errors, payload.upsert)
+    invalidate_on_commit(
+        db, *(f"customer:{item.id}" for item in result.items if item.status == "updated")
+    )
+    db.commit()
+    return result
+
+
 @router.patch("/{customer_id}", response_model=CustomerRead)
-def update_customer(customer_id: int, payload: CustomerUpdate, db: Session = Depends(get_db)):
+def update_customer(
+    customer_id: int,
+    payload: CustomerUpdate,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
     customer = db.get(Customer, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found.")
+    check_if_match(request, entity_etag(customer))
 
     name = payload.name.strip()
     if not name:
         raise HTTPException(status_code=400, detail="Name is required.")
 
-    client = db.get(Client, payload.client_id)
-    if not client:
+    if not get_reference(db, Client, payload.client_id):
         raise HTTPException(status_code=404, detail="Client not found.")
 
     customer.name = name
     customer.client_id = payload.client_id
+    invalidate_on_commit(db, f"customer:{customer.id}")
     db.commit()
     db.refresh(customer)
+    response.headers["ETag"] = entity_etag(customer)
     return customer
 
 
 @router.delete("/{customer_id}", status_code=204)
-def delete_customer(customer_id: int, db: Session = Depends(get_db)):
+def delete_customer(
+    customer_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     customer = db.get(Customer, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found.")
 
-    db.delete(customer)
+    delete_entity(db, customer, background_tasks)
+    invalidate_on_commit(db, f"customer:{customer.id}")
     db.commit()
     return None
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from ...schemas import ReportFilter
+from ...services.data_export import MEDIA_TYPES, iter_inventory, iter_reports
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+def export_format(format: str = Query("ndjson", pattern="^(csv|ndjson)$")) -> str:
+    return format
+
+
+def _response(chunks, fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@router.get("/reports")
+def export_reports(
+    filters: ReportFilter = Query(),
+    format: str = Depends(export_format),
+):
+    return _response(iter_reports(filters, format), format, "berichte")
+
+
+@router.get("/inventory")
+def export_inventory(
+    format: str = Depends(export_format),
+    client_id: int | None = None,
+    customer_id: int | None = None,
+):
+    return _response(iter_inventory(format, client_id, customer_id), format, "inventar")
@@ -1,33 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 
 from ...core.database import get_db
-from ...models import Customer, FilterPlant, Manufacturer
-from ...schemas import FilterPlantCreate, FilterPlantRead, FilterPlantUpdate
+from ...core.etag import check_if_match, entity_etag, not_modified, page_etag
+from ...core.fieldsets import FieldSet, SparseFields
+from ...core.response_cache import invalidate_on_commit, tag_response
+from ...core.pagination import PageParams, page_params, paginate
+from ...models import Component, Customer, FilterPlant, Manufacturer
+from ...schemas import (
+    BatchCreate,
+    BatchResult,
+    FilterPlantBatchItem,
+    FilterPlantCreate,
+    FilterPlantExpandedRead,
+    FilterPlantRead,
+    FilterPlantUpdate,
+)
+from ...services.batch import existing_ids, write_batch
+from ...services.deletion import delete_entity
+from ...services.reference_data import get_reference
+from ..routing import SessionRoute, cached_response
+
+router = APIRouter(tags=["filter-plants"], route_class=SessionRoute)
+
+filter_plant_fields = SparseFields(
+    FilterPlantExpandedRead,
+    relations={"manufacturer": "manufacturer_name", "components": "components"},
+)
+
 
-router = APIRouter(tags=["filter-plants"])
+def _filter_plant_options(fieldset: FieldSet) -> list:
+    options = [load_only(*fieldset.columns(FilterPlant, "version"))]
+    if "manufacturer" in fieldset.include:
+        options.append(
+            joinedload(FilterPlant.manufacturer).load_only(Manufacturer.name, Manufacturer.version)
+        )
+    if "components" in fieldset.include:
+        options.append(
+            selectinload(FilterPlant.components).load_only(
+                Component.filter_plant_id, Component.name, Component.version
+            )
+        )
+    return options
 
 
 @router.get("/customers/{customer_id}/filter-plants", response_model=list[FilterPlantRead])
-def list_filter_plants(customer_id: int, db: Session = Depends(get_db)):
+@cached_response
+def list_filter_plants(
+    customer_id: int,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fieldset: FieldSet = Depends(filter_plant_fields),
+    db: Session = Depends(get_db),
+):
     customer = db.get(Customer, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found.")
 
-    return (
+    items = paginate(
         db.query(FilterPlant)
-        .filter(FilterPlant.customer_id == customer_id)
-        .order_by(FilterPlant.id.asc())
-        .all()
+        .options(*_filter_plant_options(fieldset))
+        .filter(FilterPlant.customer_id == customer_id),
+        response,
+        page,
+        FilterPlant.id,
+    )
+    # Component writes only invalidate their plant's tag.
+    plant_tags = [f"filter_plant:{item.id}" for item in items]
+    tag_response(
+        request,
+        f"customer:{customer_id}",
+        *(plant_tags if "components" in fieldset.include else []),
     )
+    etag = page_etag(response, items, key=fieldset.versions)
+    return not_modified(request, response, etag) or fieldset.render(response, items)
 
 
 @router.get("/filter-plants/{filter_plant_id}", response_model=FilterPlantRead)
-def get_filter_plant(filter_plant_id: int, db: Session = Depends(get_db)):
-    filter_plant = db.get(FilterPlant, filter_plant_id)
+def get_filter_plant(
+    filter_plant_id: int,
+    request: Request,
+    response: Response,
+    fieldset: FieldSet = Depends(filter_plant_fields),
+    db: Session = Depends(get_db),
+):
+    filter_plant = db.get(FilterPlant, filter_plant_id, options=_filter_plant_options(fieldset))
     if not filter_plant:
         raise HTTPException(status_code=404, detail="Filter plant not found.")
-    return filter_plant
+    etag = entity_etag(filter_plant, *fieldset.embedded(filter_plant))
+    return not_modified(request, response, etag) or fieldset.render(response, filter_plant)
 
 
 @router.post(
@@ -47,8 +109,7 @@ def create_filter_plant(
     if payload.year_built < 1800 or payload.year_built > 2100:
         raise HTTPException(status_code=400, detail="Year built is invalid.")
 
-    manufacturer = db.get(Manufacturer, payload.manufacturer_id)
-    if not manufacturer:
+    if not get_reference(db, Manufacturer, payload.manufacturer_id):
         raise HTTPException(status_code=404, detail="Manufacturer not found.")
 
     filter_plant = FilterPlant(
@@ -58,18 +119,69 @@ def create_filter_plant(
         year_built=payload.year_built,
     )
     db.add(filter_plant)
+    invalidate_on_commit(db, f"customer:{customer_id}")
     db.commit()
     db.refresh(filter_plant)
     return filter_plant
 
 
+@router.post("/filter-plants/batch", response_model=BatchResult)
+def create_filter_plants_batch(
+    payload: BatchCreate[FilterPlantBatchItem], db: Session = Depends(get_db)
+):
+    customers = existing_ids(db, Customer.id, (item.customer_id for item in payload.items))
+    manufacturers = existing_ids(
+        db, Manufacturer.id, (item.manufacturer_id for item in payload.items)
+    )
+
+    entries = []
+    errors = {}
+    for index, item in enumerate(payload.items):
+        description = item.description.strip()
+        if item.customer_id not in customers:
+            errors[index] = "Customer not found."
+        elif not description:
+            errors[index] = "Description is required."
+        elif item.year_built < 1800 or item.year_built > 2100:
+            errors[index] = "Year built is invalid."
+        elif item.manufacturer_id not in manufacturers:
+            errors[index] = "Manufacturer not found."
+        else:
+            entries.append(
+                (
+                    index,
+                    {
+                        "customer_id": item.customer_id,
+                        "manufacturer_id": item.manufacturer_id,
+                        "description": description,
+                        "year_built": item.year_built,
+                        "external_ref": item.external_ref,
+                    },
+                )
+            )
+
+    result = write_batch(db, FilterPlant, "customer_id", entries, errors, payload.upsert)
+    invalidate_on_commit(
+        db,
+        *{f"customer:{values['customer_id']}" for _, values in entries},
+        *{f"filter_plant:{item.id}" for item in result.items if item.status == "updated"},
+    )
+    db.commit()
+    return result
+
+
 @router.patch("/filter-plants/{filter_plant_id}", response_model=FilterPlantRead)
 def update_filter_plant(
-    filter_plant_id: int, payload: FilterPlantUpdate, db: Session = Depends(get_db)
+    filter_plant_id: int,
+    payload: FilterPlantUpdate,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
 ):
     filter_plant = db.get(FilterPlant, filter_plant_id)
     if not filter_plant:
         raise HTTPException(status_code=404, detail="Filter plant not found.")
+    check_if_match(request, entity_etag(filter_plant))
 
     description = payload.description.strip()
     if not description:
@@ -78,24 +190,32 @@ def update_filter_plant(
     if payload.year_built < 1800 or payload.year_built > 2100:
         raise HTTPException(status_code=400, detail="Year built is invalid.")
 
-    manufacturer = db.get(Manufacturer, payload.manufacturer_id)
-    if not manufacturer:
+    if not get_reference(db, Manufacturer, payload.manufacturer_id):
         raise HTTPException(status_code=404, detail="Manufacturer not found.")
 
     filter_plant.description = description
     filter_plant.year_built = payload.year_built
     filter_plant.manufacturer_id = payload.manufacturer_id
+    invalidate_on_commit(
+        db, f"customer:{filter_plant.customer_id}", f"filter_plant:{filter_plant.id}"
+    )
     db.commit()
     db.refresh(filter_plant)
+    response.headers["ETag"] = entity_etag(filter_plant)
     return filter_plant
 
 
 @router.delete("/filter-plants/{filter_plant_id}", status_code=204)
-def delete_filter_plant(filter_plant_id: int, db: Session = Depends(get_db)):
+def delete_filter_plant(
+    filter_plant_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     filter_plant = db.get(FilterPlant, filter_plant_id)
     if not filter_plant:
         raise HTTPException(status_code=404, detail="Filter plant not found.")
 
-    db.delete(filter_plant)
+    delete_entity(db, filter_plant, background_tasks)
+    invalidate_on_commit(
+        db, f"customer:{filter_plant.customer_id}", f"filter_plant:{filter_plant.id}"
+    )
     db.commit()
     return None
@@ -1,9 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from sqlalchemy import text
 
-from ...core.database import engine
+from ...core.database import async_engine, engine, replica_router
+from ...core.lifecycle import is_ready, ping_database
+from ...core.pool import pool_status
+from ...core.serialization import JSON_RESPONSE_CLASS
 
-router = APIRouter()
+router = APIRouter(default_response_class=JSON_RESPONSE_CLASS)
 
 
 @router.get("/")
@@ -12,7 +15,10 @@ def root():
         "name": "OIS Reports API",
         "endpoints": {
             "health": "/health",
+            "livez": "/livez",
+            "readyz": "/readyz",
             "db_health": "/db-health",
+            "db_pool": "/db-pool",
             "clients": "/clients",
             "client_get": "/clients/{client_id}",
             "customers": "/customers",
@@ -33,7 +39,15 @@ def root():
             "report_update": "/reports/{report_id}",
             "report_create": "/customers/{customer_id}/filter-plants/{filter_plant_id}/reports",
             "reports": "/reports",
+            "report_pdf": "/reports/{report_id}/pdf",
+            "report_exports": "/reports/exports",
+            "report_export_get": "/reports/exports/{job_id}",
+            "report_export_download": "/reports/exports/{job_id}/download",
             "customer_delete": "/customers/{customer_id}",
+            "customer_dashboard": "/customers/{customer_id}/dashboard",
+            "inventory_import": "/imports/inventory",
+            "inventory_export": "/exports/inventory",
+            "reports_export": "/exports/reports",
         },
     }
 
@@ -43,9 +57,38 @@ def health():
     return {"status": "ok"}
 
 
+@router.get("/livez")
+async def livez():
+    # Answered on the event loop itself: proves it is not blocked.
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+def readyz():
+    if not is_ready():
+        raise HTTPException(status_code=503, detail="Application is starting.")
+    try:
+        ping_database()
+    except Exception:
+        raise HTTPException(status_code=503, detail="Database is not reachable.")
+    return {"status": "ready"}
+
+
 @router.get("/db-health")
 def db_health():
     with engine.connect() as connection:
         connection.execute(text("SELECT 1"))
 
     return {"status": "ok", "database": "reachable"}
+
+
+@router.get("/db-pool")
+def db_pool():
+    pools = {"sync": pool_status(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.pool)
+    if replica_router is not None:
+        pools["replica"] = pool_status(replica_router.engine.pool)
+        if replica_router.async_engine is not None:
+            pools["async_replica"] = pool_status(replica_router.async_engine.pool)
+    return pools
@@ -0,0 +1,60 @@
+import functools
+
+from anyio import from_thread, to_thread
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from ...core.database import primary_session
+from ...schemas import ImportSummary
+from ...services.inventory_import import (
+    InvalidUploadError,
+    InventoryImporter,
+    iter_lines,
+    iter_records,
+)
+from ..routing import SessionRoute
+
+router = APIRouter(prefix="/imports", tags=["imports"], route_class=SessionRoute)
+
+_FORMATS_BY_CONTENT_TYPE = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+async def _next_chunk(chunks) -> bytes | None:
+    try:
+        return await anext(chunks)
+    except StopAsyncIteration:
+        return None
+
+
+@router.post("/inventory", response_model=ImportSummary)
+async def import_inventory(
+    request: Request,
+    format: str | None = Query(None, pattern="^(csv|ndjson)$"),
+    dry_run: bool = False,
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = format or _FORMATS_BY_CONTENT_TYPE.get(content_type)
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Upload CSV or NDJSON.")
+
+    # The importer runs in a worker thread and pulls the upload chunk by chunk
+    # from the event loop, so the body is never held in memory as a whole.
+    chunks = request.stream()
+
+    def read_chunk() -> bytes | None:
+        return from_thread.run(_next_chunk, chunks)
+
+    importer = InventoryImporter(
+        dry_run=dry_run, session_factory=functools.partial(primary_session, request)
+    )
+    try:
+        return await to_thread.run_sync(importer.run, iter_records(iter_lines(read_chunk), fmt))
+    except InvalidUploadError as exc:
+        done = "checked" if dry_run else "imported"
+        raise HTTPException(
+            status_code=400, detail=f"{exc} Rows {done} before it: {importer.summary.rows}."
+        ) from None
@@ -1,24 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
+from ...core.etag import entity_etag, not_modified, page_etag
+from ...core.pagination import PageParams, page_params, paginate
 from ...models import FilterPlant, Manufacturer
 from ...schemas import FilterPlantRead, ManufacturerCreate, ManufacturerRead
+from ...services.reference_data import get_reference, invalidate, list_references
+from ..routing import SessionRoute
 
-router = APIRouter(prefix="/manufacturers", tags=["manufacturers"])
+router = APIRouter(prefix="/manufacturers", tags=["manufacturers"], route_class=SessionRoute)
 
 
 @router.get("", response_model=list[ManufacturerRead])
-def list_manufacturers(db: Session = Depends(get_db)):
-    return db.query(Manufacturer).order_by(Manufacturer.id.asc()).all()
+def list_manufacturers(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    items = list_references(db, Manufacturer, response, page)
+    return not_modified(request, response, page_etag(response, items)) or items
 
 
 @router.get("/{manufacturer_id}", response_model=ManufacturerRead)
-def get_manufacturer(manufacturer_id: int, db: Session = Depends(get_db)):
-    manufacturer = db.get(Manufacturer, manufacturer_id)
+def get_manufacturer(
+    manufacturer_id: int, request: Request, response: Response, db: Session = Depends(get_db)
+):
+    manufacturer = get_reference(db, Manufacturer, manufacturer_id)
     if not manufacturer:
         raise HTTPException(status_code=404, detail="Manufacturer not found.")
-    return manufacturer
+    return not_modified(request, response, entity_etag(manufacturer)) or manufacturer
 
 
 @router.post("", response_model=ManufacturerRead, status_code=201)
@@ -31,20 +43,27 @@ def create_manufacturer(payload: ManufacturerCreate, db: Session = Depends(get_d
 
     manufacturer = Manufacturer(name=name)
     db.add(manufacturer)
+    invalidate(db, Manufacturer)
     db.commit()
     db.refresh(manufacturer)
     return manufacturer
 
 
 @router.get("/{manufacturer_id}/filter-plants", response_model=list[FilterPlantRead])
-def list_manufacturer_filter_plants(manufacturer_id: int, db: Session = Depends(get_db)):
-    manufacturer = db.get(Manufacturer, manufacturer_id)
-    if not manufacturer:
+def list_manufacturer_filter_plants(
+    manufacturer_id: int,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    if not get_reference(db, Manufacturer, manufacturer_id):
         raise HTTPException(status_code=404, detail="Manufacturer not found.")
 
-    return (
-        db.query(FilterPlant)
-        .filter(FilterPlant.manufacturer_id == manufacturer_id)
-        .order_by(FilterPlant.id.asc())
-        .all()
+    items = paginate(
+        db.query(FilterPlant).filter(FilterPlant.manufacturer_id == manufacturer_id),
+        response,
+        page,
+        FilterPlant.id,
     )
+    return not_modified(request, response, page_etag(response, items)) or items
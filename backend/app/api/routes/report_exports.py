@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from ...schemas import ReportExportRead, ReportFilter
+from ...services.report_export import ExportJob, iter_export_zip, load_job, start_export
+
+router = APIRouter(prefix="/reports/exports", tags=["reports"])
+
+
+def _get_job(job_id: str) -> ExportJob:
+    job = load_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found.")
+    return job
+
+
+@router.post("", response_model=ReportExportRead, status_code=202)
+async def create_report_export(filters: ReportFilter):
+    job = await start_export(filters)
+    return job.to_dict()
+
+
+@router.get("/{job_id}", response_model=ReportExportRead)
+def get_report_export(job_id: str):
+    return _get_job(job_id).to_dict()
+
+
+@router.get("/{job_id}/download")
+def download_report_export(job_id: str):
+    job = _get_job(job_id)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail="Export is not finished.")
+
+    return StreamingResponse(
+        iter_export_zip(job),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="berichte-{job.id}.zip"'},
+    )
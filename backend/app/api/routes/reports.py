@@ -1,86 +1,168 @@
-from fastapi import APIRouter, Depends, HTTPException
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Integer, String, column, delete, func, insert, select, update, values
 from sqlalchemy.orm import Session
 
+from ...core.bulk import copy_rows, supports_copy
 from ...core.database import get_db
+from ...core.etag import check_if_match, not_modified, page_etag
+from ...core.fieldsets import FieldSet
+from ...core.response_cache import invalidate_on_commit, tag_response
+from ...core.pagination import PageParams, page_params, paginate
 from ...models import Component, Customer, FilterPlant, Report, ReportComponent
 from ...schemas import (
-    ReportComponentRead,
+    ReportComponentCreate,
     ReportCreate,
     ReportDetailRead,
+    ReportFilter,
     ReportListRead,
     ReportRead,
     ReportUpdate,
 )
+from ...services.report_pdf import render_report_pdf, report_fingerprint
+from ...services.report_queries import (
+    REPORT_DETAIL_OPTIONS,
+    apply_report_filter,
+    report_detail,
+    report_detail_fields,
+    report_detail_options,
+    report_etag,
+    report_list_fields,
+    report_list_query,
+)
+from ..routing import SessionRoute, cached_response
+
+router = APIRouter(tags=["reports"], route_class=SessionRoute)
 
-router = APIRouter(tags=["reports"])
+# Reports with at least this many components load their items with COPY.
+REPORT_COPY_THRESHOLD = int(os.getenv("REPORT_COPY_THRESHOLD", "500"))
 
 
 @router.get("/reports", response_model=list[ReportListRead])
-def list_reports(db: Session = Depends(get_db)):
-    reports = db.query(Report).order_by(Report.created_at.desc()).all()
-    return [
-        ReportListRead(
-            id=report.id,
-            customer_id=report.customer_id,
-            customer_name=report.customer.name if report.customer else "",
-            filter_plant_id=report.filter_plant_id,
-            filter_plant_description=report.filter_plant.description
-            if report.filter_plant
-            else "",
-            created_at=report.created_at,
-            completed=report.completed,
-        )
-        for report in reports
-    ]
+def list_reports(
+    request: Request,
+    response: Response,
+    filters: ReportFilter = Query(),
+    page: PageParams = Depends(page_params),
+    fieldset: FieldSet = Depends(report_list_fields),
+    db: Session = Depends(get_db),
+):
+    items = paginate(
+        apply_report_filter(report_list_query(db, fieldset), filters),
+        response,
+        page,
+        Report.created_at,
+        Report.id,
+        descending=True,
+    )
+    # List rows are plain tuples that include the joined names.
+    etag = page_etag(response, items, key=tuple)
+    return not_modified(request, response, etag) or fieldset.render(response, items)
+
+
+def _load_report(report_id: int, db: Session = Depends(get_db)) -> Report:
+    report = db.get(Report, report_id, options=REPORT_DETAIL_OPTIONS)
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found.")
+    return report
+
+
+def _load_report_detail(report: Report = Depends(_load_report)) -> ReportDetailRead:
+    return report_detail(report)
 
 
 @router.get("/reports/{report_id}", response_model=ReportDetailRead)
-def get_report(report_id: int, db: Session = Depends(get_db)):
-    report = db.get(Report, report_id)
+@cached_response
+def get_report(
+    report_id: int,
+    request: Request,
+    response: Response,
+    fieldset: FieldSet = Depends(report_detail_fields),
+    db: Session = Depends(get_db),
+):
+    report = db.get(Report, report_id, options=report_detail_options(fieldset))
     if not report:
         raise HTTPException(status_code=404, detail="Report not found.")
+    # Component names come from the plant's components, which invalidate the plant tag.
+    tag_response(
+        request,
+        f"report:{report.id}",
+        f"customer:{report.customer_id}",
+        f"filter_plant:{report.filter_plant_id}",
+    )
+    etag = report_etag(report, fieldset.include)
+    return not_modified(request, response, etag) or fieldset.render(response, report)
+
 
-    return ReportDetailRead(
-        id=report.id,
-        customer_id=report.customer_id,
-        customer_name=report.customer.name if report.customer else "",
-        filter_plant_id=report.filter_plant_id,
-        filter_plant_description=report.filter_plant.description if report.filter_plant else "",
-        created_at=report.created_at,
-        completed=report.completed,
-        components=[
-            ReportComponentRead(
-                component_id=item.component_id,
-                component_name=item.component.name if item.component else "",
-                description=item.description,
-            )
-            for item in report.items
-        ],
+@router.get("/reports/{report_id}/pdf", response_class=Response)
+async def get_report_pdf(
+    request: Request,
+    response: Response,
+    report: ReportDetailRead = Depends(_load_report_detail),
+):
+    data = report.model_dump(mode="json")
+    # The PDF's key digests everything it is rendered from, so it is known up front.
+    etag = f'"{report_fingerprint(data)}"'
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    pdf, _ = await render_report_pdf(data)
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f'inline; filename="bericht-{report.id}.pdf"',
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+        },
     )
 
 
 @router.get("/customers/{customer_id}/reports", response_model=list[ReportListRead])
-def list_customer_reports(customer_id: int, db: Session = Depends(get_db)):
-    reports = (
-        db.query(Report)
-        .filter(Report.customer_id == customer_id)
-        .order_by(Report.created_at.desc())
-        .all()
+def list_customer_reports(
+    customer_id: int,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fieldset: FieldSet = Depends(report_list_fields),
+    db: Session = Depends(get_db),
+):
+    items = paginate(
+        report_list_query(db, fieldset).filter(Report.customer_id == customer_id),
+        response,
+        page,
+        Report.created_at,
+        Report.id,
+        descending=True,
     )
-    return [
-        ReportListRead(
-            id=report.id,
-            customer_id=report.customer_id,
-            customer_name=report.customer.name if report.customer else "",
-            filter_plant_id=report.filter_plant_id,
-            filter_plant_description=report.filter_plant.description
-            if report.filter_plant
-            else "",
-            created_at=report.created_at,
-            completed=report.completed,
-        )
-        for report in reports
-    ]
+    etag = page_etag(response, items, key=tuple)
+    return not_modified(request, response, etag) or fieldset.render(response, items)
+
+
+def _validated_descriptions(
+    db: Session, filter_plant_id: int, items: list[ReportComponentCreate]
+) -> dict[int, str]:
+    if not items:
+        raise HTTPException(status_code=400, detail="Component descriptions are required.")
+
+    component_ids = {item.component_id for item in items}
+    valid_count = (
+        db.query(func.count(Component.id))
+        .filter(Component.filter_plant_id == filter_plant_id)
+        .filter(Component.id.in_(component_ids))
+        .scalar()
+    )
+    if valid_count != len(component_ids):
+        raise HTTPException(status_code=400, detail="Invalid component selection.")
+
+    descriptions = {}
+    for item in items:
+        description = item.description.strip()
+        if not description:
+            raise HTTPException(status_code=400, detail="Description is required.")
+        descriptions[item.component_id] = description
+    return descriptions
 
 
 @router.post(
@@ -99,99 +181,136 @@ def create_report(
     if not filter_plant or filter_plant.customer_id != customer_id:
         raise HTTPException(status_code=404, detail="Filter plant not found.")
 
-    if not payload.component_descriptions:
-        raise HTTPException(status_code=400, detail="Component descriptions are required.")
-
-    component_ids = [item.component_id for item in payload.component_descriptions]
-    components = (
-        db.query(Component)
-        .filter(Component.filter_plant_id == filter_plant_id)
-        .filter(Component.id.in_(component_ids))
-        .all()
-    )
-    if len(components) != len(set(component_ids)):
-        raise HTTPException(status_code=400, detail="Invalid component selection.")
+    descriptions = _validated_descriptions(db, filter_plant_id, payload.component_descriptions)
 
-    report = Report(
-        customer_id=customer_id, filter_plant_id=filter_plant_id, completed=False
-    )
-    db.add(report)
-    db.flush()
+    report = db.execute(
+        insert(Report)
+        .values(customer_id=customer_id, filter_plant_id=filter_plant_id, completed=False)
+        .returning(
+            Report.id,
+            Report.customer_id,
+            Report.filter_plant_id,
+            Report.created_at,
+            Report.completed,
+        )
+    ).one()
 
-    for item in payload.component_descriptions:
-        description = item.description.strip()
-        if not description:
-            raise HTTPException(status_code=400, detail="Description is required.")
-        db.add(
-            ReportComponent(
-                report_id=report.id,
-                component_id=item.component_id,
-                description=description,
-            )
+    if len(descriptions) >= REPORT_COPY_THRESHOLD and supports_copy(db):
+        copy_rows(
+            db,
+            ReportComponent.__table__,
+            ["report_id", "report_created_at", "component_id", "description"],
+            (
+                (report.id, report.created_at.isoformat(), component_id, description)
+                for component_id, description in descriptions.items()
+            ),
+        )
+    else:
+        db.execute(
+            insert(ReportComponent),
+            [
+                {
+                    "report_id": report.id,
+                    "report_created_at": report.created_at,
+                    "component_id": component_id,
+                    "description": description,
+                }
+                for component_id, description in descriptions.items()
+            ],
         )
 
     db.commit()
-    db.refresh(report)
     return report
 
 
+def _sync_report_items(db: Session, report: Report, descriptions: dict[int, str]) -> bool:
+    """Bring a report's items in line with ``descriptions`` using set-based statements.
+
+    At most one UPDATE ... FROM (VALUES ...), one multi-row INSERT and one DELETE
+    are issued, and rows whose description is unchanged are not touched.
+    Returns whether any item changed.
+    """
+    # Every statement names the partition key, so only the report's partition is touched.
+    in_partition = ReportComponent.report_created_at == report.created_at
+    existing = db.execute(
+        select(ReportComponent.id, ReportComponent.component_id, ReportComponent.description)
+        .where(ReportComponent.report_id == report.id, in_partition)
+        .order_by(ReportComponent.id)
+    ).all()
+
+    kept: dict[int, tuple[int, str]] = {}
+    to_delete = []
+    for row in existing:
+        if row.component_id in descriptions and row.component_id not in kept:
+            kept[row.component_id] = (row.id, row.description)
+        else:
+            to_delete.append(row.id)
+
+    to_update = [
+        (item_id, descriptions[component_id])
+        for component_id, (item_id, description) in kept.items()
+        if descriptions[component_id] != description
+    ]
+    to_insert = [
+        {
+            "report_id": report.id,
+            "report_created_at": report.created_at,
+            "component_id": component_id,
+            "description": description,
+        }
+        for component_id, description in descriptions.items()
+        if component_id not in kept
+    ]
+
+    if to_update:
+        changes = values(
+            column("id", Integer), column("description", String), name="changes"
+        ).data(to_update)
+        db.execute(
+            update(ReportComponent)
+            .where(ReportComponent.id == changes.c.id, in_partition)
+            .values(description=changes.c.description)
+            .execution_options(synchronize_session=False)
+        )
+    if to_insert:
+        db.execute(insert(ReportComponent), to_insert)
+    if to_delete:
+        db.execute(
+            delete(ReportComponent)
+            .where(ReportComponent.id.in_(to_delete), in_partition)
+            .execution_options(synchronize_session=False)
+        )
+    return bool(to_update or to_insert or to_delete)
+
+
 @router.patch("/reports/{report_id}", response_model=ReportDetailRead)
-def update_report(report_id: int, payload: ReportUpdate, db: Session = Depends(get_db)):
-    report = db.get(Report, report_id)
+def update_report(
+    report_id: int,
+    payload: ReportUpdate,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    report = db.get(Report, report_id, with_for_update=True)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found.")
+    if "if-match" in request.headers:
+        report = db.get(Report, report_id, options=REPORT_DETAIL_OPTIONS, populate_existing=True)
+        check_if_match(request, report_etag(report))
     if report.completed:
         raise HTTPException(status_code=400, detail="Report is already completed.")
 
-    if not payload.component_descriptions:
-        raise HTTPException(status_code=400, detail="Component descriptions are required.")
-
-    component_ids = [item.component_id for item in payload.component_descriptions]
-    components = (
-        db.query(Component)
-        .filter(Component.filter_plant_id == report.filter_plant_id)
-        .filter(Component.id.in_(component_ids))
-        .all()
+    descriptions = _validated_descriptions(
+        db, report.filter_plant_id, payload.component_descriptions
     )
-    if len(components) != len(set(component_ids)):
-        raise HTTPException(status_code=400, detail="Invalid component selection.")
-
-    # Replace existing report components
-    for item in list(report.items):
-        db.delete(item)
-
-    for item in payload.component_descriptions:
-        description = item.description.strip()
-        if not description:
-            raise HTTPException(status_code=400, detail="Description is required.")
-        db.add(
-            ReportComponent(
-                report_id=report.id,
-                component_id=item.component_id,
-                description=description,
-            )
-        )
+    if _sync_report_items(db, report, descriptions):
+        # Items are written with Core statements the ORM does not track.
+        report.version += 1
 
     report.completed = payload.completed
+    invalidate_on_commit(db, f"report:{report.id}")
     db.commit()
-    db.refresh(report)
-
-    return ReportDetailRead(
-        id=report.id,
-        customer_id=report.customer_id,
-        customer_name=report.customer.name if report.customer else "",
-        filter_plant_id=report.filter_plant_id,
-        filter_plant_description=report.filter_plant.description
-        if report.filter_plant
-        else "",
-        created_at=report.created_at,
-        completed=report.completed,
-        components=[
-            ReportComponentRead(
-                component_id=item.component_id,
-                component_name=item.component.name if item.component else "",
-                description=item.description,
-            )
-            for item in report.items
-        ],
-    )
+
+    report = db.get(Report, report_id, options=REPORT_DETAIL_OPTIONS, populate_existing=True)
+    response.headers["ETag"] = report_etag(report)
+    return report_detail(report)
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...core.pagination import PageParams
+from ...schemas import SearchResultRead
+from ...services.search import SEARCH_SOURCES, search
+from ..routing import SessionRoute
+
+router = APIRouter(prefix="/search", tags=["search"], route_class=SessionRoute)
+
+MAX_SEARCH_PAGE_SIZE = 100
+
+
+def search_kinds(kinds: str | None = Query(None)) -> tuple[str, ...]:
+    if kinds is None:
+        return tuple(SEARCH_SOURCES)
+    selected = tuple(dict.fromkeys(kind.strip() for kind in kinds.split(",") if kind.strip()))
+    for kind in selected:
+        if kind not in SEARCH_SOURCES:
+            raise HTTPException(status_code=400, detail=f"Unknown kind: {kind}.")
+    if not selected:
+        raise HTTPException(status_code=400, detail="At least one kind is required.")
+    return selected
+
+
+@router.get("", response_model=list[SearchResultRead])
+def search_all(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200),
+    kinds: tuple[str, ...] = Depends(search_kinds),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    db: Session = Depends(get_db),
+):
+    q = q.strip()
+    if len(q) < 2:
+        raise HTTPException(status_code=400, detail="Search query is too short.")
+    return search(db, q, kinds, response, PageParams(limit=limit, cursor=cursor))
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...core.pagination import PageParams, page_params
+from ...models import Customer, Manufacturer
+from ...schemas import CustomerReportStatsRead, ManufacturerReportStatsRead, ReportStatsRead
+from ...services.reference_data import get_reference
+from ...services.report_stats import list_report_stats, report_stats
+from ..routing import SessionRoute
+
+router = APIRouter(prefix="/stats", tags=["stats"], route_class=SessionRoute)
+
+
+@router.get("/reports", response_model=ReportStatsRead)
+def get_report_stats(db: Session = Depends(get_db)):
+    return report_stats(db)
+
+
+@router.get("/customers", response_model=list[CustomerReportStatsRead])
+def list_customer_report_stats(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    return [
+        CustomerReportStatsRead(customer_id=customer_id, **stats.model_dump())
+        for customer_id, stats in list_report_stats(db, "customer", response, page)
+    ]
+
+
+@router.get("/customers/{customer_id}", response_model=CustomerReportStatsRead)
+def get_customer_report_stats(customer_id: int, db: Session = Depends(get_db)):
+    if db.get(Customer, customer_id) is None:
+        raise HTTPException(status_code=404, detail="Customer not found.")
+    stats = report_stats(db, "customer", customer_id)
+    return CustomerReportStatsRead(customer_id=customer_id, **stats.model_dump())
+
+
+@router.get("/manufacturers", response_model=list[ManufacturerReportStatsRead])
+def list_manufacturer_report_stats(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    return [
+        ManufacturerReportStatsRead(manufacturer_id=manufacturer_id, **stats.model_dump())
+        for manufacturer_id, stats in list_report_stats(db, "manufacturer", response, page)
+    ]
+
+
+@router.get("/manufacturers/{manufacturer_id}", response_model=ManufacturerReportStatsRead)
+def get_manufacturer_report_stats(manufacturer_id: int, db: Session = Depends(get_db)):
+    if get_reference(db, Manufacturer, manufacturer_id) is None:
+        raise HTTPException(status_code=404, detail="Manufacturer not found.")
+    stats = report_stats(db, "manufacturer", manufacturer_id)
+    return ManufacturerReportStatsRead(manufacturer_id=manufacturer_id, **stats.model_dump())
@@ -0,0 +1,145 @@
+import functools
+import inspect
+
+from fastapi import Depends, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy.exc import InterfaceError, OperationalError
+from starlette.concurrency import run_in_threadpool
+
+from ..core import compression, database, response_cache
+from ..core.database import get_async_db
+from ..core.etag import etag_matches
+from ..core.replica import READ_METHODS
+
+
+def run_with_async_session(endpoint):
+    """Turn a sync ``db: Session`` endpoint into a coroutine on an ``AsyncSession``.
+
+    The original handler body runs through ``AsyncSession.run_sync``, so its ORM
+    code drives the asyncpg connection from the event loop instead of holding a
+    threadpool worker for the whole database round trip.
+    """
+    signature = inspect.signature(endpoint)
+    parameters = [
+        parameter.replace(default=Depends(get_async_db)) if name == "db" else parameter
+        for name, parameter in signature.parameters.items()
+    ]
+
+    @functools.wraps(endpoint)
+    async def wrapper(**kwargs):
+        db = kwargs.pop("db")
+        return await db.run_sync(lambda session: endpoint(db=session, **kwargs))
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
+
+
+def cached_response(endpoint):
+    """Serve a GET route from the shared response cache.
+
+    The endpoint declares what its response depends on with ``tag_response``;
+    only responses that were tagged are stored.
+    """
+    endpoint.cache_response = True
+    return endpoint
+
+
+def _serve_cached(handler):
+    async def cached_handler(request: Request) -> Response:
+        cache = response_cache.response_cache
+        if cache is None or _reads_own_writes(request):
+            return await handler(request)
+
+        key = cache.key(request)
+        encoding = compression.negotiate(request.headers.get("accept-encoding"))
+        # Taken before anything is read, so nothing invalidated in the meantime
+        # gets stored.
+        mark, cached = await run_in_threadpool(lambda: (cache.mark(), cache.get(key, encoding)))
+        if cached is not None:
+            headers, body, tags = cached
+            if etag_matches(request.headers.get("if-none-match"), headers.get("etag", "")):
+                return Response(status_code=304, headers=headers)
+            # Whatever is stored may have been read from the replica.
+            ttl = _cache_ttl(cache.ttl, database.replica_router is not None)
+        else:
+            response = await handler(request)
+            tags = getattr(request.state, "cache_tags", None)
+            if response.status_code != 200 or not tags or _reads_own_writes(request):
+                return response
+            headers, body = dict(response.headers), response.body
+            ttl = _cache_ttl(cache.ttl, getattr(request.state, "db_replica", False))
+            await run_in_threadpool(cache.set, key, headers, body, tags, ttl=ttl, since=mark)
+
+        if encoding is not None and compression.compressible(headers, body):
+            # Stored next to the identity body, so later hits skip compression.
+            headers, body = await run_in_threadpool(compression.encode, encoding, headers, body)
+            await run_in_threadpool(
+                cache.set, key, headers, body, tags, encoding, ttl=ttl, since=mark
+            )
+        headers.pop("content-length", None)
+        return Response(content=body, headers=headers)
+
+    return cached_handler
+
+
+def _reads_own_writes(request: Request) -> bool:
+    # What the shared cache holds may have come from a lagging replica, so a
+    # client that must see its own writes neither reads nor fills it.
+    router = database.replica_router
+    if router is None:
+        return False
+    return router.sticky(request) or getattr(request.state, "db_primary", False)
+
+
+def _cache_ttl(ttl: int, from_replica: bool) -> int:
+    if not from_replica:
+        return ttl
+    # Don't keep a replica read around for longer than the replica may lag.
+    return max(1, int(database.replica_router.cache_ttl(ttl)))
+
+
+def _fall_back_to_primary(handler):
+    async def read_handler(request: Request) -> Response:
+        try:
+            return await handler(request)
+        except (OperationalError, InterfaceError):
+            if not getattr(request.state, "db_replica", False):
+                raise
+        # The replica went away or cancelled the query; read requests are safe to repeat.
+        database.replica_router.mark_unavailable()
+        request.state.db_replica = False
+        request.state.db_primary = True
+        return await handler(request)
+
+    return read_handler
+
+
+def _stick_to_primary(handler):
+    async def write_handler(request: Request) -> Response:
+        response = await handler(request)
+        if getattr(request.state, "db_committed", False) and database.replica_router is not None:
+            database.replica_router.stick(response)
+        return response
+
+    return write_handler
+
+
+class SessionRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        if (
+            database.ASYNC_DATABASE_ENABLED
+            and not inspect.iscoroutinefunction(endpoint)
+            and "db" in inspect.signature(endpoint).parameters
+        ):
+            endpoint = run_with_async_session(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if self.methods <= READ_METHODS:
+            handler = _fall_back_to_primary(handler)
+        else:
+            handler = _stick_to_primary(handler)
+        if getattr(self.endpoint, "cache_response", False):
+            return _serve_cached(handler)
+        return handler
@@ -0,0 +1,22 @@
+import csv
+import io
+
+from sqlalchemy.orm import Session
+
+
+def supports_copy(db: Session) -> bool:
+    return db.get_bind().dialect.driver == "psycopg2"
+
+
+def copy_rows(db: Session, table, columns: list[str], rows) -> None:
+    """Load ``rows`` into ``table`` with ``COPY ... FROM STDIN`` in the session's transaction."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    column_list = ", ".join(columns)
+    raw_connection = db.connection().connection
+    with raw_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table.name} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
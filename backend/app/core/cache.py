@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Keys are tuples whose first element names a namespace, so everything
+    derived from one table can be dropped with :meth:`invalidate`. A value
+    read while its namespace was invalidated is not stored when ``set`` gets
+    the :meth:`generation` taken before the read.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        # Bumped by every invalidation of all namespaces, and of each one.
+        self._generation = 0
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def generation(self, namespace: str) -> tuple[int, int]:
+        with self._lock:
+            return self._generation, self._generations.get(namespace, 0)
+
+    def set(
+        self, key, value, ttl: float | None = None, generation: tuple[int, int] | None = None
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != (
+                self._generation,
+                self._generations.get(key[0], 0),
+            ):
+                return
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: str | None = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._generation += 1
+                self._entries.clear()
+                return
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for key in [key for key in self._entries if key[0] == namespace]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
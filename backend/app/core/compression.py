@@ -0,0 +1,185 @@
+import os
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional: br is only offered when it is installed.
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: zstd is only offered when it is installed.
+    zstandard = None
+
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+# Bodies at least this large are compressed in the threadpool, not on the event loop.
+COMPRESSION_THREAD_MINIMUM_SIZE = int(os.getenv("COMPRESSION_THREAD_MINIMUM_SIZE", "65536"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_LEVEL = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "5"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+EXCLUDED_CONTENT_TYPES = (*DEFAULT_EXCLUDED_CONTENT_TYPES, "application/pdf")
+
+
+def _gzip_stream():
+    compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(data: bytes, final: bool) -> bytes:
+        return compressor.compress(data) + compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+    return compress
+
+
+def _brotli_stream():
+    compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_LEVEL)
+
+    def compress(data: bytes, final: bool) -> bytes:
+        return compressor.process(data) + (compressor.finish() if final else compressor.flush())
+
+    return compress
+
+
+def _zstd_stream():
+    compressor = zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compressobj()
+
+    def compress(data: bytes, final: bool) -> bytes:
+        return compressor.compress(data) + compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    return compress
+
+
+_STREAMS = {
+    "zstd": _zstd_stream if zstandard is not None else None,
+    "br": _brotli_stream if brotli is not None else None,
+    "gzip": _gzip_stream,
+}
+
+# Server preference, used when the client weighs several encodings equally.
+ENCODINGS = tuple(
+    encoding
+    for encoding in (
+        name.strip() for name in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    )
+    if _STREAMS.get(encoding) is not None
+)
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """The supported encoding the client weighs highest in ``Accept-Encoding``."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, parameters = part.partition(";")
+        weight = 1.0
+        parameter = parameters.strip()
+        if parameter.startswith("q="):
+            try:
+                weight = float(parameter[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compressible(headers, body: bytes) -> bool:
+    media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    return (
+        len(body) >= COMPRESSION_MINIMUM_SIZE
+        and "content-encoding" not in headers
+        and media_type not in EXCLUDED_CONTENT_TYPES
+        and f"{media_type.partition('/')[0]}/*" not in EXCLUDED_CONTENT_TYPES
+    )
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    # A strong ETag names exact bytes, which differ per encoding.
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+def encode(encoding: str, headers: dict[str, str], body: bytes) -> tuple[dict[str, str], bytes]:
+    """Compress a complete body, returning the headers that go with it."""
+    compressed = _STREAMS[encoding]()(body, True)
+    encoded = MutableHeaders(headers={k: v for k, v in headers.items() if k != "content-length"})
+    encoded["Content-Encoding"] = encoding
+    encoded.add_vary_header("Accept-Encoding")
+    _weaken_etag(encoded)
+    return dict(encoded), compressed
+
+
+class _CompressionResponder(IdentityResponder):
+    # Starlette's responder handles thresholds, excluded types, already
+    # encoded and streaming responses; this only supplies the codec.
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: str, thread_minimum_size: int):
+        super().__init__(app, minimum_size, exclude_content_types=EXCLUDED_CONTENT_TYPES)
+        self.content_encoding = encoding
+        self.thread_minimum_size = thread_minimum_size
+        self._compress = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_with_weak_etag(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if headers.get("content-encoding") == self.content_encoding:
+                    _weaken_etag(headers)
+            await send(message)
+
+        await super().__call__(scope, receive, send_with_weak_etag)
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compress is None:
+            self._compress = _STREAMS[self.content_encoding]()
+        if len(body) >= self.thread_minimum_size:
+            return await run_in_threadpool(self._compress, body, not more_body)
+        return self._compress(body, not more_body)
+
+
+class CompressionMiddleware:
+    """Compress responses with the best encoding the client accepts.
+
+    Responses below ``minimum_size`` bytes, already encoded responses and
+    binary media types are passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        thread_minimum_size: int = COMPRESSION_THREAD_MINIMUM_SIZE,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_minimum_size = thread_minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            responder = IdentityResponder(
+                self.app, self.minimum_size, exclude_content_types=EXCLUDED_CONTENT_TYPES
+            )
+        else:
+            responder = _CompressionResponder(
+                self.app, self.minimum_size, encoding, self.thread_minimum_size
+            )
+        await responder(scope, receive, send)
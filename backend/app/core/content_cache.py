@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+def content_key(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, separators=(",", ":"), default=str).encode()
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+class ContentCache:
+    """Content-addressed blob store on the local filesystem.
+
+    Entries are immutable: a key is a digest of everything that went into the
+    blob, so a changed input simply produces a new key. The directory can be
+    shared by all workers on a host. Once it holds more than ``max_entries``,
+    the least recently read or written entries are evicted.
+    """
+
+    def __init__(self, directory: str | os.PathLike, suffix: str = "", max_entries: int = 1000):
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.max_entries = max_entries
+        # Entries in the directory as far as this process knows, counted on the
+        # first put; only crossing max_entries makes it list the directory again.
+        self._count: int | None = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            # Eviction goes by mtime, so a hit marks the entry as recently used.
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            if self._count is None:
+                self._count = len(self._entries())
+            else:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._count = self._prune()
+
+    def _entries(self) -> list[os.DirEntry]:
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.name.endswith(self.suffix)]
+
+    def _prune(self) -> int:
+        """Evict down to 90% of ``max_entries``; return how many entries are left."""
+        entries = self._entries()
+        if len(entries) <= self.max_entries:
+            # Other workers have pruned in the meantime.
+            return len(entries)
+        keep = self.max_entries - self.max_entries // 10
+
+        def _mtime(entry: os.DirEntry) -> float:
+            try:
+                return entry.stat().st_mtime
+            except FileNotFoundError:
+                return 0.0
+
+        entries.sort(key=_mtime)
+        for entry in entries[: len(entries) - keep]:
+            Path(entry.path).unlink(missing_ok=True)
+        return keep
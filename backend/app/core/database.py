@@ -1,7 +1,14 @@
+import asyncio
 import os
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from .pool import CheckoutMetrics, timed_pool_class
+from .replica import ReplicaRouter
 
 
 def _build_database_url() -> str:
@@ -14,21 +21,146 @@ def _build_database_url() -> str:
     return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db_name}"
 
 
-DATABASE_URL = os.getenv("DATABASE_URL", _build_database_url())
+def _async_url(url: str) -> str:
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
+
+DATABASE_URL = os.getenv("DATABASE_URL", _build_database_url())
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+# Optional streaming replica for GET/HEAD requests; see replica.py.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+ASYNC_DATABASE_REPLICA_URL = os.getenv(
+    "ASYNC_DATABASE_REPLICA_URL", DATABASE_REPLICA_URL and _async_url(DATABASE_REPLICA_URL)
 )
+ASYNC_DATABASE_ENABLED = _env_flag("DB_ASYNC")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", default=True)
+# Behind PgBouncer in transaction mode the bouncer owns the pooling: open a
+# connection per checkout and never rely on server-side prepared statements.
+DB_PGBOUNCER = _env_flag("DB_PGBOUNCER")
+
+checkout_metrics = CheckoutMetrics()
+async_checkout_metrics = CheckoutMetrics()
+replica_checkout_metrics = CheckoutMetrics()
+async_replica_checkout_metrics = CheckoutMetrics()
+
+
+def _engine_options(
+    queue_pool_class, metrics: CheckoutMetrics, async_driver: bool = False
+) -> dict:
+    if DB_PGBOUNCER:
+        options = {
+            "poolclass": timed_pool_class(NullPool, metrics),
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        }
+        if async_driver:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+            }
+        return options
+
+    return {
+        "poolclass": timed_pool_class(queue_pool_class, metrics),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(QueuePool, checkout_metrics))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
-def get_db():
+if ASYNC_DATABASE_ENABLED:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **_engine_options(AsyncAdaptedQueuePool, async_checkout_metrics, async_driver=True),
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
+replica_router = None
+if DATABASE_REPLICA_URL:
+    replica_router = ReplicaRouter(
+        create_engine(DATABASE_REPLICA_URL, **_engine_options(QueuePool, replica_checkout_metrics))
+    )
+    if ASYNC_DATABASE_ENABLED:
+        replica_router.async_engine = create_async_engine(
+            ASYNC_DATABASE_REPLICA_URL,
+            **_engine_options(
+                AsyncAdaptedQueuePool, async_replica_checkout_metrics, async_driver=True
+            ),
+        )
+
+
+def _track_commits(db, request: Request) -> None:
+    # The route sets the sticky cookie once the request is done.
+    event.listen(db, "after_commit", lambda session: setattr(request.state, "db_committed", True))
+
+
+def primary_session(request: Request):
+    """A primary session opened outside ``get_db``, e.g. per import batch.
+
+    Its commits keep the client on the primary just like those of ``get_db``.
+    """
     db = SessionLocal()
+    if replica_router is not None:
+        _track_commits(db, request)
+    return db
+
+
+def get_db(request: Request):
+    router = replica_router
+    if router is not None and router.reads_from_replica(request):
+        request.state.db_replica = True
+        db = SessionLocal(bind=router.engine, info={"replica": router})
+    else:
+        db = SessionLocal()
+        if router is not None:
+            _track_commits(db, request)
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database access is disabled; set DB_ASYNC=1.")
+
+    router = replica_router
+    if router is not None and router.async_engine is not None:
+        if router.check_due:
+            # The health check is a blocking query.
+            await asyncio.to_thread(router.usable)
+        if router.reads_from_replica(request):
+            request.state.db_replica = True
+            async with AsyncSessionLocal(bind=router.async_engine, info={"replica": router}) as db:
+                yield db
+            return
+
+    async with AsyncSessionLocal() as db:
+        if router is not None:
+            _track_commits(db.sync_session, request)
+        yield db
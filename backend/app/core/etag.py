@@ -0,0 +1,52 @@
+import hashlib
+
+from fastapi import HTTPException, Request, Response
+
+from .pagination import NEXT_CURSOR_HEADER
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def entity_etag(*entities) -> str:
+    """ETag built from the id and version of each entity, without serializing it.
+
+    Works for ORM instances as well as cached row snapshots.
+    """
+    return make_etag(*((entity.id, entity.version) for entity in entities))
+
+
+def page_etag(response: Response, rows, key=lambda row: (row.id, row.version)) -> str:
+    # The next cursor is part of the representation: the same rows may or may
+    # not be followed by another page.
+    return make_etag(response.headers.get(NEXT_CURSOR_HEADER), *(key(row) for row in rows))
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    if header is None or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    # Proxies that compress responses often weaken ETags, so W/ is ignored.
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """Set ``ETag`` and return a 304 response when ``If-None-Match`` already has it.
+
+    Routes return the 304 instead of their body, so the body is never built
+    for clients that already hold the current version.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    if not etag_matches(request.headers.get("if-match", "*"), etag):
+        raise HTTPException(status_code=412, detail="Resource has been modified.")
@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+
+from . import serialization
+
+
+class SparseFields:
+    """``fields=`` and ``include=`` query parameters for one read schema.
+
+    ``relations`` maps each name accepted by ``include`` to the schema field it
+    embeds; every other schema field can be picked with ``fields``. Used as a
+    dependency, it resolves to the ``FieldSet`` the client asked for, which is
+    the full default representation when neither parameter is given.
+
+    ``trusted`` routes render lists of SQLAlchemy rows whose columns already
+    have the schema's types; with ``FAST_JSON`` those skip Pydantic entirely.
+    """
+
+    def __init__(
+        self,
+        schema: type[BaseModel],
+        relations: dict[str, str] | None = None,
+        default_include: tuple[str, ...] = (),
+        trusted: bool = False,
+    ):
+        self.schema = schema
+        self.relations = relations or {}
+        self.trusted = trusted
+        self.scalars = tuple(
+            name for name in schema.model_fields if name not in self.relations.values()
+        )
+        self.default_include = frozenset(default_include)
+        self._adapters: dict[tuple[tuple[str, ...], bool], TypeAdapter] = {}
+
+    def __call__(
+        self,
+        fields: str | None = Query(None, description="Comma-separated fields to return."),
+        include: str | None = Query(None, description="Comma-separated relations to embed."),
+    ) -> "FieldSet":
+        selected = _parse(fields, self.scalars, "field")
+        included = _parse(include, self.relations, "include")
+        return FieldSet(
+            self,
+            tuple(name for name in self.scalars if selected is None or name in selected),
+            self.default_include if included is None else frozenset(included),
+        )
+
+    def default(self) -> "FieldSet":
+        return FieldSet(self, self.scalars, self.default_include)
+
+    def adapter(self, names: tuple[str, ...], many: bool) -> TypeAdapter:
+        # One partial model per combination actually requested; there are at
+        # most 2 ** len(schema fields) of them.
+        adapter = self._adapters.get((names, many))
+        if adapter is None:
+            model = create_model(
+                f"{self.schema.__name__}Fields",
+                __config__=ConfigDict(from_attributes=True),
+                **{
+                    name: (
+                        self.schema.model_fields[name].annotation,
+                        Field(validation_alias=self.schema.model_fields[name].validation_alias),
+                    )
+                    for name in names
+                },
+            )
+            adapter = TypeAdapter(list[model] if many else model)
+            self._adapters[(names, many)] = adapter
+        return adapter
+
+
+def _parse(value: str | None, allowed, kind: str) -> set[str] | None:
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = sorted(names.difference(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {kind}: {', '.join(unknown)}.")
+    return names
+
+
+@dataclass(frozen=True)
+class FieldSet:
+    spec: SparseFields
+    fields: tuple[str, ...]
+    include: frozenset[str]
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        embedded = {self.spec.relations[relation] for relation in self.include}
+        return tuple(
+            name
+            for name in self.spec.schema.model_fields
+            if name in self.fields or name in embedded
+        )
+
+    def columns(self, model, *always: str) -> list:
+        """Columns of ``model`` to load: the selected fields plus ``always``."""
+        names = dict.fromkeys((*self.fields, *always))
+        return [getattr(model, name) for name in names if name in model.__table__.columns]
+
+    def embedded(self, entity) -> list:
+        """Related entities ``entity`` embeds, named like their relationship."""
+        related = []
+        for relation in sorted(self.include):
+            value = getattr(entity, relation)
+            related.extend(value if isinstance(value, list) else [value])
+        return related
+
+    def versions(self, entity) -> tuple:
+        """``(id, version)`` of ``entity`` and of every related entity it embeds."""
+        return tuple((item.id, item.version) for item in (entity, *self.embedded(entity)))
+
+    def render(self, response: Response, data) -> Response:
+        """Serialize only the selected fields of ``data`` (an object or a list).
+
+        The partial model never touches unselected attributes, so nothing that
+        was left out of the query is lazily loaded.
+        """
+        if self.spec.trusted and serialization.FAST_JSON:
+            body = serialization.dump_rows(data, self.names)
+        else:
+            adapter = self.spec.adapter(self.names, isinstance(data, list))
+            body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+        return Response(body, media_type="application/json", headers=dict(response.headers))
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import os
+from pathlib import Path
+
+from sqlalchemy import text
+
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
+# Run `alembic upgrade head` (including the seed revision) when a worker starts.
+# Off by default: deployments migrate as a separate step before rolling out.
+DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "0") in {"1", "true", "yes"}
+DB_STARTUP_INITIAL_DELAY = float(os.getenv("DB_STARTUP_INITIAL_DELAY", "0.1"))
+DB_STARTUP_MAX_DELAY = float(os.getenv("DB_STARTUP_MAX_DELAY", "5"))
+# Any constant works as long as every worker uses the same one.
+MIGRATION_LOCK_KEY = 4_812_023
+
+_ready = False
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(BACKEND_ROOT / "alembic.ini"))
+    # Keep the server's logging configuration.
+    config.attributes["configure_logging"] = False
+    return config
+
+
+def ping_database() -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def wait_for_database(
+    initial_delay: float = DB_STARTUP_INITIAL_DELAY, max_delay: float = DB_STARTUP_MAX_DELAY
+) -> int:
+    """Retry until the database accepts connections; returns the failed attempts.
+
+    Each attempt runs in a thread and the pauses are ``asyncio.sleep``, so the
+    event loop keeps serving ``/livez`` meanwhile.
+    """
+    delay = initial_delay
+    attempts = 0
+    while True:
+        try:
+            await asyncio.to_thread(ping_database)
+            return attempts
+        except Exception as exc:
+            attempts += 1
+            logger.warning(
+                "Database not reachable (%s); retrying in %.1fs.", type(exc).__name__, delay
+            )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+
+def migrate_database() -> None:
+    """Upgrade to the latest revision, one worker at a time.
+
+    Workers starting together queue on a session advisory lock; the first one
+    migrates and seeds, the others find the database at head and do nothing.
+    """
+    from alembic import command
+
+    with engine.connect() as lock_connection:
+        lock_connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        # The lock belongs to the session; don't sit idle in a transaction.
+        lock_connection.commit()
+        try:
+            command.upgrade(alembic_config(), "head")
+        finally:
+            lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+            lock_connection.commit()
+
+
+async def prepare_database(
+    migrate: bool = DB_MIGRATE_ON_STARTUP,
+    initial_delay: float = DB_STARTUP_INITIAL_DELAY,
+    max_delay: float = DB_STARTUP_MAX_DELAY,
+) -> None:
+    """Wait for the database (and migrate it if asked), then report ready.
+
+    A failed migration is logged and retried with backoff; the worker keeps
+    answering ``/readyz`` with 503 until one succeeds.
+    """
+    global _ready
+    delay = initial_delay
+    while True:
+        await wait_for_database(initial_delay, max_delay)
+        if not migrate:
+            break
+        try:
+            await asyncio.to_thread(migrate_database)
+            break
+        except Exception:
+            logger.exception("Migrating the database failed; retrying in %.1fs.", delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
+    _ready = True
+
+
+def reset_readiness() -> None:
+    global _ready
+    _ready = False
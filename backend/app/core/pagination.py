@@ -0,0 +1,70 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class PageParams:
+    limit: int
+    cursor: str | None
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor)
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value)
+            if key.type.python_type is datetime
+            else key.type.python_type(value)
+            for key, value in zip(keys, values)
+        ]
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+def paginate(query, response: Response, params: PageParams, *keys, descending: bool = False):
+    """Keyset-paginate ``query`` on ``keys``.
+
+    When more rows follow the page, an opaque cursor is sent in the
+    ``X-Next-Cursor`` header.
+    """
+    if params.cursor is not None:
+        values = decode_cursor(params.cursor, keys)
+        position = tuple_(*keys) if len(keys) > 1 else keys[0]
+        bound = tuple_(*values) if len(values) > 1 else values[0]
+        query = query.filter(position < bound if descending else position > bound)
+
+    query = query.order_by(*[key.desc() if descending else key.asc() for key in keys])
+    rows = query.limit(params.limit + 1).all()
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(rows[-1], key.key) for key in keys]
+        )
+    return rows
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class CheckoutMetrics:
+    """Cumulative histogram of how long callers waited for a pooled connection."""
+
+    def __init__(self, buckets_ms=CHECKOUT_WAIT_BUCKETS_MS):
+        self._lock = threading.Lock()
+        self.buckets_ms = tuple(buckets_ms)
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._bucket_counts = [0] * (len(self.buckets_ms) + 1)
+            self._count = 0
+            self._sum_ms = 0.0
+            self._max_ms = 0.0
+            self._timeouts = 0
+
+    def observe(self, wait_seconds: float, timed_out: bool = False) -> None:
+        wait_ms = wait_seconds * 1000
+        index = next(
+            (i for i, bound in enumerate(self.buckets_ms) if wait_ms <= bound),
+            len(self.buckets_ms),
+        )
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._count += 1
+            self._sum_ms += wait_ms
+            self._max_ms = max(self._max_ms, wait_ms)
+            if timed_out:
+                self._timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._bucket_counts)
+            summary = {
+                "count": self._count,
+                "sum_ms": round(self._sum_ms, 3),
+                "max_ms": round(self._max_ms, 3),
+                "timeouts": self._timeouts,
+            }
+
+        buckets = {}
+        running = 0
+        for bound, count in zip([*map(str, self.buckets_ms), "+Inf"], counts):
+            running += count
+            buckets[bound] = running
+        return {**summary, "buckets_ms": buckets}
+
+
+class _TimedCheckoutMixin:
+    checkout_metrics: CheckoutMetrics
+    base_pool_class: type
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_metrics.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.checkout_metrics.observe(time.perf_counter() - started)
+        return connection
+
+
+def timed_pool_class(pool_class, metrics: CheckoutMetrics):
+    # Bound as a class attribute so the metrics survive Pool.recreate().
+    return type(
+        f"Timed{pool_class.__name__}",
+        (_TimedCheckoutMixin, pool_class),
+        {"checkout_metrics": metrics, "base_pool_class": pool_class},
+    )
+
+
+def pool_status(pool) -> dict:
+    status = {"pool_class": getattr(pool, "base_pool_class", type(pool)).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    metrics = getattr(pool, "checkout_metrics", None)
+    if metrics is not None:
+        status["checkout_wait"] = metrics.snapshot()
+    return status
@@ -0,0 +1,131 @@
+"""Send read-only requests to a streaming replica.
+
+GET and HEAD requests read from the replica unless the client committed a write
+within the last ``DB_REPLICA_STICKY_SECONDS`` (remembered in a cookie), or the
+replica is unreachable or more than ``DB_REPLICA_MAX_LAG`` seconds behind.
+Everything else uses the primary.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+# Reads stay on the primary at least as long as the replica may lag behind it.
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", str(DB_REPLICA_MAX_LAG)))
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "1"))
+STICKY_COOKIE = "ois_primary_until"
+
+# An idle primary sends no new WAL, so a replica that has replayed everything
+# it received counts as current however old its last transaction is.
+_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaRouter:
+    """Decides per request whether its session reads from the replica.
+
+    Replica health is checked at most once per ``check_interval`` per worker;
+    requests arriving while a check runs use the previous result.
+    """
+
+    def __init__(
+        self,
+        engine,
+        async_engine=None,
+        max_lag: float = DB_REPLICA_MAX_LAG,
+        sticky_seconds: float = DB_REPLICA_STICKY_SECONDS,
+        check_interval: float = DB_REPLICA_CHECK_INTERVAL,
+    ):
+        self.engine = engine
+        self.async_engine = async_engine
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.check_interval = check_interval
+        self._usable = False
+        self._checked_until = 0.0
+        self._lock = threading.Lock()
+
+    def lag(self) -> float | None:
+        """Seconds the replica is behind, or None if it has replayed nothing yet."""
+        with self.engine.connect() as connection:
+            lag = connection.execute(_LAG_QUERY).scalar()
+        return None if lag is None else float(lag)
+
+    @property
+    def check_due(self) -> bool:
+        return time.monotonic() >= self._checked_until
+
+    def usable(self) -> bool:
+        if self.check_due and self._lock.acquire(blocking=False):
+            try:
+                problem = self._problem()
+                if problem is not None and self._usable:
+                    logger.warning("Read replica %s; reading from the primary.", problem)
+                elif problem is None and not self._usable:
+                    logger.info("Reading from the replica.")
+                self._usable = problem is None
+            finally:
+                self._checked_until = time.monotonic() + self.check_interval
+                self._lock.release()
+        return self._usable
+
+    def _problem(self) -> str | None:
+        try:
+            lag = self.lag()
+        except Exception as exc:
+            return f"is unreachable ({type(exc).__name__})"
+        if lag is None:
+            return "has not replayed anything yet"
+        if lag > self.max_lag:
+            return f"is {lag:.1f}s behind"
+        return None
+
+    def mark_unavailable(self) -> None:
+        """Stop reading from the replica until the next check."""
+        if self._usable:
+            logger.warning("Read replica query failed; reading from the primary.")
+        self._usable = False
+        self._checked_until = time.monotonic() + self.check_interval
+
+    def sticky(self, request: Request) -> bool:
+        try:
+            return float(request.cookies.get(STICKY_COOKIE, "0")) > time.time()
+        except ValueError:
+            return False
+
+    def stick(self, response: Response) -> None:
+        """Keep the client that got ``response`` on the primary for a while."""
+        if self.sticky_seconds <= 0:
+            return
+        response.set_cookie(
+            STICKY_COOKIE,
+            f"{time.time() + self.sticky_seconds:.3f}",
+            max_age=math.ceil(self.sticky_seconds),
+            httponly=True,
+            samesite="lax",
+        )
+
+    def reads_from_replica(self, request: Request) -> bool:
+        return (
+            request.method in READ_METHODS
+            and not getattr(request.state, "db_primary", False)
+            and not self.sticky(request)
+            and self.usable()
+        )
+
+    def cache_ttl(self, ttl: float) -> float:
+        """How long a shared cache may keep something read from the replica."""
+        return min(ttl, self.max_lag)
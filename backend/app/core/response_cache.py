@@ -0,0 +1,416 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlencode
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "2048"))
+RESPONSE_CACHE_PATH = os.getenv(
+    "RESPONSE_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "ois-reports", "response-cache.sqlite3"),
+)
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+# Recomputed for every response, so never stored.
+_SKIPPED_HEADERS = {"content-length", "date", "server"}
+# How long, in seconds, a backend remembers when a tag was last invalidated. A
+# response read from the database before an invalidation must not be stored
+# after it, so one whose mark is older than this is never stored.
+INVALIDATION_HORIZON = 300
+
+
+class MemoryBackend:
+    """Per-process LRU store; fine for a single worker and for tests."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        # Every invalidation advances the clock; tags map to the clock value and
+        # time of their last one, oldest first.
+        self._clock = 0
+        self._invalidated: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self) -> tuple[int, float]:
+        with self._lock:
+            return self._clock, time.monotonic()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        tags: list[str],
+        ttl: int,
+        since: tuple[int, float] | None = None,
+    ) -> None:
+        with self._lock:
+            if since is not None and self._invalidated_since(tags, since):
+                return
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: list[str]) -> None:
+        with self._lock:
+            self._clock += 1
+            now = time.monotonic()
+            for tag in tags:
+                self._invalidated.pop(tag, None)
+                self._invalidated[tag] = (self._clock, now)
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+            while self._invalidated:
+                tag, (_, at) = next(iter(self._invalidated.items()))
+                if at > now - INVALIDATION_HORIZON:
+                    break
+                del self._invalidated[tag]
+
+    def _invalidated_since(self, tags: list[str], since: tuple[int, float]) -> bool:
+        clock, marked_at = since
+        if time.monotonic() - marked_at >= INVALIDATION_HORIZON:
+            return True
+        return any(self._invalidated.get(tag, (0, 0))[0] > clock for tag in tags)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class SQLiteBackend:
+    """Store in one SQLite file that all workers on a host share.
+
+    A stand-in for Redis when the workers run on a single machine, and the
+    backend the tests use for cross-worker behaviour without a network.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS tags (
+            tag TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (tag, key)
+        );
+        CREATE INDEX IF NOT EXISTS ix_tags_key ON tags (key);
+        CREATE INDEX IF NOT EXISTS ix_entries_expires_at ON entries (expires_at);
+        CREATE TABLE IF NOT EXISTS invalidations (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tag TEXT NOT NULL,
+            at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ix_invalidations_tag ON invalidations (tag, seq);
+    """
+    # Expired rows are swept every this many writes.
+    _PURGE_INTERVAL = 100
+
+    def __init__(self, path: str | os.PathLike = RESPONSE_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        self._connection().executescript(self._SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> bytes | None:
+        row = self._connection().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark(self) -> tuple[int, float]:
+        # AUTOINCREMENT never reuses a seq, even after old invalidations are swept.
+        row = self._connection().execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'invalidations'"
+        ).fetchone()
+        return (row[0] if row else 0), time.time()
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        tags: list[str],
+        ttl: int,
+        since: tuple[int, float] | None = None,
+    ) -> None:
+        connection = self._connection()
+        with _immediate(connection):
+            if since is not None and self._invalidated_since(connection, tags, since):
+                return
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            connection.execute("DELETE FROM tags WHERE key = ?", (key,))
+            connection.executemany(
+                "INSERT OR IGNORE INTO tags (tag, key) VALUES (?, ?)", [(tag, key) for tag in tags]
+            )
+            self._writes += 1
+            if self._writes % self._PURGE_INTERVAL == 0:
+                self._delete_keys(
+                    connection, "SELECT key FROM entries WHERE expires_at <= ?", (time.time(),)
+                )
+                connection.execute(
+                    "DELETE FROM invalidations WHERE at <= ?",
+                    (time.time() - INVALIDATION_HORIZON,),
+                )
+
+    def invalidate(self, tags: list[str]) -> None:
+        if not tags:
+            return
+        connection = self._connection()
+        placeholders = ", ".join("?" for _ in tags)
+        with _immediate(connection):
+            now = time.time()
+            connection.executemany(
+                "INSERT INTO invalidations (tag, at) VALUES (?, ?)", [(tag, now) for tag in tags]
+            )
+            self._delete_keys(
+                connection, f"SELECT key FROM tags WHERE tag IN ({placeholders})", tags
+            )
+
+    @staticmethod
+    def _invalidated_since(
+        connection: sqlite3.Connection, tags: list[str], since: tuple[int, float]
+    ) -> bool:
+        seq, marked_at = since
+        if time.time() - marked_at >= INVALIDATION_HORIZON:
+            return True
+        if not tags:
+            return False
+        placeholders = ", ".join("?" for _ in tags)
+        row = connection.execute(
+            f"SELECT 1 FROM invalidations WHERE tag IN ({placeholders}) AND seq > ? LIMIT 1",
+            [*tags, seq],
+        ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _delete_keys(connection: sqlite3.Connection, key_query: str, parameters) -> None:
+        keys = [(key,) for (key,) in connection.execute(key_query, parameters)]
+        connection.executemany("DELETE FROM entries WHERE key = ?", keys)
+        connection.executemany("DELETE FROM tags WHERE key = ?", keys)
+
+
+@contextmanager
+def _immediate(connection: sqlite3.Connection):
+    # BEGIN IMMEDIATE takes the write lock up front, so concurrent writers
+    # queue on the busy timeout instead of failing on lock upgrade.
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+class RedisBackend:
+    """Store shared by every worker and container that can reach one Redis."""
+
+    def __init__(self, url: str = RESPONSE_CACHE_REDIS_URL, prefix: str = "ois:response:"):
+        # Imported here: redis is only needed when this backend is configured.
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._watch_error = redis.WatchError
+        self.prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(self.prefix + key)
+
+    def mark(self) -> tuple[int, float]:
+        return int(self._client.get(self._clock_key) or 0), time.time()
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        tags: list[str],
+        ttl: int,
+        since: tuple[int, float] | None = None,
+    ) -> None:
+        with self._client.pipeline() as pipeline:
+            if since is not None:
+                # An invalidation that lands between this check and EXEC changes
+                # a watched key, so EXEC stores nothing.
+                clock, marked_at = since
+                invalidated_keys = [self._invalidated_key(tag) for tag in tags]
+                if invalidated_keys:
+                    pipeline.watch(*invalidated_keys)
+                    invalidated = pipeline.mget(invalidated_keys)
+                else:
+                    invalidated = []
+                if time.time() - marked_at >= INVALIDATION_HORIZON or any(
+                    seq is not None and int(seq) > clock for seq in invalidated
+                ):
+                    return
+                pipeline.multi()
+            pipeline.set(self.prefix + key, value, ex=ttl)
+            for tag in tags:
+                # Every member expires within ttl, so the tag set may too.
+                pipeline.sadd(self._tag_key(tag), key)
+                pipeline.expire(self._tag_key(tag), ttl)
+            try:
+                pipeline.execute()
+            except self._watch_error:
+                pass
+
+    def invalidate(self, tags: list[str]) -> None:
+        if not tags:
+            return
+        # Recorded before the entries go, so a response read before this
+        # invalidation is refused by set even if it is stored in between.
+        seq = self._client.incr(self._clock_key)
+        pipeline = self._client.pipeline()
+        for tag in tags:
+            pipeline.set(self._invalidated_key(tag), seq, ex=INVALIDATION_HORIZON)
+        pipeline.execute()
+        pipeline = self._client.pipeline()
+        for tag in tags:
+            pipeline.smembers(self._tag_key(tag))
+        keys = {key.decode() for members in pipeline.execute() for key in members}
+        self._client.delete(
+            *(self.prefix + key for key in keys), *(self._tag_key(tag) for tag in tags)
+        )
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _invalidated_key(self, tag: str) -> str:
+        return f"{self.prefix}invalidated:{tag}"
+
+    @property
+    def _clock_key(self) -> str:
+        return f"{self.prefix}invalidations"
+
+
+class ResponseCache:
+    """Stores finished GET responses by URL and drops them by tag."""
+
+    def __init__(self, backend, ttl: int = RESPONSE_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def key(request: Request) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def mark(self):
+        """Opaque point in the invalidation history, to pass to ``set`` as ``since``."""
+        return self.backend.mark()
+
+    def get(
+        self, key: str, encoding: str | None = None
+    ) -> tuple[dict[str, str], bytes, list[str]] | None:
+        """Headers, body and tags of a stored response.
+
+        With ``encoding``, the body compressed that way is preferred when one
+        was stored; otherwise the identity body is returned.
+        """
+        raw = None
+        if encoding is not None:
+            raw = self.backend.get(f"{key}#{encoding}")
+        if raw is None:
+            raw = self.backend.get(key)
+        if raw is None:
+            return None
+        meta_line, _, body = raw.partition(b"\n")
+        meta = json.loads(meta_line)
+        return meta["headers"], body, meta["tags"]
+
+    def set(
+        self,
+        key: str,
+        headers: dict[str, str],
+        body: bytes,
+        tags: list[str],
+        encoding: str | None = None,
+        ttl: int | None = None,
+        since=None,
+    ) -> None:
+        """Store a response, unless one of ``tags`` was invalidated after ``since``.
+
+        A response built from data read before ``since`` was taken could
+        otherwise outlive the invalidation of a write that committed while it
+        was being built.
+        """
+        # Every encoding of a response carries the same tags, so one
+        # invalidation drops them all.
+        stored = {name: value for name, value in headers.items() if name not in _SKIPPED_HEADERS}
+        meta = json.dumps({"headers": stored, "tags": tags}).encode()
+        key = key if encoding is None else f"{key}#{encoding}"
+        ttl = self.ttl if ttl is None else ttl
+        self.backend.set(key, meta + b"\n" + body, tags, ttl, since=since)
+
+    def invalidate(self, tags: list[str]) -> None:
+        self.backend.invalidate(tags)
+
+
+def _from_env() -> ResponseCache | None:
+    backends = {"memory": MemoryBackend, "sqlite": SQLiteBackend, "redis": RedisBackend}
+    if RESPONSE_CACHE_BACKEND == "none" or RESPONSE_CACHE_TTL <= 0:
+        return None
+    if RESPONSE_CACHE_BACKEND not in backends:
+        raise RuntimeError(f"Unknown RESPONSE_CACHE_BACKEND {RESPONSE_CACHE_BACKEND!r}.")
+    return ResponseCache(backends[RESPONSE_CACHE_BACKEND]())
+
+
+response_cache = _from_env()
+
+
+def tag_response(request: Request, *tags: str) -> None:
+    """Record the tags a cached route's response depends on."""
+    request.state.cache_tags = list(tags)
+
+
+def invalidate_on_commit(db: Session, *tags: str) -> None:
+    """Drop responses tagged with any of ``tags`` once ``db`` commits."""
+    if response_cache is None or not tags:
+        return
+    cache = response_cache
+    event.listen(db, "after_commit", lambda session: cache.invalidate(list(tags)), once=True)
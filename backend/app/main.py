@@ -1,44 +1,41 @@
-import time
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
 
 from .api.router import api_router
-from .core.database import Base, SessionLocal, engine
-from .models import Client, Customer
+from .core.compression import CompressionMiddleware
+from .core.lifecycle import prepare_database, reset_readiness
+from .core.pagination import NEXT_CURSOR_HEADER
+from .services.partitions import maintain_partitions
+from .services.reference_data import start_invalidation_listener, stop_invalidation_listener
+from .services.report_pdf import shutdown_render_pool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Wait briefly for the DB container to accept connections.
-    for _ in range(10):
-        try:
-            Base.metadata.create_all(bind=engine)
-            break
-        except Exception:
-            time.sleep(1)
-    else:
-        Base.metadata.create_all(bind=engine)
-
-    db = SessionLocal()
-    try:
-        if db.query(Client).count() == 0:
-            client = Client(name="Initial Client")
-            db.add(client)
-            db.commit()
-            db.refresh(client)
-        else:
-            client = db.query(Client).order_by(Client.id.asc()).first()
-
-        if client and db.query(Customer).count() == 0:
-            db.add(Customer(name="Initial Customer", client_id=client.id))
-            db.commit()
-    finally:
-        db.close()
+    # The schema and seed data come from `alembic upgrade head`, run as its own
+    # deployment step. Serving starts at once; /readyz reports 503 until the
+    # database answers.
+    background = [
+        asyncio.create_task(prepare_database()),
+        asyncio.create_task(maintain_partitions()),
+    ]
+    start_invalidation_listener()
 
     yield
 
+    for task in background:
+        task.cancel()
+    # Collects a task's own failure too, so it cannot skip the cleanup below.
+    await asyncio.gather(*background, return_exceptions=True)
+    reset_readiness()
+    stop_invalidation_listener()
+    shutdown_render_pool()
+
 
 app = FastAPI(lifespan=lifespan)
 
@@ -48,6 +45,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+app.add_middleware(CompressionMiddleware)
+
+
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    # Another request updated the row between our read and the versioned UPDATE.
+    return JSONResponse(status_code=409, content={"detail": "Resource was modified concurrently."})
 
 app.include_router(api_router)
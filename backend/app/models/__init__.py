@@ -1,15 +1,63 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from ..core.database import Base
 
+# Text search configurations: names are matched word for word, free text is stemmed.
+NAME_SEARCH_CONFIG = "simple"
+TEXT_SEARCH_CONFIG = "german"
+
+
+def _search_vector(column: str, config: str) -> Column:
+    # Generated by Postgres on every INSERT/UPDATE of the source column. Models
+    # leave it unmapped so the ORM never selects or returns it.
+    return Column(TSVECTOR, Computed(f"to_tsvector('{config}', {column})", persisted=True))
+
+
+def _search_index(table: str) -> Index:
+    return Index(f"ix_{table}_search_vector", "search_vector", postgresql_using="gin")
+
+
+def _external_ref_index(table: str, parent: str) -> Index:
+    # Rows awaiting purge give up their ref, so re-importing one creates a new row.
+    return Index(
+        f"uq_{table}_{parent}_external_ref",
+        parent,
+        "external_ref",
+        unique=True,
+        postgresql_where=text("external_ref IS NOT NULL AND deleted_at IS NULL"),
+    )
+
+
+def _deleted_index(table: str) -> Index:
+    # Soft-deleted rows awaiting purge; reads filter on this small set.
+    return Index(f"ix_{table}_deleted", "id", postgresql_where=text("deleted_at IS NOT NULL"))
+
 
 class Manufacturer(Base):
     __tablename__ = "manufacturers"
+    __table_args__ = (_search_index("manufacturers"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
+    search_vector = _search_vector("name", NAME_SEARCH_CONFIG)
+    # Bumped by the ORM on every UPDATE; feeds ETags and optimistic locking.
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version, "exclude_properties": ["search_vector"]}
 
     filter_plants = relationship("FilterPlant", back_populates="manufacturer")
 
@@ -19,70 +67,174 @@ class Client(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     customers = relationship("Customer", back_populates="client")
 
 
 class Customer(Base):
     __tablename__ = "customers"
+    __table_args__ = (
+        _external_ref_index("customers", "client_id"),
+        _search_index("customers"),
+        _deleted_index("customers"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
+    search_vector = _search_vector("name", NAME_SEARCH_CONFIG)
+    # Key from the system a batch import came from; used to upsert re-runs.
+    external_ref = Column(String(100), nullable=True)
+    # Set when the customer is deleted in soft-delete mode, until it is purged.
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version, "exclude_properties": ["search_vector"]}
 
     client = relationship("Client", back_populates="customers")
-    filter_plants = relationship("FilterPlant", back_populates="customer", cascade="all, delete-orphan")
+    # Children are deleted by ON DELETE CASCADE, not loaded and deleted one by one.
+    filter_plants = relationship(
+        "FilterPlant", back_populates="customer", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
 class FilterPlant(Base):
     __tablename__ = "filter_plants"
+    __table_args__ = (
+        _external_ref_index("filter_plants", "customer_id"),
+        _search_index("filter_plants"),
+        _deleted_index("filter_plants"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False, index=True)
+    customer_id = Column(
+        Integer, ForeignKey("customers.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     manufacturer_id = Column(Integer, ForeignKey("manufacturers.id"), nullable=False, index=True)
     description = Column(String(500), nullable=False)
+    search_vector = _search_vector("description", TEXT_SEARCH_CONFIG)
     year_built = Column(Integer, nullable=False)
+    external_ref = Column(String(100), nullable=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version, "exclude_properties": ["search_vector"]}
 
     customer = relationship("Customer", back_populates="filter_plants")
     manufacturer = relationship("Manufacturer", back_populates="filter_plants")
-    components = relationship("Component", back_populates="filter_plant", cascade="all, delete-orphan")
-    reports = relationship("Report", back_populates="filter_plant", cascade="all, delete-orphan")
+    components = relationship(
+        "Component",
+        back_populates="filter_plant",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="Component.id",
+    )
+    reports = relationship(
+        "Report", back_populates="filter_plant", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
 class Component(Base):
     __tablename__ = "components"
+    __table_args__ = (
+        _external_ref_index("components", "filter_plant_id"),
+        _search_index("components"),
+        _deleted_index("components"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    filter_plant_id = Column(Integer, ForeignKey("filter_plants.id"), nullable=False, index=True)
+    filter_plant_id = Column(
+        Integer, ForeignKey("filter_plants.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     name = Column(String(255), nullable=False)
+    search_vector = _search_vector("name", NAME_SEARCH_CONFIG)
+    external_ref = Column(String(100), nullable=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version, "exclude_properties": ["search_vector"]}
 
     filter_plant = relationship("FilterPlant", back_populates="components")
     report_components = relationship(
-        "ReportComponent", back_populates="component", cascade="all, delete-orphan"
+        "ReportComponent",
+        back_populates="component",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
 
+# Reports and their items are range partitioned by the report's creation month
+# (see app/services/partitions.py). Postgres requires the partition key in
+# every primary key, so the tables' keys include it; the ORM still identifies
+# rows by id alone.
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        Index("ix_reports_created_at_id", "created_at", "id"),
+        Index("ix_reports_customer_id_created_at_id", "customer_id", "created_at", "id"),
+        Index("ix_reports_filter_plant_id_created_at_id", "filter_plant_id", "created_at", "id"),
+        Index("ix_reports_completed_created_at_id", "completed", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False, index=True)
-    filter_plant_id = Column(Integer, ForeignKey("filter_plants.id"), nullable=False, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    customer_id = Column(Integer, ForeignKey("customers.id", ondelete="CASCADE"), nullable=False)
+    filter_plant_id = Column(
+        Integer, ForeignKey("filter_plants.id", ondelete="CASCADE"), nullable=False
+    )
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     completed = Column(Boolean, nullable=False, server_default="false")
+    # Maintained by the report_stats triggers on report_components, created in
+    # migration 0007, recreated for the partitioned tables in 0010 and sharded in 0011.
+    item_count = Column(Integer, nullable=False, server_default="0")
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {
+        "primary_key": [id],
+        "version_id_col": version,
+        "exclude_properties": ["item_count"],
+    }
 
     customer = relationship("Customer")
     filter_plant = relationship("FilterPlant", back_populates="reports")
-    items = relationship("ReportComponent", back_populates="report", cascade="all, delete-orphan")
+    items = relationship(
+        "ReportComponent",
+        back_populates="report",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="ReportComponent.id",
+    )
 
 
 class ReportComponent(Base):
     __tablename__ = "report_components"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["report_id", "report_created_at"],
+            ["reports.id", "reports.created_at"],
+            ondelete="CASCADE",
+        ),
+        _search_index("report_components"),
+        {"postgresql_partition_by": "RANGE (report_created_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    report_id = Column(Integer, ForeignKey("reports.id"), nullable=False, index=True)
-    component_id = Column(Integer, ForeignKey("components.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    report_id = Column(Integer, nullable=False, index=True)
+    # Copy of the report's created_at: places the item in its report's partition.
+    report_created_at = Column(DateTime(timezone=True), primary_key=True)
+    component_id = Column(
+        Integer, ForeignKey("components.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     description = Column(String(1000), nullable=False)
+    search_vector = _search_vector("description", TEXT_SEARCH_CONFIG)
+
+    __mapper_args__ = {"primary_key": [id], "exclude_properties": ["search_vector"]}
 
     report = relationship("Report", back_populates="items")
     component = relationship("Component", back_populates="report_components")
+
+
+from .report_stats import ReportStats  # noqa: E402,F401
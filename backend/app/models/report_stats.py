@@ -0,0 +1,28 @@
+from sqlalchemy import BigInteger, Column, Integer, Numeric, SmallInteger, String
+
+from ..core.database import Base
+
+# Scopes a row of report_stats aggregates over; "all" uses scope_id 0.
+REPORT_STATS_SCOPES = ("all", "customer", "manufacturer", "filter_plant")
+
+
+class ReportStats(Base):
+    """Report counters per scope, kept current by triggers on every write.
+
+    Only the triggers created by migration 0007 write to this table. A scope's
+    counters are spread over up to 16 shards (migration 0011), one per group of
+    database sessions, and are the sum of its rows. ``rebuild_report_stats``
+    recomputes it from scratch.
+    """
+
+    __tablename__ = "report_stats"
+
+    scope = Column(String(20), primary_key=True)
+    scope_id = Column(Integer, primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, server_default="0")
+    open_reports = Column(BigInteger, nullable=False, server_default="0")
+    completed_reports = Column(BigInteger, nullable=False, server_default="0")
+    report_components = Column(BigInteger, nullable=False, server_default="0")
+    # Sum of created_at (epoch seconds) over open reports, for their average age.
+    open_created_at_sum = Column(Numeric, nullable=False, server_default="0")
+
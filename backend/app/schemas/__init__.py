@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Generic, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AliasChoices, AliasPath, BaseModel, ConfigDict, Field
 
 
 class CustomerCreate(BaseModel):
@@ -8,6 +9,10 @@ class CustomerCreate(BaseModel):
     client_id: int
 
 
+class CustomerBatchItem(CustomerCreate):
+    external_ref: str | None = Field(None, max_length=100)
+
+
 class CustomerRead(BaseModel):
     id: int
     name: str
@@ -16,6 +21,12 @@ class CustomerRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CustomerExpandedRead(CustomerRead):
+    client_name: str = Field(
+        validation_alias=AliasChoices("client_name", AliasPath("client", "name"))
+    )
+
+
 class CustomerUpdate(BaseModel):
     name: str
     client_id: int
@@ -49,6 +60,11 @@ class FilterPlantCreate(BaseModel):
     manufacturer_id: int
 
 
+class FilterPlantBatchItem(FilterPlantCreate):
+    customer_id: int
+    external_ref: str | None = Field(None, max_length=100)
+
+
 class FilterPlantRead(BaseModel):
     id: int
     customer_id: int
@@ -69,6 +85,11 @@ class ComponentCreate(BaseModel):
     name: str
 
 
+class ComponentBatchItem(ComponentCreate):
+    filter_plant_id: int
+    external_ref: str | None = Field(None, max_length=100)
+
+
 class ComponentRead(BaseModel):
     id: int
     filter_plant_id: int
@@ -77,6 +98,13 @@ class ComponentRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class FilterPlantExpandedRead(FilterPlantRead):
+    manufacturer_name: str = Field(
+        validation_alias=AliasChoices("manufacturer_name", AliasPath("manufacturer", "name"))
+    )
+    components: list[ComponentRead]
+
+
 class ComponentUpdate(BaseModel):
     name: str
 
@@ -100,6 +128,14 @@ class ReportRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ReportFilter(BaseModel):
+    customer_id: int | None = None
+    filter_plant_id: int | None = None
+    completed: bool | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
 class ReportListRead(BaseModel):
     id: int
     customer_id: int
@@ -114,21 +150,131 @@ class ReportListRead(BaseModel):
 
 class ReportComponentRead(BaseModel):
     component_id: int
-    component_name: str
+    component_name: str = Field(
+        validation_alias=AliasChoices("component_name", AliasPath("component", "name"))
+    )
     description: str
 
 
 class ReportDetailRead(BaseModel):
     id: int
     customer_id: int
-    customer_name: str
+    customer_name: str = Field(
+        validation_alias=AliasChoices("customer_name", AliasPath("customer", "name"))
+    )
     filter_plant_id: int
-    filter_plant_description: str
+    filter_plant_description: str = Field(
+        validation_alias=AliasChoices(
+            "filter_plant_description", AliasPath("filter_plant", "description")
+        )
+    )
     created_at: datetime
     completed: bool
-    components: list[ReportComponentRead]
+    components: list[ReportComponentRead] = Field(
+        validation_alias=AliasChoices("components", "items")
+    )
 
 
 class ReportUpdate(BaseModel):
     completed: bool
     component_descriptions: list[ReportComponentCreate]
+
+
+class ReportExportRead(BaseModel):
+    id: str
+    status: str
+    total: int
+    rendered: int
+    error: str | None = None
+    created_at: datetime
+
+
+MAX_BATCH_ITEMS = 1000
+
+BatchItemT = TypeVar("BatchItemT")
+
+
+class BatchCreate(BaseModel, Generic[BatchItemT]):
+    items: list[BatchItemT] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+    upsert: bool = False
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    status: str
+    id: int | None = None
+    error: str | None = None
+
+
+class BatchResult(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    items: list[BatchItemResult]
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportSummary(BaseModel):
+    dry_run: bool
+    rows: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    created_customers: int = 0
+    created_filter_plants: int = 0
+    created_components: int = 0
+    errors: list[ImportRowError] = []
+
+
+class ReportSummaryRead(BaseModel):
+    id: int
+    created_at: datetime
+    completed: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DashboardFilterPlantRead(FilterPlantExpandedRead):
+    report_count: int
+    open_report_count: int
+    latest_report: ReportSummaryRead | None
+
+
+class CustomerDashboardRead(CustomerExpandedRead):
+    filter_plants: list[DashboardFilterPlantRead]
+    report_count: int
+    open_report_count: int
+    latest_reports: list[ReportListRead]
+
+
+class SearchResultRead(BaseModel):
+    kind: str
+    id: int
+    title: str
+    rank: float
+    customer_id: int | None
+    filter_plant_id: int | None
+    report_id: int | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReportStatsRead(BaseModel):
+    open_reports: int = 0
+    completed_reports: int = 0
+    total_reports: int = 0
+    report_components: int = 0
+    average_components_per_report: float | None = None
+    average_open_report_age_days: float | None = None
+
+
+class CustomerReportStatsRead(ReportStatsRead):
+    customer_id: int
+
+
+class ManufacturerReportStatsRead(ReportStatsRead):
+    manufacturer_id: int
@@ -0,0 +1 @@
+"""Domain services used by the API routes."""
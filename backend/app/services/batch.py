@@ -0,0 +1,96 @@
+from sqlalchemy import and_, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..schemas import BatchItemResult, BatchResult
+
+
+def existing_ids(db: Session, column, ids) -> set[int]:
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(ids))))
+
+
+def write_batch(
+    db: Session,
+    model,
+    parent_key: str,
+    entries: list[tuple[int, dict]],
+    errors: dict[int, str],
+    upsert: bool,
+) -> BatchResult:
+    """Insert validated batch rows in one ``INSERT ... RETURNING`` statement.
+
+    ``entries`` holds ``(index, values)`` pairs for rows that passed validation
+    and ``errors`` the messages for those that did not. Rows carrying an
+    ``external_ref`` are unique per parent among rows that are not soft
+    deleted; with ``upsert`` an existing row is updated through ``ON CONFLICT
+    DO UPDATE``, otherwise it is reported as an error. Nothing is committed
+    here.
+    """
+    parent_column = getattr(model, parent_key)
+    pending = []
+    refs: dict[tuple[int, str], int] = {}
+    for index, values in entries:
+        ref = values.get("external_ref")
+        if ref is not None:
+            key = (values[parent_key], ref)
+            if key in refs:
+                errors[index] = "Duplicate external_ref in batch."
+                continue
+            refs[key] = index
+        pending.append((index, values))
+
+    if refs and not upsert:
+        taken = set(
+            db.execute(
+                select(parent_column, model.external_ref).where(
+                    tuple_(parent_column, model.external_ref).in_(list(refs)),
+                    model.deleted_at.is_(None),
+                )
+            ).all()
+        )
+        for key in taken:
+            errors[refs[key]] = "Already exists."
+        pending = [(index, values) for index, values in pending if index not in errors]
+
+    results = {
+        index: BatchItemResult(index=index, status="error", error=message)
+        for index, message in errors.items()
+    }
+    if pending:
+        statement = insert(model)
+        if upsert:
+            statement = statement.on_conflict_do_update(
+                index_elements=[parent_column, model.external_ref],
+                # Soft-deleted rows are outside the index: a re-run inserts afresh.
+                index_where=and_(model.external_ref.isnot(None), model.deleted_at.is_(None)),
+                set_={
+                    **{
+                        column: statement.excluded[column]
+                        for column in pending[0][1]
+                        if column not in {parent_key, "external_ref"}
+                    },
+                    "version": model.version + 1,
+                },
+            )
+        # xmax is only set on rows that ON CONFLICT DO UPDATE rewrote.
+        statement = statement.returning(
+            model.id,
+            literal_column("xmax = 0").label("inserted"),
+            sort_by_parameter_order=True,
+        )
+        rows = db.execute(statement, [values for _, values in pending]).all()
+        for (index, _), row in zip(pending, rows):
+            results[index] = BatchItemResult(
+                index=index, id=row.id, status="created" if row.inserted else "updated"
+            )
+
+    items = [results[index] for index in sorted(results)]
+    return BatchResult(
+        created=sum(item.status == "created" for item in items),
+        updated=sum(item.status == "updated" for item in items),
+        failed=sum(item.status == "error" for item in items),
+        items=items,
+    )
@@ -0,0 +1,90 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import distinct_on
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from ..models import Customer, FilterPlant, Report
+from ..schemas import (
+    ComponentRead,
+    CustomerDashboardRead,
+    DashboardFilterPlantRead,
+    ReportListRead,
+    ReportSummaryRead,
+)
+from .report_queries import report_list_query
+
+LATEST_REPORTS = 5
+
+
+def _report_stats(db: Session, customer_id: int) -> dict:
+    """Count and latest report per plant in one pass over the customer's reports."""
+    by_plant = Report.filter_plant_id
+    window = {"partition_by": by_plant}
+    rows = db.execute(
+        select(
+            by_plant,
+            Report.id,
+            Report.created_at,
+            Report.completed,
+            func.count().over(**window).label("report_count"),
+            func.count().filter(Report.completed.is_(False)).over(**window).label("open_count"),
+        )
+        .ext(distinct_on(by_plant))
+        .where(Report.customer_id == customer_id)
+        .order_by(by_plant, Report.created_at.desc(), Report.id.desc())
+    ).all()
+    return {row.filter_plant_id: row for row in rows}
+
+
+def customer_dashboard(db: Session, customer_id: int) -> CustomerDashboardRead | None:
+    """Everything the customer page shows, in five statements however many plants there are."""
+    customer = db.get(Customer, customer_id, options=[joinedload(Customer.client)])
+    if customer is None:
+        return None
+
+    plants = (
+        db.query(FilterPlant)
+        .options(joinedload(FilterPlant.manufacturer), selectinload(FilterPlant.components))
+        .filter(FilterPlant.customer_id == customer_id)
+        .order_by(FilterPlant.id.asc())
+        .all()
+    )
+    stats = _report_stats(db, customer_id)
+    latest_reports = (
+        report_list_query(db)
+        .filter(Report.customer_id == customer_id)
+        .order_by(Report.created_at.desc(), Report.id.desc())
+        .limit(LATEST_REPORTS)
+        .all()
+    )
+
+    filter_plants = []
+    for plant in plants:
+        plant_stats = stats.get(plant.id)
+        latest_report = ReportSummaryRead.model_validate(plant_stats) if plant_stats else None
+        filter_plants.append(
+            DashboardFilterPlantRead(
+                id=plant.id,
+                customer_id=plant.customer_id,
+                manufacturer_id=plant.manufacturer_id,
+                description=plant.description,
+                year_built=plant.year_built,
+                manufacturer_name=plant.manufacturer.name,
+                components=[
+                    ComponentRead.model_validate(component) for component in plant.components
+                ],
+                report_count=plant_stats.report_count if plant_stats else 0,
+                open_report_count=plant_stats.open_count if plant_stats else 0,
+                latest_report=latest_report,
+            )
+        )
+
+    return CustomerDashboardRead(
+        id=customer.id,
+        name=customer.name,
+        client_id=customer.client_id,
+        client_name=customer.client.name,
+        filter_plants=filter_plants,
+        report_count=sum(row.report_count for row in stats.values()),
+        open_report_count=sum(row.open_count for row in stats.values()),
+        latest_reports=[ReportListRead.model_validate(row) for row in latest_reports],
+    )
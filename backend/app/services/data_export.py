@@ -0,0 +1,196 @@
+import csv
+import io
+import json
+import os
+from itertools import groupby
+
+from sqlalchemy import and_
+
+from ..core.database import SessionLocal
+from ..models import Client, Component, Customer, FilterPlant, Manufacturer, Report, ReportComponent
+from ..schemas import ReportFilter
+from .report_queries import apply_report_filter, report_list_query
+
+STREAM_BATCH_SIZE = int(os.getenv("EXPORT_STREAM_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+REPORT_COLUMNS = (
+    "report_id",
+    "customer_id",
+    "customer_name",
+    "filter_plant_id",
+    "filter_plant_description",
+    "created_at",
+    "completed",
+    "component_id",
+    "component_name",
+    "description",
+)
+# Same leading columns as POST /imports/inventory, so an export can be re-imported.
+INVENTORY_COLUMNS = (
+    "client",
+    "customer",
+    "manufacturer",
+    "filter_plant",
+    "year_built",
+    "component",
+    "client_id",
+    "customer_id",
+    "filter_plant_id",
+    "component_id",
+)
+
+
+def _report_rows(db, filters: ReportFilter):
+    query = (
+        apply_report_filter(report_list_query(db), filters)
+        .outerjoin(
+            ReportComponent,
+            and_(
+                ReportComponent.report_id == Report.id,
+                ReportComponent.report_created_at == Report.created_at,
+            ),
+        )
+        .outerjoin(Component, Component.id == ReportComponent.component_id)
+        .add_columns(
+            ReportComponent.component_id,
+            Component.name.label("component_name"),
+            ReportComponent.description,
+        )
+        .order_by(Report.id.asc(), ReportComponent.id.asc())
+    )
+    # yield_per streams through a server-side cursor instead of buffering the result.
+    return query.yield_per(STREAM_BATCH_SIZE)
+
+
+def _inventory_rows(db, client_id: int | None, customer_id: int | None):
+    query = (
+        db.query(
+            Client.name.label("client"),
+            Customer.name.label("customer"),
+            Manufacturer.name.label("manufacturer"),
+            FilterPlant.description.label("filter_plant"),
+            FilterPlant.year_built,
+            Component.name.label("component"),
+            Client.id.label("client_id"),
+            Customer.id.label("customer_id"),
+            FilterPlant.id.label("filter_plant_id"),
+            Component.id.label("component_id"),
+        )
+        .select_from(Customer)
+        .join(Client, Client.id == Customer.client_id)
+        .outerjoin(FilterPlant, FilterPlant.customer_id == Customer.id)
+        .outerjoin(Manufacturer, Manufacturer.id == FilterPlant.manufacturer_id)
+        .outerjoin(Component, Component.filter_plant_id == FilterPlant.id)
+        .order_by(Customer.id.asc(), FilterPlant.id.asc(), Component.id.asc())
+    )
+    if client_id is not None:
+        query = query.filter(Customer.client_id == client_id)
+    if customer_id is not None:
+        query = query.filter(Customer.id == customer_id)
+    return query.yield_per(STREAM_BATCH_SIZE)
+
+
+def _report_documents(rows):
+    for _, report_rows in groupby(rows, key=lambda row: row.id):
+        report_rows = list(report_rows)
+        first = report_rows[0]
+        yield {
+            "id": first.id,
+            "customer_id": first.customer_id,
+            "customer_name": first.customer_name,
+            "filter_plant_id": first.filter_plant_id,
+            "filter_plant_description": first.filter_plant_description,
+            "created_at": first.created_at.isoformat(),
+            "completed": first.completed,
+            "components": [
+                {
+                    "component_id": row.component_id,
+                    "component_name": row.component_name or "",
+                    "description": row.description,
+                }
+                for row in report_rows
+                if row.component_id is not None
+            ],
+        }
+
+
+def _report_values(row) -> tuple:
+    return (
+        row.id,
+        row.customer_id,
+        row.customer_name,
+        row.filter_plant_id,
+        row.filter_plant_description,
+        row.created_at.isoformat(),
+        row.completed,
+        row.component_id,
+        row.component_name,
+        row.description,
+    )
+
+
+def _ndjson_chunks(documents):
+    buffer = []
+    for document in documents:
+        buffer.append(json.dumps(document, ensure_ascii=False) + "\n")
+        if len(buffer) >= STREAM_BATCH_SIZE:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def _csv_chunks(header, values):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for index, row in enumerate(values, start=1):
+        writer.writerow(row)
+        if index % STREAM_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _stream(build_rows, encode):
+    # The session belongs to the response body, not the request, because it has
+    # to stay open until the last row has been sent.
+    db = SessionLocal()
+    try:
+        for chunk in encode(build_rows(db)):
+            yield chunk.encode()
+    finally:
+        db.close()
+
+
+def iter_reports(filters: ReportFilter, fmt: str):
+    """Yield encoded chunks of all reports matching ``filters`` with their items.
+
+    NDJSON holds one report per line with nested components, CSV one line per
+    report item.
+    """
+    if fmt == "ndjson":
+        return _stream(
+            lambda db: _report_rows(db, filters),
+            lambda rows: _ndjson_chunks(_report_documents(rows)),
+        )
+    return _stream(
+        lambda db: _report_rows(db, filters),
+        lambda rows: _csv_chunks(REPORT_COLUMNS, (_report_values(row) for row in rows)),
+    )
+
+
+def iter_inventory(fmt: str, client_id: int | None = None, customer_id: int | None = None):
+    """Yield encoded chunks of the customer → filter plant → component inventory."""
+    if fmt == "ndjson":
+        return _stream(
+            lambda db: _inventory_rows(db, client_id, customer_id),
+            lambda rows: _ndjson_chunks(row._asdict() for row in rows),
+        )
+    return _stream(
+        lambda db: _inventory_rows(db, client_id, customer_id),
+        lambda rows: _csv_chunks(INVENTORY_COLUMNS, rows),
+    )
@@ -0,0 +1,151 @@
+import logging
+import os
+
+from fastapi import BackgroundTasks
+from sqlalchemy import and_, event, func, select, text, update
+from sqlalchemy.orm import Session, with_loader_criteria
+
+from ..core.database import engine
+from ..models import Component, Customer, FilterPlant, Report, ReportComponent
+
+logger = logging.getLogger(__name__)
+
+# Off: deletes cascade in the database within the request. On: the row is only
+# marked deleted and its subtree is purged afterwards in small transactions.
+SOFT_DELETE = os.getenv("SOFT_DELETE", "0") in {"1", "true", "yes"}
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "1000"))
+
+
+def _visible_criteria():
+    # Plain tables, so the subqueries are not filtered themselves.
+    plants = FilterPlant.__table__
+    components = Component.__table__
+    deleted_plants = select(plants.c.id).where(plants.c.deleted_at.is_not(None))
+    deleted_components = select(components.c.id).where(components.c.deleted_at.is_not(None))
+    return (
+        with_loader_criteria(Customer, Customer.deleted_at.is_(None), include_aliases=True),
+        with_loader_criteria(FilterPlant, FilterPlant.deleted_at.is_(None), include_aliases=True),
+        with_loader_criteria(
+            Component,
+            and_(
+                Component.deleted_at.is_(None),
+                Component.filter_plant_id.not_in(deleted_plants),
+            ),
+            include_aliases=True,
+        ),
+        with_loader_criteria(
+            Report, Report.filter_plant_id.not_in(deleted_plants), include_aliases=True
+        ),
+        with_loader_criteria(
+            ReportComponent,
+            ReportComponent.component_id.not_in(deleted_components),
+            include_aliases=True,
+        ),
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted(state) -> None:
+    # Soft-deleted rows and everything below them stay invisible to ORM
+    # queries until the purge removes them. Relationship and column loads
+    # inherit the criteria from the statement that loaded their parent.
+    if not SOFT_DELETE:
+        return
+    if state.is_select and not state.is_column_load and not state.is_relationship_load:
+        state.statement = state.statement.options(*_visible_criteria())
+
+
+def delete_entity(db: Session, entity, background_tasks: BackgroundTasks) -> None:
+    """Delete ``entity`` with everything below it once ``db`` commits."""
+    if SOFT_DELETE:
+        entity.deleted_at = func.now()
+        if isinstance(entity, Customer):
+            # Marking the plants is enough to hide everything below them.
+            db.execute(
+                update(FilterPlant)
+                .where(FilterPlant.customer_id == entity.id)
+                .values(deleted_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        background_tasks.add_task(purge_deleted)
+    else:
+        # passive_deletes leaves the children to ON DELETE CASCADE: one statement.
+        db.delete(entity)
+
+
+# Rows below each soft-deleted table, deepest first, so every batch is small and
+# the final delete of the marked row has nothing left to cascade to.
+_PURGE_STEPS = {
+    "customers": (
+        ("report_components", "report_id IN (SELECT id FROM reports WHERE customer_id = :id)"),
+        ("reports", "customer_id = :id"),
+        (
+            "report_components",
+            "component_id IN (SELECT components.id FROM components JOIN filter_plants"
+            " ON filter_plants.id = components.filter_plant_id"
+            " WHERE filter_plants.customer_id = :id)",
+        ),
+        (
+            "components",
+            "filter_plant_id IN (SELECT id FROM filter_plants WHERE customer_id = :id)",
+        ),
+        ("filter_plants", "customer_id = :id"),
+    ),
+    "filter_plants": (
+        (
+            "report_components",
+            "report_id IN (SELECT id FROM reports WHERE filter_plant_id = :id)",
+        ),
+        ("reports", "filter_plant_id = :id"),
+        (
+            "report_components",
+            "component_id IN (SELECT id FROM components WHERE filter_plant_id = :id)",
+        ),
+        ("components", "filter_plant_id = :id"),
+    ),
+    "components": (("report_components", "component_id = :id"),),
+}
+
+
+def _delete_in_batches(table: str, condition: str, entity_id: int, batch_size: int) -> int:
+    deleted = 0
+    while True:
+        with engine.begin() as connection:
+            # SKIP LOCKED lets concurrent purges share the work instead of queueing.
+            count = connection.execute(
+                text(
+                    f"DELETE FROM {table} WHERE id IN ("
+                    f"SELECT id FROM {table} WHERE {condition} "
+                    "LIMIT :batch_size FOR UPDATE SKIP LOCKED)"
+                ),
+                {"id": entity_id, "batch_size": batch_size},
+            ).rowcount
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+def purge_deleted(batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Remove soft-deleted rows and everything below them; returns the rows deleted.
+
+    Each batch commits on its own, so locks are held briefly and an
+    interrupted purge continues where it stopped on the next run.
+    """
+    deleted = 0
+    for table, steps in _PURGE_STEPS.items():
+        with engine.connect() as connection:
+            marked = connection.execute(
+                text(f"SELECT id FROM {table} WHERE deleted_at IS NOT NULL ORDER BY id")
+            ).scalars().all()
+        for entity_id in marked:
+            try:
+                for child, condition in steps:
+                    deleted += _delete_in_batches(child, condition, entity_id, batch_size)
+                with engine.begin() as connection:
+                    deleted += connection.execute(
+                        text(f"DELETE FROM {table} WHERE id = :id AND deleted_at IS NOT NULL"),
+                        {"id": entity_id},
+                    ).rowcount
+            except Exception:
+                logger.exception("Purging %s %s failed; the next purge retries.", table, entity_id)
+    return deleted
@@ -0,0 +1,383 @@
+import csv
+import json
+import os
+from collections import OrderedDict
+from itertools import count
+
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from ..core.bulk import copy_rows, supports_copy
+from ..core.database import SessionLocal
+from ..core.response_cache import invalidate_on_commit
+from ..models import Client, Component, Customer, FilterPlant, Manufacturer
+from ..schemas import ImportRowError, ImportSummary
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_CACHE_SIZE = int(os.getenv("IMPORT_CACHE_SIZE", "100000"))
+MAX_REPORTED_ERRORS = 100
+
+FIELDS = ("client", "customer", "manufacturer", "filter_plant", "year_built", "component")
+_MAX_LENGTHS = {"customer": 255, "filter_plant": 500, "component": 255}
+
+
+class InvalidUploadError(ValueError):
+    """The upload cannot be read past a given line at all."""
+
+
+class LookupCache:
+    """Bounded LRU map from natural keys to ids."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+
+def iter_lines(read_chunk):
+    """Turn a ``read_chunk() -> bytes | None`` source into decoded text lines.
+
+    Lines end at "\n" only and keep it, so the csv module still sees "\r\n"
+    and newlines inside quoted fields. Characters such as U+2028 or form feeds
+    that ``str.splitlines`` would also break on stay part of their value.
+    Raises ``InvalidUploadError`` at the first line that is not UTF-8.
+    """
+    encoding = "utf-8-sig"
+    line_number = 0
+    pending = b""
+    while True:
+        chunk = read_chunk()
+        final = chunk is None
+        pending += chunk or b""
+        # "\n" never occurs inside a multi-byte UTF-8 sequence, so complete
+        # lines decode on their own.
+        cut = len(pending) if final else pending.rfind(b"\n") + 1
+        block, pending = pending[:cut], pending[cut:]
+        try:
+            text = block.decode(encoding)
+        except UnicodeDecodeError as exc:
+            line_number += block.count(b"\n", 0, exc.start) + 1
+            raise InvalidUploadError(f"Line {line_number} is not valid UTF-8.") from None
+        if block:
+            encoding = "utf-8"
+        *lines, rest = text.split("\n")
+        line_number += len(lines)
+        for line in lines:
+            yield line + "\n"
+        if final:
+            if rest:
+                yield rest
+            return
+
+
+def iter_records(lines, fmt: str):
+    """Yield ``(line_number, record)`` pairs; unparsable lines yield an error string."""
+    if fmt == "ndjson":
+        for line_number, line in enumerate(lines, start=1):
+            line = line.removesuffix("\n").removesuffix("\r")
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, "Invalid JSON."
+                continue
+            yield line_number, record if isinstance(record, dict) else "Expected a JSON object."
+        return
+
+    # reader.line_num lags behind after an error, so lines are counted here.
+    read = 0
+
+    def count(lines):
+        nonlocal read
+        for line in lines:
+            read += 1
+            yield line
+
+    reader = csv.DictReader(count(lines))
+    try:
+        reader.fieldnames
+    except csv.Error:
+        raise InvalidUploadError(f"Line {read}: invalid CSV header.") from None
+    while True:
+        # The reader starts afresh on the line after an error.
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error:
+            yield read, "Invalid CSV."
+            continue
+        yield read, record
+
+
+class InventoryImporter:
+    """Import client → customer → filter plant → component rows in fixed-size batches.
+
+    Clients and manufacturers must already exist and are resolved by name.
+    Customers and filter plants are created when their name is new for the
+    parent, components are inserted with COPY and skipped when they already
+    exist. Each batch commits on its own, so an interrupted import can simply
+    be re-run. In dry-run mode nothing is written; new parents get
+    placeholder ids so the rows depending on them still validate.
+    """
+
+    def __init__(
+        self,
+        dry_run: bool = False,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        session_factory=SessionLocal,
+    ):
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.summary = ImportSummary(dry_run=dry_run)
+        self._clients = LookupCache(IMPORT_CACHE_SIZE)
+        self._manufacturers = LookupCache(IMPORT_CACHE_SIZE)
+        self._customers = LookupCache(IMPORT_CACHE_SIZE)
+        self._filter_plants = LookupCache(IMPORT_CACHE_SIZE)
+        self._components = LookupCache(IMPORT_CACHE_SIZE)
+        self._placeholder_ids = count(-1, -1)
+
+    def run(self, records) -> ImportSummary:
+        batch = []
+        try:
+            for line_number, record in records:
+                batch.append((line_number, record))
+                if len(batch) >= self.batch_size:
+                    self._import_batch(batch)
+                    batch = []
+        except InvalidUploadError:
+            # Every row before the unreadable line still goes in, so the
+            # upload can be fixed from that line on and imported again.
+            if batch:
+                self._import_batch(batch)
+            raise
+        if batch:
+            self._import_batch(batch)
+        self.summary.errors.sort(key=lambda error: error.line)
+        return self.summary
+
+    def _fail(self, line_number: int, message: str) -> None:
+        self.summary.failed += 1
+        if len(self.summary.errors) < MAX_REPORTED_ERRORS:
+            self.summary.errors.append(ImportRowError(line=line_number, error=message))
+
+    def _validate(self, line_number: int, record) -> dict | None:
+        if isinstance(record, str):
+            self._fail(line_number, record)
+            return None
+
+        row = {field: str(record.get(field) or "").strip() for field in FIELDS}
+        for field in ("client", "customer", "manufacturer", "filter_plant"):
+            if not row[field]:
+                self._fail(line_number, f"{field} is required.")
+                return None
+        for field, max_length in _MAX_LENGTHS.items():
+            if len(row[field]) > max_length:
+                self._fail(line_number, f"{field} must be at most {max_length} characters.")
+                return None
+        try:
+            row["year_built"] = int(row["year_built"])
+        except ValueError:
+            self._fail(line_number, "Year built is invalid.")
+            return None
+        if row["year_built"] < 1800 or row["year_built"] > 2100:
+            self._fail(line_number, "Year built is invalid.")
+            return None
+        return row
+
+    def _resolve_names(self, db: Session, model, cache: LookupCache, names: set[str]) -> None:
+        missing = [name for name in names if name not in cache]
+        if missing:
+            query = (
+                select(model.name, func.min(model.id))
+                .where(model.name.in_(missing))
+                .group_by(model.name)
+            )
+            for name, entity_id in db.execute(query):
+                cache.put(name, entity_id)
+
+    def _resolve_children(
+        self, db: Session, model, parent_column, name_column, cache: LookupCache, keys: set
+    ) -> list:
+        missing = [key for key in keys if key not in cache]
+        # Placeholder parents from a dry run cannot have children in the database yet.
+        lookup = [key for key in missing if key[0] > 0]
+        if lookup:
+            query = (
+                select(parent_column, name_column, func.min(model.id))
+                .where(tuple_(parent_column, name_column).in_(lookup))
+                .group_by(parent_column, name_column)
+            )
+            for parent_id, name, entity_id in db.execute(query):
+                cache.put((parent_id, name), entity_id)
+        return [key for key in missing if key not in cache]
+
+    def _create(self, db: Session, model, cache: LookupCache, keys: list, rows: list[dict]):
+        if not rows:
+            return
+        if self.dry_run:
+            ids = [next(self._placeholder_ids) for _ in rows]
+        else:
+            ids = db.scalars(
+                insert(model).returning(model.id, sort_by_parameter_order=True), rows
+            ).all()
+        for key, entity_id in zip(keys, ids):
+            cache.put(key, entity_id)
+
+    def _resolve_references(self, db: Session, rows: list) -> list:
+        self._resolve_names(db, Client, self._clients, {row["client"] for _, row in rows})
+        self._resolve_names(
+            db, Manufacturer, self._manufacturers, {row["manufacturer"] for _, row in rows}
+        )
+        resolved = []
+        for line_number, row in rows:
+            row["client_id"] = self._clients.get(row["client"])
+            row["manufacturer_id"] = self._manufacturers.get(row["manufacturer"])
+            if row["client_id"] is None:
+                self._fail(line_number, "Client not found.")
+            elif row["manufacturer_id"] is None:
+                self._fail(line_number, "Manufacturer not found.")
+            else:
+                resolved.append(row)
+        return resolved
+
+    def _ensure_customers(self, db: Session, rows: list) -> list:
+        new_keys = self._resolve_children(
+            db,
+            Customer,
+            Customer.client_id,
+            Customer.name,
+            self._customers,
+            {(row["client_id"], row["customer"]) for row in rows},
+        )
+        self._create(
+            db,
+            Customer,
+            self._customers,
+            new_keys,
+            [{"client_id": client_id, "name": name} for client_id, name in new_keys],
+        )
+        for row in rows:
+            row["customer_id"] = self._customers.get((row["client_id"], row["customer"]))
+        return new_keys
+
+    def _ensure_filter_plants(self, db: Session, rows: list) -> list:
+        new_keys = self._resolve_children(
+            db,
+            FilterPlant,
+            FilterPlant.customer_id,
+            FilterPlant.description,
+            self._filter_plants,
+            {(row["customer_id"], row["filter_plant"]) for row in rows},
+        )
+        # The first row naming a new plant decides its manufacturer and year.
+        values = {}
+        for row in rows:
+            key = (row["customer_id"], row["filter_plant"])
+            if key in new_keys and key not in values:
+                values[key] = {
+                    "customer_id": row["customer_id"],
+                    "manufacturer_id": row["manufacturer_id"],
+                    "description": row["filter_plant"],
+                    "year_built": row["year_built"],
+                }
+        self._create(db, FilterPlant, self._filter_plants, list(values), list(values.values()))
+        for row in rows:
+            row["filter_plant_id"] = self._filter_plants.get(
+                (row["customer_id"], row["filter_plant"])
+            )
+        return new_keys
+
+    def _insert_components(self, db: Session, keys: list) -> None:
+        for key in keys:
+            # COPY does not return ids; membership is all later batches need.
+            self._components.put(key, 0)
+        if not keys or self.dry_run:
+            return
+        if supports_copy(db):
+            copy_rows(db, Component.__table__, ["filter_plant_id", "name"], keys)
+        else:
+            db.execute(
+                insert(Component),
+                [{"filter_plant_id": plant_id, "name": name} for plant_id, name in keys],
+            )
+
+    def _import_batch(self, batch: list) -> None:
+        self.summary.rows += len(batch)
+        rows = []
+        for line_number, record in batch:
+            row = self._validate(line_number, record)
+            if row is not None:
+                rows.append((line_number, row))
+
+        db = self.session_factory()
+        try:
+            rows = self._resolve_references(db, rows)
+            new_customers = self._ensure_customers(db, rows)
+            new_plants = self._ensure_filter_plants(db, rows)
+            new_components = set(
+                self._resolve_children(
+                    db,
+                    Component,
+                    Component.filter_plant_id,
+                    Component.name,
+                    self._components,
+                    {
+                        (row["filter_plant_id"], row["component"])
+                        for row in rows
+                        if row["component"]
+                    },
+                )
+            )
+
+            # A row counts as inserted when it is the first to introduce a new entity.
+            unclaimed = {("customer", key) for key in new_customers}
+            unclaimed |= {("filter_plant", key) for key in new_plants}
+            unclaimed |= {("component", key) for key in new_components}
+            components = []
+            for row in rows:
+                keys = [
+                    ("customer", (row["client_id"], row["customer"])),
+                    ("filter_plant", (row["customer_id"], row["filter_plant"])),
+                    ("component", (row["filter_plant_id"], row["component"])),
+                ]
+                claimed = [key for key in keys if key in unclaimed]
+                unclaimed.difference_update(claimed)
+                components.extend(value for kind, value in claimed if kind == "component")
+                if claimed:
+                    self.summary.inserted += 1
+                else:
+                    self.summary.skipped += 1
+
+            self._insert_components(db, components)
+            invalidate_on_commit(
+                db,
+                *{f"customer:{customer_id}" for customer_id, _ in new_plants},
+                *{f"filter_plant:{plant_id}" for plant_id, _ in components},
+            )
+            self.summary.created_customers += len(new_customers)
+            self.summary.created_filter_plants += len(new_plants)
+            self.summary.created_components += len(components)
+
+            if self.dry_run:
+                db.rollback()
+            else:
+                db.commit()
+        finally:
+            db.close()
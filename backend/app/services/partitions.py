@@ -0,0 +1,171 @@
+"""Monthly partitions of reports and report_components.
+
+Both tables are range partitioned by the report's creation month (UTC), one
+partition per month named ``<table>_pYYYY_MM`` plus a default partition that
+catches anything outside them. Run maintenance by hand or from cron with::
+
+    python -m app.services.partitions ensure --months-ahead 3
+    python -m app.services.partitions archive 2024-01 [--export DIR]
+"""
+
+import argparse
+import asyncio
+import gzip
+import logging
+import os
+import re
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import text
+
+from ..core.database import engine
+from .report_stats import subtract_report_stats
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("reports", "report_components")
+ARCHIVE_SCHEMA = "archive"
+REPORT_PARTITION_MONTHS_AHEAD = int(os.getenv("REPORT_PARTITION_MONTHS_AHEAD", "3"))
+# Seconds between checks in every worker; 0 leaves partition creation to cron.
+REPORT_PARTITION_CHECK_INTERVAL = float(os.getenv("REPORT_PARTITION_CHECK_INTERVAL", "3600"))
+# The first check waits a little, so starting a worker issues no DDL.
+_FIRST_CHECK_DELAY = 60
+PARTITION_LOCK_KEY = 4_812_024
+
+_PARTITION_NAME = re.compile(
+    rf"^({'|'.join(PARTITIONED_TABLES)})_(p\d{{4}}_\d{{2}}|default)$"
+)
+
+
+def is_partition(table_name: str) -> bool:
+    return bool(_PARTITION_NAME.match(table_name))
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def ensure_partitions(months_ahead: int = REPORT_PARTITION_MONTHS_AHEAD) -> int:
+    """Create the partitions from this month to ``months_ahead`` months ahead.
+
+    Returns how many months were added; existing partitions are left alone.
+    """
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+        return connection.execute(
+            text(
+                "SELECT create_report_partitions("
+                "(now() AT TIME ZONE 'UTC')::date, "
+                "((now() + make_interval(months => :months_ahead)) AT TIME ZONE 'UTC')::date)"
+            ),
+            {"months_ahead": months_ahead},
+        ).scalar()
+
+
+async def maintain_partitions(interval: float = REPORT_PARTITION_CHECK_INTERVAL) -> None:
+    """Keep partitions created ahead for as long as the worker runs."""
+    if interval <= 0:
+        return
+    await asyncio.sleep(min(_FIRST_CHECK_DELAY, interval))
+    while True:
+        try:
+            created = await asyncio.to_thread(ensure_partitions)
+            if created:
+                logger.info("Created report partitions for %s month(s).", created)
+        except Exception:
+            logger.exception("Creating report partitions failed; retrying later.")
+        await asyncio.sleep(interval)
+
+
+def _detach(connection, table: str, partition: str) -> None:
+    connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+    # The archive stands on its own: no cascades into it, no checks against live rows.
+    constraints = connection.execute(
+        text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:name) AND contype = 'f'"
+        ),
+        {"name": partition},
+    ).scalars().all()
+    for constraint in constraints:
+        connection.execute(text(f'ALTER TABLE {partition} DROP CONSTRAINT "{constraint}"'))
+    connection.execute(text(f"ALTER TABLE {partition} SET SCHEMA {ARCHIVE_SCHEMA}"))
+
+
+def _export(connection, table: str, export_dir: Path) -> Path:
+    path = export_dir / f"{table}.csv.gz"
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as target:
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {ARCHIVE_SCHEMA}.{table} TO STDOUT WITH (FORMAT csv, HEADER)", target
+            )
+    connection.execute(text(f"DROP TABLE {ARCHIVE_SCHEMA}.{table}"))
+    return path
+
+
+def archive_partition(month: date, export_dir: str | os.PathLike | None = None) -> list[str]:
+    """Move one month of completed reports out of the live tables.
+
+    Both partitions are detached into the ``archive`` schema and the month's
+    totals leave report_stats, all in one transaction. With ``export_dir`` the
+    archived tables are then written there as gzipped CSV and dropped. Returns
+    the archive tables or files.
+    """
+    reports = partition_name("reports", month)
+    items = partition_name("report_components", month)
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+        attached = connection.execute(
+            text(
+                "SELECT count(*) FROM pg_inherits "
+                "WHERE inhrelid = to_regclass(:name) AND inhparent = 'reports'::regclass"
+            ),
+            {"name": reports},
+        ).scalar()
+        if not attached:
+            raise ValueError(f"No report partition for {month:%Y-%m}.")
+        # Blocks writes to the month's reports until the detach commits.
+        connection.execute(text(f"LOCK TABLE {reports} IN SHARE MODE"))
+        open_reports = connection.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {reports} WHERE NOT completed)")
+        ).scalar()
+        if open_reports:
+            raise ValueError(f"Reports of {month:%Y-%m} are still open.")
+
+        subtract_report_stats(connection, reports)
+        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        _detach(connection, "report_components", items)
+        _detach(connection, "reports", reports)
+
+    if export_dir is None:
+        return [f"{ARCHIVE_SCHEMA}.{reports}", f"{ARCHIVE_SCHEMA}.{items}"]
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    with engine.begin() as connection:
+        return [str(_export(connection, table, export_dir)) for table in (reports, items)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    ensure = commands.add_parser("ensure", help="create partitions ahead of time")
+    ensure.add_argument("--months-ahead", type=int, default=REPORT_PARTITION_MONTHS_AHEAD)
+    archive = commands.add_parser("archive", help="detach a month of completed reports")
+    archive.add_argument("month", type=lambda value: date.fromisoformat(f"{value}-01"))
+    archive.add_argument("--export", metavar="DIR", help="write gzipped CSV and drop the tables")
+    args = parser.parse_args()
+
+    if args.command == "ensure":
+        print(f"Created partitions for {ensure_partitions(args.months_ahead)} month(s).")
+    else:
+        try:
+            targets = archive_partition(args.month, args.export)
+        except ValueError as exc:
+            parser.error(str(exc))
+        for target in targets:
+            print(target)
+
+
+if __name__ == "__main__":
+    main()
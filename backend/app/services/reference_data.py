@@ -0,0 +1,141 @@
+import logging
+import os
+import select
+import threading
+
+from fastapi import Response
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from ..core.cache import TTLCache
+from ..core.database import DB_PGBOUNCER, engine
+from ..core.pagination import NEXT_CURSOR_HEADER, PageParams, paginate
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+REFERENCE_CACHE_SIZE = int(os.getenv("REFERENCE_CACHE_SIZE", "1024"))
+REFERENCE_CACHE_LISTEN = os.getenv("REFERENCE_CACHE_LISTEN", "1") not in {"0", "false", "no"}
+NOTIFY_CHANNEL = "reference_cache"
+_LISTEN_POLL_SECONDS = 5.0
+_LISTEN_RETRY_SECONDS = 5.0
+
+# Rows are cached as immutable Row snapshots, never as session-bound ORM objects.
+cache = TTLCache(REFERENCE_CACHE_SIZE, REFERENCE_CACHE_TTL)
+
+_listener: threading.Thread | None = None
+_listener_stop = threading.Event()
+# Written to on shutdown so the listener does not sit out its poll interval.
+_wakeup_read, _wakeup_write = os.pipe()
+
+
+def _snapshot_query(db: Session, model):
+    # Generated columns such as search vectors are not part of the snapshot.
+    return db.query(*(column for column in model.__table__.columns if column.computed is None))
+
+
+def _cache_ttl(db: Session) -> float | None:
+    # Rows read from the replica are kept no longer than it may lag.
+    replica = db.info.get("replica")
+    return None if replica is None else replica.cache_ttl(cache.ttl)
+
+
+def get_reference(db: Session, model, entity_id: int):
+    key = (model.__tablename__, entity_id)
+    # Taken before the query, so a row read before a concurrent write committed
+    # is not stored after that write's invalidation.
+    generation = cache.generation(model.__tablename__)
+    row = cache.get(key)
+    if row is None:
+        row = _snapshot_query(db, model).filter(model.id == entity_id).one_or_none()
+        if row is not None:
+            cache.set(key, row, _cache_ttl(db), generation)
+    return row
+
+
+def list_references(db: Session, model, response: Response, page: PageParams) -> list:
+    key = (model.__tablename__, "page", page.limit, page.cursor)
+    generation = cache.generation(model.__tablename__)
+    cached = cache.get(key)
+    if cached is None:
+        rows = paginate(_snapshot_query(db, model), response, page, model.id)
+        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        cache.set(key, (rows, next_cursor), _cache_ttl(db), generation)
+        return rows
+
+    rows, next_cursor = cached
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
+def invalidate(db: Session, model) -> None:
+    """Drop cached ``model`` rows once ``db`` commits, in this and every other worker."""
+    namespace = model.__tablename__
+    if db.get_bind().dialect.name == "postgresql":
+        # NOTIFY is transactional, so other workers only hear about committed writes.
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": namespace},
+        )
+    event.listen(db, "after_commit", lambda session: cache.invalidate(namespace), once=True)
+
+
+def _listen() -> None:
+    while not _listener_stop.is_set():
+        try:
+            connection = engine.raw_connection()
+            # LISTEN needs a connection of its own for the life of the process.
+            connection.detach()
+            try:
+                dbapi_connection = connection.dbapi_connection
+                dbapi_connection.autocommit = True
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                # Anything sent while no one was listening is lost.
+                cache.invalidate()
+                while not _listener_stop.is_set():
+                    readable, _, _ = select.select(
+                        [dbapi_connection, _wakeup_read], [], [], _LISTEN_POLL_SECONDS
+                    )
+                    if dbapi_connection in readable:
+                        dbapi_connection.poll()
+                        while dbapi_connection.notifies:
+                            cache.invalidate(dbapi_connection.notifies.pop(0).payload)
+            finally:
+                connection.close()
+        except Exception:
+            logger.exception("Reference cache listener failed; reconnecting.")
+            cache.invalidate()
+            _listener_stop.wait(_LISTEN_RETRY_SECONDS)
+
+
+def start_invalidation_listener() -> bool:
+    """Follow invalidations from other workers via LISTEN/NOTIFY.
+
+    Not available through PgBouncer in transaction mode or without psycopg2;
+    entries then only expire after ``REFERENCE_CACHE_TTL``.
+    """
+    global _listener
+    if (
+        _listener is not None
+        or not cache.enabled
+        or not REFERENCE_CACHE_LISTEN
+        or DB_PGBOUNCER
+        or engine.dialect.driver != "psycopg2"
+    ):
+        return False
+    _listener_stop.clear()
+    _listener = threading.Thread(target=_listen, name="reference-cache-listener", daemon=True)
+    _listener.start()
+    return True
+
+
+def stop_invalidation_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener_stop.set()
+        os.write(_wakeup_write, b"\0")
+        _listener.join(timeout=_LISTEN_POLL_SECONDS + 1)
+        _listener = None
+        os.read(_wakeup_read, 1)
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ..core.database import SessionLocal
+from ..models import Report
+from ..schemas import ReportFilter
+from .report_pdf import PDF_RENDER_WORKERS, render_report_pdf
+from .report_queries import apply_report_filter, load_report_details
+
+EXPORT_DIR = Path(
+    os.getenv("REPORT_EXPORT_DIR", os.path.join(tempfile.gettempdir(), "ois-reports", "exports"))
+)
+EXPORT_BATCH_SIZE = int(os.getenv("REPORT_EXPORT_BATCH_SIZE", "50"))
+EXPORT_RETENTION_SECONDS = int(os.getenv("REPORT_EXPORT_RETENTION_SECONDS", str(24 * 3600)))
+# A running job saves its status after every batch; one that has not for this
+# long belongs to a worker that died without marking it failed.
+EXPORT_STALE_SECONDS = int(os.getenv("REPORT_EXPORT_STALE_SECONDS", "600"))
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+_STATUS_FILE = "job.json"
+
+# Keeps running export tasks referenced until they finish.
+_tasks: set[asyncio.Task] = set()
+
+
+class ExportJob:
+    """A bulk PDF export whose state lives next to its files on disk.
+
+    Any worker on the same host can therefore answer status and download
+    requests, not just the one that runs the job.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        total: int,
+        status: str = "pending",
+        rendered: int = 0,
+        error: str | None = None,
+        created_at: str | None = None,
+    ):
+        self.id = job_id
+        self.total = total
+        self.status = status
+        self.rendered = rendered
+        self.error = error
+        self.created_at = created_at or datetime.now(timezone.utc).isoformat()
+
+    @property
+    def directory(self) -> Path:
+        return EXPORT_DIR / self.id
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "rendered": self.rendered,
+            "error": self.error,
+            "created_at": self.created_at,
+        }
+
+    def save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{_STATUS_FILE}.tmp"
+        tmp_path.write_text(json.dumps(self.to_dict()))
+        os.replace(tmp_path, self.directory / _STATUS_FILE)
+
+    def pdf_paths(self) -> list[Path]:
+        return sorted(self.directory.glob("*.pdf"))
+
+
+def load_job(job_id: str) -> ExportJob | None:
+    if not _JOB_ID.match(job_id):
+        return None
+    status_path = EXPORT_DIR / job_id / _STATUS_FILE
+    try:
+        data = json.loads(status_path.read_text())
+        saved_at = status_path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    job = ExportJob(
+        data["id"],
+        data["total"],
+        status=data["status"],
+        rendered=data["rendered"],
+        error=data["error"],
+        created_at=data["created_at"],
+    )
+    if job.status in {"pending", "running"} and saved_at < time.time() - EXPORT_STALE_SECONDS:
+        job.status = "failed"
+        job.error = "Export was interrupted."
+        job.save()
+    return job
+
+
+def _prune_expired_jobs() -> None:
+    if not EXPORT_DIR.exists():
+        return
+    cutoff = time.time() - EXPORT_RETENTION_SECONDS
+    for directory in EXPORT_DIR.iterdir():
+        try:
+            expired = (directory / _STATUS_FILE).stat().st_mtime < cutoff
+        except FileNotFoundError:
+            continue
+        if expired:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def _matching_report_ids(filters: ReportFilter) -> list[int]:
+    db = SessionLocal()
+    try:
+        query = apply_report_filter(db.query(Report.id), filters).order_by(Report.id.asc())
+        return [report_id for (report_id,) in query]
+    finally:
+        db.close()
+
+
+def _load_batch(report_ids: list[int]) -> list[dict]:
+    db = SessionLocal()
+    try:
+        return [detail.model_dump(mode="json") for detail in load_report_details(db, report_ids)]
+    finally:
+        db.close()
+
+
+async def _run(job: ExportJob, report_ids: list[int]) -> None:
+    job.status = "running"
+    await asyncio.to_thread(job.save)
+    # Keep every render worker busy without queueing the whole export at once.
+    in_flight = asyncio.Semaphore(PDF_RENDER_WORKERS * 2)
+
+    async def render(data: dict) -> None:
+        async with in_flight:
+            pdf, _ = await render_report_pdf(data)
+        await asyncio.to_thread((job.directory / f"bericht-{data['id']}.pdf").write_bytes, pdf)
+        job.rendered += 1
+
+    try:
+        for start in range(0, len(report_ids), EXPORT_BATCH_SIZE):
+            batch = await asyncio.to_thread(
+                _load_batch, report_ids[start : start + EXPORT_BATCH_SIZE]
+            )
+            await asyncio.gather(*(render(data) for data in batch))
+            await asyncio.to_thread(job.save)
+        job.status = "completed"
+    except asyncio.CancelledError:
+        # Shutdown; saved right away, since the loop may not run another thread.
+        job.status = "failed"
+        job.error = "Export was interrupted."
+        job.save()
+        raise
+    except Exception as exc:
+        job.status = "failed"
+        job.error = str(exc) or type(exc).__name__
+    await asyncio.to_thread(job.save)
+
+
+async def start_export(filters: ReportFilter) -> ExportJob:
+    await asyncio.to_thread(_prune_expired_jobs)
+    report_ids = await asyncio.to_thread(_matching_report_ids, filters)
+    job = ExportJob(uuid.uuid4().hex, total=len(report_ids))
+    await asyncio.to_thread(job.save)
+
+    task = asyncio.create_task(_run(job, report_ids))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+class _ZipStream:
+    """Write-only sink that hands zipfile output to a generator chunk by chunk."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
+
+
+def iter_export_zip(job: ExportJob):
+    """Yield the job's PDFs as a ZIP archive, holding at most one file in memory."""
+    stream = _ZipStream()
+    # PDFs are already compressed; storing them keeps the CPU out of the download.
+    with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for path in job.pdf_paths():
+            archive.write(path, arcname=path.name)
+            yield stream.drain()
+    yield stream.drain()
@@ -0,0 +1,89 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+
+from ..core.content_cache import ContentCache, content_key
+
+TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "templates"
+REPORT_TEMPLATE = "report.html"
+
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", str(os.cpu_count() or 1)))
+PDF_CACHE_DIR = os.getenv(
+    "PDF_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ois-reports", "pdf")
+)
+PDF_CACHE_MAX_ENTRIES = int(os.getenv("PDF_CACHE_MAX_ENTRIES", "5000"))
+
+# Part of every cache key, so editing the template invalidates earlier renders.
+_TEMPLATE_SOURCE = (TEMPLATE_DIR / REPORT_TEMPLATE).read_bytes()
+
+pdf_cache = ContentCache(PDF_CACHE_DIR, suffix=".pdf", max_entries=PDF_CACHE_MAX_ENTRIES)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def report_fingerprint(data: dict) -> str:
+    return content_key(_TEMPLATE_SOURCE, data)
+
+
+@cache
+def _template():
+    # Imported on first render, like WeasyPrint, to keep worker startup short.
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(["html"])
+    )
+    return environment.get_template(REPORT_TEMPLATE)
+
+
+def render_report_html(data: dict) -> str:
+    created_at = datetime.fromisoformat(data["created_at"]).strftime("%d.%m.%Y %H:%M")
+    return _template().render(report=data, created_at=created_at)
+
+
+def render_report_pdf_bytes(data: dict) -> bytes:
+    # Imported here: WeasyPrint is heavy and only needed inside render workers.
+    from weasyprint import HTML
+
+    return HTML(string=render_report_html(data), base_url=str(TEMPLATE_DIR)).write_pdf()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=PDF_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_render_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def render_report_pdf(data: dict) -> tuple[bytes, str]:
+    """Return the PDF for a serialized ``ReportDetailRead`` and its cache key.
+
+    Layout runs in a separate process pool; the bytes are cached by a digest of
+    the report data and template, so unchanged reports are never rendered twice.
+    """
+    key = report_fingerprint(data)
+    pdf = await asyncio.to_thread(pdf_cache.get, key)
+    if pdf is None:
+        loop = asyncio.get_running_loop()
+        pdf = await loop.run_in_executor(_get_executor(), render_report_pdf_bytes, data)
+        await asyncio.to_thread(pdf_cache.put, key, pdf)
+    return pdf, key
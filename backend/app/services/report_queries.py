@@ -0,0 +1,127 @@
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+
+from ..core.etag import entity_etag
+from ..core.fieldsets import FieldSet, SparseFields
+
+from ..models import Component, Customer, FilterPlant, Report, ReportComponent
+from ..schemas import ReportComponentRead, ReportDetailRead, ReportFilter, ReportListRead
+
+# Eager loads for everything ReportDetailRead touches, so building details
+# for many reports costs a fixed number of statements.
+REPORT_DETAIL_OPTIONS = (
+    joinedload(Report.customer),
+    joinedload(Report.filter_plant),
+    selectinload(Report.items).joinedload(ReportComponent.component),
+)
+
+
+REPORT_RELATIONS = {"customer": "customer_name", "filter_plant": "filter_plant_description"}
+
+# List rows are plain columns and labels, so they are encoded without validation.
+report_list_fields = SparseFields(
+    ReportListRead,
+    relations=REPORT_RELATIONS,
+    default_include=tuple(REPORT_RELATIONS),
+    trusted=True,
+)
+report_detail_fields = SparseFields(
+    ReportDetailRead,
+    relations={**REPORT_RELATIONS, "components": "components"},
+    default_include=(*REPORT_RELATIONS, "components"),
+)
+
+
+def report_list_query(db: Session, fieldset: FieldSet | None = None):
+    """Report list rows, joining only the names ``fieldset`` embeds.
+
+    ``created_at`` and ``id`` are always selected: pagination orders by them.
+    """
+    fieldset = fieldset or report_list_fields.default()
+    query = db.query(*fieldset.columns(Report, "created_at", "id"))
+    if "customer" in fieldset.include:
+        query = query.add_columns(Customer.name.label("customer_name")).join(
+            Customer, Customer.id == Report.customer_id
+        )
+    if "filter_plant" in fieldset.include:
+        query = query.add_columns(FilterPlant.description.label("filter_plant_description")).join(
+            FilterPlant, FilterPlant.id == Report.filter_plant_id
+        )
+    return query
+
+
+def report_detail_options(fieldset: FieldSet) -> list:
+    """Loader options for the parts of a report detail ``fieldset`` asks for.
+
+    Related rows are loaded with just the columns the detail and its ETag use.
+    """
+    options = [load_only(*fieldset.columns(Report, "customer_id", "filter_plant_id", "version"))]
+    if "customer" in fieldset.include:
+        options.append(joinedload(Report.customer).load_only(Customer.name, Customer.version))
+    if "filter_plant" in fieldset.include:
+        options.append(
+            joinedload(Report.filter_plant).load_only(FilterPlant.description, FilterPlant.version)
+        )
+    if "components" in fieldset.include:
+        options.append(
+            selectinload(Report.items)
+            .joinedload(ReportComponent.component)
+            .load_only(Component.name, Component.version)
+        )
+    return options
+
+
+def apply_report_filter(query, filters: ReportFilter):
+    if filters.customer_id is not None:
+        query = query.filter(Report.customer_id == filters.customer_id)
+    if filters.filter_plant_id is not None:
+        query = query.filter(Report.filter_plant_id == filters.filter_plant_id)
+    if filters.completed is not None:
+        query = query.filter(Report.completed == filters.completed)
+    if filters.created_from is not None:
+        query = query.filter(Report.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        query = query.filter(Report.created_at < filters.created_to)
+    return query
+
+
+def report_detail(report: Report) -> ReportDetailRead:
+    return ReportDetailRead(
+        id=report.id,
+        customer_id=report.customer_id,
+        customer_name=report.customer.name if report.customer else "",
+        filter_plant_id=report.filter_plant_id,
+        filter_plant_description=report.filter_plant.description if report.filter_plant else "",
+        created_at=report.created_at,
+        completed=report.completed,
+        components=[
+            ReportComponentRead(
+                component_id=item.component_id,
+                component_name=item.component.name if item.component else "",
+                description=item.description,
+            )
+            for item in report.items
+        ],
+    )
+
+
+def report_etag(report: Report, include=report_detail_fields.default_include) -> str:
+    # Item edits bump the report version; names shown in the detail come from
+    # the customer, plant and components, so their versions count as well.
+    items = report.items if "components" in include else []
+    return entity_etag(
+        report,
+        *([report.customer] if "customer" in include else []),
+        *([report.filter_plant] if "filter_plant" in include else []),
+        *(item.component for item in items),
+    )
+
+
+def load_report_details(db: Session, report_ids: list[int]) -> list[ReportDetailRead]:
+    reports = (
+        db.query(Report)
+        .options(*REPORT_DETAIL_OPTIONS)
+        .filter(Report.id.in_(report_ids))
+        .order_by(Report.id.asc())
+        .all()
+    )
+    return [report_detail(report) for report in reports]
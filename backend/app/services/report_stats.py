@@ -0,0 +1,128 @@
+from fastapi import Response
+from sqlalchemy import BigInteger, cast, extract, func, text
+from sqlalchemy.orm import Session
+
+from ..core.pagination import PageParams, paginate
+from ..models import ReportStats
+from ..schemas import ReportStatsRead
+
+SECONDS_PER_DAY = 86400
+
+_REBUILD_STATEMENTS = (
+    # Writers wait until the rebuild commits, so no trigger update is lost.
+    "LOCK TABLE reports, report_components IN SHARE MODE",
+    """
+    UPDATE reports SET item_count = counts.item_count
+    FROM (
+        SELECT reports.id, reports.created_at, count(report_components.id) AS item_count
+        FROM reports LEFT JOIN report_components
+            ON report_components.report_id = reports.id
+            AND report_components.report_created_at = reports.created_at
+        GROUP BY reports.id, reports.created_at
+    ) counts
+    WHERE reports.id = counts.id AND reports.created_at = counts.created_at
+        AND reports.item_count <> counts.item_count
+    """,
+    "DELETE FROM report_stats",
+)
+
+# Totals per scope over a reports table (the live one or a single partition).
+_AGGREGATE = """
+    SELECT
+        CASE GROUPING(reports.customer_id, reports.filter_plant_id, filter_plants.manufacturer_id)
+            WHEN 7 THEN 'all' WHEN 3 THEN 'customer' WHEN 5 THEN 'filter_plant'
+            ELSE 'manufacturer'
+        END AS scope,
+        coalesce(reports.customer_id, reports.filter_plant_id, filter_plants.manufacturer_id, 0)
+            AS scope_id,
+        count(*) FILTER (WHERE NOT reports.completed) AS open_reports,
+        count(*) FILTER (WHERE reports.completed) AS completed_reports,
+        coalesce(sum(reports.item_count), 0) AS report_components,
+        coalesce(
+            sum(extract(epoch FROM reports.created_at)) FILTER (WHERE NOT reports.completed), 0
+        ) AS open_created_at_sum
+    FROM {table} AS reports JOIN filter_plants ON filter_plants.id = reports.filter_plant_id
+    GROUP BY GROUPING SETS (
+        (), (reports.customer_id), (reports.filter_plant_id), (filter_plants.manufacturer_id)
+    )
+"""
+_COLUMNS = (
+    "scope, scope_id, open_reports, completed_reports, report_components, open_created_at_sum"
+)
+
+
+def rebuild_report_stats(db: Session) -> None:
+    """Recompute report_stats from the reports, e.g. after restoring a dump.
+
+    The caller commits. Reports and their items stay readable, but writes to
+    them wait for the commit.
+    """
+    for statement in _REBUILD_STATEMENTS:
+        db.execute(text(statement))
+    db.execute(
+        text(f"INSERT INTO report_stats ({_COLUMNS}) {_AGGREGATE.format(table='reports')}")
+    )
+
+
+def subtract_report_stats(db, table: str) -> None:
+    """Take the reports in ``table`` out of report_stats, e.g. before detaching it."""
+    db.execute(
+        text(
+            f"INSERT INTO report_stats AS s (shard, {_COLUMNS}) "
+            "SELECT report_stats_shard(), scope, scope_id, -open_reports, -completed_reports, "
+            "-report_components, -open_created_at_sum "
+            f"FROM ({_AGGREGATE.format(table=table)}) totals "
+            "ON CONFLICT (scope, scope_id, shard) DO UPDATE SET "
+            "open_reports = s.open_reports + excluded.open_reports, "
+            "completed_reports = s.completed_reports + excluded.completed_reports, "
+            "report_components = s.report_components + excluded.report_components, "
+            "open_created_at_sum = s.open_created_at_sum + excluded.open_created_at_sum"
+        )
+    )
+
+
+def _stats_query(db: Session, scope: str):
+    # Each scope is spread over a few shard rows; see ReportStats.
+    open_reports = cast(func.sum(ReportStats.open_reports), BigInteger)
+    open_age = extract("epoch", func.now()) - func.sum(
+        ReportStats.open_created_at_sum
+    ) / func.nullif(open_reports, 0)
+    return (
+        db.query(
+            ReportStats.scope_id,
+            open_reports.label("open_reports"),
+            cast(func.sum(ReportStats.completed_reports), BigInteger).label("completed_reports"),
+            cast(func.sum(ReportStats.report_components), BigInteger).label("report_components"),
+            open_age.label("open_age_seconds"),
+        )
+        .filter(ReportStats.scope == scope)
+        .group_by(ReportStats.scope_id)
+    )
+
+
+def _read(row) -> ReportStatsRead:
+    if row is None:
+        return ReportStatsRead()
+    total = row.open_reports + row.completed_reports
+    return ReportStatsRead(
+        open_reports=row.open_reports,
+        completed_reports=row.completed_reports,
+        total_reports=total,
+        report_components=row.report_components,
+        average_components_per_report=row.report_components / total if total else None,
+        average_open_report_age_days=(
+            float(row.open_age_seconds) / SECONDS_PER_DAY if row.open_reports else None
+        ),
+    )
+
+
+def report_stats(db: Session, scope: str = "all", scope_id: int = 0) -> ReportStatsRead:
+    """Pre-aggregated report statistics for one scope: a primary key range scan."""
+    return _read(_stats_query(db, scope).filter(ReportStats.scope_id == scope_id).one_or_none())
+
+
+def list_report_stats(
+    db: Session, scope: str, response: Response, page: PageParams
+) -> list[tuple[int, ReportStatsRead]]:
+    rows = paginate(_stats_query(db, scope), response, page, ReportStats.scope_id)
+    return [(row.scope_id, _read(row)) for row in rows]
@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+
+from fastapi import Response
+from sqlalchemy import (
+    Double,
+    Integer,
+    and_,
+    cast,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from ..core.pagination import PageParams, paginate
+from ..models import (
+    NAME_SEARCH_CONFIG,
+    TEXT_SEARCH_CONFIG,
+    Component,
+    Customer,
+    FilterPlant,
+    Manufacturer,
+    Report,
+    ReportComponent,
+)
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """One searchable column and the ids a result links to."""
+
+    entity_id: object
+    title: object
+    vector: object
+    config: str
+    # Matched with pg_trgm as well when the extension is installed.
+    fuzzy: bool
+    customer_id: object = None
+    filter_plant_id: object = None
+    report_id: object = None
+    join: tuple = ()
+
+
+SEARCH_SOURCES = {
+    "customer": SearchSource(
+        Customer.id,
+        Customer.name,
+        Customer.search_vector,
+        NAME_SEARCH_CONFIG,
+        fuzzy=True,
+        customer_id=Customer.id,
+    ),
+    "filter_plant": SearchSource(
+        FilterPlant.id,
+        FilterPlant.description,
+        FilterPlant.search_vector,
+        TEXT_SEARCH_CONFIG,
+        fuzzy=True,
+        customer_id=FilterPlant.customer_id,
+        filter_plant_id=FilterPlant.id,
+    ),
+    "component": SearchSource(
+        Component.id,
+        Component.name,
+        Component.search_vector,
+        NAME_SEARCH_CONFIG,
+        fuzzy=True,
+        customer_id=FilterPlant.customer_id,
+        filter_plant_id=Component.filter_plant_id,
+        join=((FilterPlant, FilterPlant.id == Component.filter_plant_id),),
+    ),
+    "manufacturer": SearchSource(
+        Manufacturer.id,
+        Manufacturer.name,
+        Manufacturer.search_vector,
+        NAME_SEARCH_CONFIG,
+        fuzzy=True,
+    ),
+    "report_item": SearchSource(
+        ReportComponent.id,
+        ReportComponent.description,
+        ReportComponent.search_vector,
+        TEXT_SEARCH_CONFIG,
+        fuzzy=False,
+        customer_id=Report.customer_id,
+        filter_plant_id=Report.filter_plant_id,
+        report_id=ReportComponent.report_id,
+        join=(
+            (
+                Report,
+                and_(
+                    Report.id == ReportComponent.report_id,
+                    Report.created_at == ReportComponent.report_created_at,
+                ),
+            ),
+        ),
+    ),
+}
+
+_trigram: bool | None = None
+
+
+def trigram_available(db: Session) -> bool:
+    global _trigram
+    if _trigram is None:
+        _trigram = db.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        ).scalar()
+    return _trigram
+
+
+def _id_or_null(value):
+    return cast(null(), Integer) if value is None else value
+
+
+def _source_query(kind: str, source: SearchSource, q: str, trigram: bool):
+    query = func.websearch_to_tsquery(source.config, q)
+    rank = func.ts_rank(source.vector, query)
+    match = source.vector.bool_op("@@")(query)
+    if trigram and source.fuzzy:
+        # Word similarity finds "Pumpe" in "Umwälzpumpe Halle 2" and tolerates typos.
+        rank = func.greatest(rank, func.word_similarity(q, source.title))
+        match = or_(match, literal(q).bool_op("<%")(source.title))
+
+    statement = select(
+        literal(kind).label("kind"),
+        source.entity_id.label("id"),
+        source.title.label("title"),
+        cast(rank, Double).label("rank"),
+        _id_or_null(source.customer_id).label("customer_id"),
+        _id_or_null(source.filter_plant_id).label("filter_plant_id"),
+        _id_or_null(source.report_id).label("report_id"),
+    ).select_from(source.entity_id.table)
+    for target, onclause in source.join:
+        statement = statement.join(target, onclause)
+    return statement.where(match)
+
+
+def search(db: Session, q: str, kinds: tuple[str, ...], response: Response, page: PageParams):
+    """Ranked matches for ``q`` across ``kinds``, best first.
+
+    Each kind is matched through its own GIN index; the union is then ranked
+    and keyset-paginated on (rank, kind, id).
+    """
+    trigram = trigram_available(db)
+    results = union_all(
+        *(_source_query(kind, SEARCH_SOURCES[kind], q, trigram) for kind in kinds)
+    ).subquery("results")
+    return paginate(
+        db.query(*results.c),
+        response,
+        page,
+        results.c.rank,
+        results.c.kind,
+        results.c.id,
+        descending=True,
+    )
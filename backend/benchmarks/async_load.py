@@ -0,0 +1,118 @@
+"""Compare the sync (psycopg2) and async (asyncpg) database stacks under load.
+
+Starts one uvicorn server per mode against the database configured through the
+usual POSTGRES_* / DATABASE_URL variables and hammers a read route with a fixed
+number of concurrent clients::
+
+    python benchmarks/async_load.py --concurrency 200 --duration 15
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as http:
+        while time.monotonic() < deadline:
+            try:
+                if (await http.get("/db-health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready.")
+
+
+async def _run_load(base_url: str, path: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as http:
+
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await http.get(path)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000 if latencies else float("nan"),
+        "p99_ms": _percentile(latencies, 99) * 1000 if latencies else float("nan"),
+    }
+
+
+def _start_server(port: int, async_mode: bool) -> subprocess.Popen:
+    env = dict(os.environ, DB_ASYNC="1" if async_mode else "0")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_ROOT,
+        env=env,
+    )
+
+
+async def _benchmark(args) -> None:
+    results = {}
+    for port, mode in ((args.port, "sync"), (args.port + 1, "async")):
+        server = _start_server(port, async_mode=mode == "async")
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            await _wait_until_ready(base_url)
+            await _run_load(base_url, args.path, args.concurrency, 1.0)
+            results[mode] = await _run_load(base_url, args.path, args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"GET {args.path} with {args.concurrency} concurrent clients for {args.duration}s")
+    print(f"{'mode':<6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<6} {result['requests']:>9} {result['errors']:>7} {result['rps']:>9.1f} "
+            f"{result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default="/reports?limit=50")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8101)
+    asyncio.run(_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
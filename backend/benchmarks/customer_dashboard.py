@@ -0,0 +1,120 @@
+"""Customer page: request fan-out versus GET /customers/{id}/dashboard.
+
+The fan-out is what the frontend did before: the customer, its plants, the
+components of every plant and the customer's reports. Runs the app in-process
+against the database configured through the usual POSTGRES_* / DATABASE_URL
+variables, with the response cache disabled so every request reaches the
+database::
+
+    python benchmarks/customer_dashboard.py --plants 1 10 50 --rounds 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def _create_customer(client: TestClient, plant_count: int) -> int:
+    client_item = client.post("/clients", json={"name": f"Bench {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Bench {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post("/manufacturers", json={"name": f"Bench {uuid.uuid4()}"}).json()
+    for index in range(plant_count):
+        plant = client.post(
+            f"/customers/{customer['id']}/filter-plants",
+            json={
+                "description": f"Bench {index}",
+                "year_built": 2020,
+                "manufacturer_id": manufacturer["id"],
+            },
+        ).json()
+        components = [
+            client.post(
+                f"/filter-plants/{plant['id']}/components", json={"name": f"K{i}"}
+            ).json()
+            for i in range(5)
+        ]
+        client.post(
+            f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+            json={
+                "component_descriptions": [
+                    {"component_id": component["id"], "description": "OK"}
+                    for component in components
+                ]
+            },
+        )
+    return customer["id"]
+
+
+def _fan_out(client: TestClient, customer_id: int) -> int:
+    requests = 3
+    client.get(f"/customers/{customer_id}").raise_for_status()
+    plants = client.get(f"/customers/{customer_id}/filter-plants").json()
+    for plant in plants:
+        client.get(f"/filter-plants/{plant['id']}/components").raise_for_status()
+        requests += 1
+    client.get(f"/customers/{customer_id}/reports").raise_for_status()
+    return requests
+
+
+def _dashboard(client: TestClient, customer_id: int) -> int:
+    client.get(f"/customers/{customer_id}/dashboard").raise_for_status()
+    return 1
+
+
+def _measure(client: TestClient, load, customer_id: int, rounds: int) -> dict:
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    latencies = []
+    for _ in range(rounds):
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", count)
+        started = time.perf_counter()
+        requests = load(client, customer_id)
+        latencies.append(time.perf_counter() - started)
+        event.remove(engine, "before_cursor_execute", count)
+
+    return {
+        "requests": requests,
+        "statements": len(statements),
+        "median_ms": statistics.median(latencies) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plants", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    print(f"{'plants':>6} {'mode':>10} {'requests':>8} {'statements':>10} {'median ms':>10}")
+    for plant_count in args.plants:
+        customer_id = _create_customer(client, plant_count)
+        for mode, load in (("fan-out", _fan_out), ("dashboard", _dashboard)):
+            result = _measure(client, load, customer_id, args.rounds)
+            print(
+                f"{plant_count:>6} {mode:>10} {result['requests']:>8} "
+                f"{result['statements']:>10} {result['median_ms']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Latency of POST .../reports as the number of components grows.
+
+Runs the app in-process against the database configured through the usual
+POSTGRES_* / DATABASE_URL variables::
+
+    python benchmarks/report_create.py --sizes 10 100 1000 5000 --rounds 10
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import app  # noqa: E402
+
+
+def _create_plant(client: TestClient, size: int) -> tuple[str, list[int]]:
+    client_item = client.post("/clients", json={"name": f"Bench {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Bench {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post("/manufacturers", json={"name": f"Bench {uuid.uuid4()}"}).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Bench", "year_built": 2020, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    component_ids = [
+        client.post(f"/filter-plants/{plant['id']}/components", json={"name": f"K{i}"}).json()["id"]
+        for i in range(size)
+    ]
+    return f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports", component_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    print(f"{'components':>10} {'median ms':>10} {'ms/100 items':>13}")
+    for size in args.sizes:
+        path, component_ids = _create_plant(client, size)
+        payload = {
+            "component_descriptions": [
+                {"component_id": component_id, "description": "Sichtprüfung ohne Befund"}
+                for component_id in component_ids
+            ]
+        }
+        latencies = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            client.post(path, json=payload).raise_for_status()
+            latencies.append(time.perf_counter() - started)
+        median_ms = statistics.median(latencies) * 1000
+        print(f"{size:>10} {median_ms:>10.1f} {median_ms / size * 100:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
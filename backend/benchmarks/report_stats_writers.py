@@ -0,0 +1,127 @@
+"""Throughput of concurrent report writers, which all update the report_stats 'all' scope.
+
+Every writer creates reports with a few items in their own transactions, each
+under its own customer, plant and manufacturer, so the global scope is the
+only report_stats row they could share. Runs against the database configured
+through the usual POSTGRES_* / DATABASE_URL variables; the reports stay behind::
+
+    python benchmarks/report_stats_writers.py --writers 1 2 4 8 16 --seconds 5
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.database import engine  # noqa: E402
+
+ITEMS_PER_REPORT = 5
+
+
+def _create_plant(connection) -> tuple[int, int, int]:
+    def insert(statement: str, **values) -> int:
+        return connection.execute(text(statement), values).scalar()
+
+    client_id = insert(
+        "INSERT INTO clients (name) VALUES (:name) RETURNING id", name=f"Bench {uuid.uuid4()}"
+    )
+    customer_id = insert(
+        "INSERT INTO customers (client_id, name) VALUES (:client_id, :name) RETURNING id",
+        client_id=client_id,
+        name=f"Bench {uuid.uuid4()}",
+    )
+    manufacturer_id = insert(
+        "INSERT INTO manufacturers (name) VALUES (:name) RETURNING id", name=f"Bench {uuid.uuid4()}"
+    )
+    plant_id = insert(
+        "INSERT INTO filter_plants (customer_id, manufacturer_id, description, year_built) "
+        "VALUES (:customer_id, :manufacturer_id, 'Bench', 2020) RETURNING id",
+        customer_id=customer_id,
+        manufacturer_id=manufacturer_id,
+    )
+    component_id = insert(
+        "INSERT INTO components (filter_plant_id, name) VALUES (:plant_id, 'K1') RETURNING id",
+        plant_id=plant_id,
+    )
+    return customer_id, plant_id, component_id
+
+
+def _write(bench_engine, plant: tuple[int, int, int], deadline: float, latencies: list) -> None:
+    customer_id, plant_id, component_id = plant
+    with bench_engine.connect() as connection:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            report = connection.execute(
+                text(
+                    "INSERT INTO reports (customer_id, filter_plant_id) "
+                    "VALUES (:customer_id, :plant_id) RETURNING id, created_at"
+                ),
+                {"customer_id": customer_id, "plant_id": plant_id},
+            ).one()
+            connection.execute(
+                text(
+                    "INSERT INTO report_components "
+                    "(report_id, report_created_at, component_id, description) "
+                    "SELECT :report_id, :created_at, :component_id, 'OK' "
+                    "FROM generate_series(1, :items)"
+                ),
+                {
+                    "report_id": report.id,
+                    "created_at": report.created_at,
+                    "component_id": component_id,
+                    "items": ITEMS_PER_REPORT,
+                },
+            )
+            connection.commit()
+            latencies.append(time.perf_counter() - started)
+
+
+def _measure(writers: int, seconds: float) -> dict:
+    bench_engine = create_engine(engine.url, pool_size=writers, max_overflow=0)
+    with bench_engine.begin() as connection:
+        plants = [_create_plant(connection) for _ in range(writers)]
+
+    latencies = [[] for _ in range(writers)]
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=_write, args=(bench_engine, plant, deadline, latencies[index]))
+        for index, plant in enumerate(plants)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    bench_engine.dispose()
+
+    merged = sorted(latency for writer in latencies for latency in writer)
+    return {
+        "reports_per_second": len(merged) / seconds,
+        "median_ms": statistics.median(merged) * 1000,
+        "p95_ms": merged[int(len(merged) * 0.95)] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{'writers':>8} {'reports/s':>10} {'median ms':>10} {'p95 ms':>10}")
+    for writers in args.writers:
+        result = _measure(writers, args.seconds)
+        print(
+            f"{writers:>8} {result['reports_per_second']:>10.1f} "
+            f"{result['median_ms']:>10.1f} {result['p95_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
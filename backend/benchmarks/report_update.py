@@ -0,0 +1,99 @@
+"""Statement count and latency of PATCH /reports/{id} for growing reports.
+
+Runs the app in-process against the database configured through the usual
+POSTGRES_* / DATABASE_URL variables. Each round edits a single description,
+the common case when a technician corrects one line of a large report::
+
+    python benchmarks/report_update.py --sizes 10 100 500 1000 --rounds 20
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def _create_report(client: TestClient, size: int) -> tuple[int, list[dict]]:
+    client_item = client.post("/clients", json={"name": f"Bench {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Bench {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post("/manufacturers", json={"name": f"Bench {uuid.uuid4()}"}).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Bench", "year_built": 2020, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    descriptions = [
+        {
+            "component_id": client.post(
+                f"/filter-plants/{plant['id']}/components", json={"name": f"K{i}"}
+            ).json()["id"],
+            "description": "OK",
+        }
+        for i in range(size)
+    ]
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={"component_descriptions": descriptions},
+    ).json()
+    return report["id"], descriptions
+
+
+def _measure(client: TestClient, size: int, rounds: int) -> dict:
+    report_id, descriptions = _create_report(client, size)
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    latencies = []
+    counts = []
+    for round_number in range(rounds):
+        descriptions[0] = dict(descriptions[0], description=f"Runde {round_number}")
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", count)
+        started = time.perf_counter()
+        response = client.patch(
+            f"/reports/{report_id}",
+            json={"completed": False, "component_descriptions": descriptions},
+        )
+        latencies.append(time.perf_counter() - started)
+        event.remove(engine, "before_cursor_execute", count)
+        response.raise_for_status()
+        counts.append(len(statements))
+
+    return {
+        "statements": max(counts),
+        "median_ms": statistics.median(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    print(f"{'components':>10} {'statements':>10} {'median ms':>10} {'max ms':>10}")
+    for size in args.sizes:
+        result = _measure(client, size, args.rounds)
+        print(
+            f"{size:>10} {result['statements']:>10} "
+            f"{result['median_ms']:>10.1f} {result['max_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
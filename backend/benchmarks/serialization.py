@@ -0,0 +1,139 @@
+"""Serialization cost of report list and detail payloads of growing size.
+
+No database is needed: rows are built in memory with the shapes the routes
+produce (SQLAlchemy rows for lists, ORM-like objects for details) and encoded
+the ways FastAPI can encode them::
+
+    python benchmarks/serialization.py --sizes 100 1000 10000 --rounds 20
+
+Modes:
+
+- stdlib: validate, dump to Python, ``json.dumps`` (``JSONResponse``)
+- orjson-class: validate, dump to Python, ``orjson.dumps`` (an orjson response class)
+- pydantic: validate, ``dump_json`` (FastAPI's default path for response models)
+- rows: ``dump_rows`` straight from the rows, no validation (trusted list routes)
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+from sqlalchemy.engine.result import result_tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.serialization import dump_rows, dumps  # noqa: E402
+from app.schemas import ReportDetailRead, ReportListRead  # noqa: E402
+
+LIST_FIELDS = tuple(ReportListRead.model_fields)
+# Column order of report_list_query: report columns first, then the joined names.
+ROW_FIELDS = (
+    "id",
+    "customer_id",
+    "filter_plant_id",
+    "created_at",
+    "completed",
+    "customer_name",
+    "filter_plant_description",
+)
+
+
+def _list_rows(size: int) -> list:
+    row = result_tuple(ROW_FIELDS)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        row(
+            (
+                index,
+                index % 50,
+                index % 400,
+                start + timedelta(minutes=index),
+                index % 3 == 0,
+                f"Kunde {index % 50}",
+                f"Filteranlage Halle {index % 400}",
+            )
+        )
+        for index in range(size)
+    ]
+
+
+def _detail(size: int) -> SimpleNamespace:
+    plant = SimpleNamespace(description="Filteranlage Halle 1")
+    return SimpleNamespace(
+        id=1,
+        customer_id=1,
+        customer=SimpleNamespace(name="Kunde 1"),
+        filter_plant_id=1,
+        filter_plant=plant,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        completed=False,
+        items=[
+            SimpleNamespace(
+                component_id=index,
+                component=SimpleNamespace(name=f"Komponente {index}"),
+                description="Dichtung getauscht, Filter gereinigt.",
+            )
+            for index in range(size)
+        ],
+    )
+
+
+def _modes(adapter: TypeAdapter) -> dict:
+    def validate(data):
+        return adapter.validate_python(data, from_attributes=True)
+
+    return {
+        "stdlib": lambda data: json.dumps(
+            adapter.dump_python(validate(data), mode="json"),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode(),
+        "orjson-class": lambda data: dumps(adapter.dump_python(validate(data), mode="json")),
+        "pydantic": lambda data: adapter.dump_json(validate(data)),
+    }
+
+
+def _median_ms(encode, data, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        encode(data)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    list_modes = {
+        **_modes(TypeAdapter(list[ReportListRead])),
+        "rows": lambda rows: dump_rows(rows, LIST_FIELDS),
+    }
+    detail_modes = _modes(TypeAdapter(ReportDetailRead))
+
+    print(f"{'payload':>8} {'size':>6} {'mode':>13} {'median ms':>10} {'KiB':>8}")
+    for payload, modes, build in (
+        ("list", list_modes, _list_rows),
+        ("detail", detail_modes, _detail),
+    ):
+        for size in args.sizes:
+            data = build(size)
+            for mode, encode in modes.items():
+                print(
+                    f"{payload:>8} {size:>6} {mode:>13} "
+                    f"{_median_ms(encode, data, args.rounds):>10.2f} "
+                    f"{len(encode(data)) / 1024:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure how long a worker takes from spawn until it serves its first request.
+
+Starts uvicorn repeatedly against the database configured through the usual
+POSTGRES_* / DATABASE_URL variables (migrated with ``alembic upgrade head``)
+and polls ``/health`` until it answers. Also times the schema check and seed
+queries every worker used to run in its lifespan, for comparison::
+
+    python benchmarks/startup.py --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+
+
+def _time_to_first_response(port: int, timeout: float = 60.0) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_ROOT,
+        env=dict(os.environ),
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as http:
+            while time.monotonic() < deadline:
+                try:
+                    if http.get("/health").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"Server on port {port} did not become ready.")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _legacy_startup_work(runs: int) -> list[float]:
+    # What the lifespan did before migrations: create_all checks every table
+    # and index, then two count() queries decide whether to seed.
+    from app.core.database import Base, SessionLocal, engine
+    from app.models import Client, Customer
+
+    samples = []
+    for _ in range(runs):
+        engine.dispose()
+        started = time.perf_counter()
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+        try:
+            db.query(Client).count()
+            db.query(Customer).count()
+        finally:
+            db.close()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8111)
+    args = parser.parse_args()
+
+    startup = [_time_to_first_response(args.port) for _ in range(args.runs)]
+    legacy = _legacy_startup_work(args.runs)
+
+    print(f"{'measurement':<34} {'median ms':>10} {'max ms':>9}")
+    for label, samples in (
+        ("spawn to first response", startup),
+        ("legacy create_all + seed checks", legacy),
+    ):
+        print(
+            f"{label:<34} {statistics.median(samples) * 1000:>10.1f} "
+            f"{max(samples) * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
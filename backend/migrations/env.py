@@ -0,0 +1,67 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.core.database import engine
+from app.models import Base
+from app.services.partitions import is_partition
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logging", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_name(name, type_, parent_names) -> bool:
+    # Partitions are created at runtime, not by revisions.
+    return not (type_ == "table" and is_partition(name))
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Postgres clones a foreign key to a partitioned table once per partition.
+    if type_ == "foreign_key_constraint" and reflected:
+        return not is_partition(object.referred_table.name)
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is None:
+        with engine.connect() as connection:
+            _run(connection)
+    else:
+        _run(connection)
+
+
+def _run(connection) -> None:
+    # One transaction per revision, so a revision can step out of it to
+    # build indexes CONCURRENTLY (op.get_context().autocommit_block()).
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
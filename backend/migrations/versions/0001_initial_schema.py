@@ -0,0 +1,124 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 15:10:54.816916
+
+The tables as the application's create_all built them before migrations were
+introduced. A database created that way already has them; this revision then
+only records that it is at 0001, and the following ones bring it up to date.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _created_by_create_all() -> bool:
+    if op.get_context().as_sql:
+        return False
+    return sa.inspect(op.get_bind()).has_table('clients')
+
+
+def upgrade() -> None:
+    if _created_by_create_all():
+        return
+    op.create_table('clients',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_clients_id'), 'clients', ['id'], unique=False)
+    op.create_table('manufacturers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_manufacturers_id'), 'manufacturers', ['id'], unique=False)
+    op.create_table('customers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_customers_client_id'), 'customers', ['client_id'], unique=False)
+    op.create_index(op.f('ix_customers_id'), 'customers', ['id'], unique=False)
+    op.create_table('filter_plants',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('manufacturer_id', sa.Integer(), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=False),
+    sa.Column('year_built', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['manufacturer_id'], ['manufacturers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_filter_plants_customer_id'), 'filter_plants', ['customer_id'], unique=False)
+    op.create_index(op.f('ix_filter_plants_id'), 'filter_plants', ['id'], unique=False)
+    op.create_index(op.f('ix_filter_plants_manufacturer_id'), 'filter_plants', ['manufacturer_id'], unique=False)
+    op.create_table('components',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filter_plant_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.ForeignKeyConstraint(['filter_plant_id'], ['filter_plants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_components_filter_plant_id'), 'components', ['filter_plant_id'], unique=False)
+    op.create_index(op.f('ix_components_id'), 'components', ['id'], unique=False)
+    op.create_table('reports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('filter_plant_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('completed', sa.Boolean(), server_default='false', nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['filter_plant_id'], ['filter_plants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reports_customer_id'), 'reports', ['customer_id'], unique=False)
+    op.create_index(op.f('ix_reports_filter_plant_id'), 'reports', ['filter_plant_id'], unique=False)
+    op.create_index(op.f('ix_reports_id'), 'reports', ['id'], unique=False)
+    op.create_table('report_components',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('report_id', sa.Integer(), nullable=False),
+    sa.Column('component_id', sa.Integer(), nullable=False),
+    sa.Column('description', sa.String(length=1000), nullable=False),
+    sa.ForeignKeyConstraint(['component_id'], ['components.id'], ),
+    sa.ForeignKeyConstraint(['report_id'], ['reports.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_report_components_component_id'), 'report_components', ['component_id'], unique=False)
+    op.create_index(op.f('ix_report_components_id'), 'report_components', ['id'], unique=False)
+    op.create_index(op.f('ix_report_components_report_id'), 'report_components', ['report_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_report_components_report_id'), table_name='report_components')
+    op.drop_index(op.f('ix_report_components_id'), table_name='report_components')
+    op.drop_index(op.f('ix_report_components_component_id'), table_name='report_components')
+    op.drop_table('report_components')
+    op.drop_index(op.f('ix_reports_id'), table_name='reports')
+    op.drop_index(op.f('ix_reports_filter_plant_id'), table_name='reports')
+    op.drop_index(op.f('ix_reports_customer_id'), table_name='reports')
+    op.drop_table('reports')
+    op.drop_index(op.f('ix_components_id'), table_name='components')
+    op.drop_index(op.f('ix_components_filter_plant_id'), table_name='components')
+    op.drop_table('components')
+    op.drop_index(op.f('ix_filter_plants_manufacturer_id'), table_name='filter_plants')
+    op.drop_index(op.f('ix_filter_plants_id'), table_name='filter_plants')
+    op.drop_index(op.f('ix_filter_plants_customer_id'), table_name='filter_plants')
+    op.drop_table('filter_plants')
+    op.drop_index(op.f('ix_customers_id'), table_name='customers')
+    op.drop_index(op.f('ix_customers_client_id'), table_name='customers')
+    op.drop_table('customers')
+    op.drop_index(op.f('ix_manufacturers_id'), table_name='manufacturers')
+    op.drop_table('manufacturers')
+    op.drop_index(op.f('ix_clients_id'), table_name='clients')
+    op.drop_table('clients')
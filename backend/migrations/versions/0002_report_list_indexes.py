@@ -0,0 +1,48 @@
+"""report list indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:12:03.514720
+
+Composite indexes for the keyset-paginated, filtered report lists. They lead
+with the same columns as the single-column foreign key indexes, which are
+dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REPORT_INDEXES = {
+    'ix_reports_created_at_id': ['created_at', 'id'],
+    'ix_reports_customer_id_created_at_id': ['customer_id', 'created_at', 'id'],
+    'ix_reports_filter_plant_id_created_at_id': ['filter_plant_id', 'created_at', 'id'],
+    'ix_reports_completed_created_at_id': ['completed', 'created_at', 'id'],
+}
+REPLACED_INDEXES = {
+    'ix_reports_customer_id': ['customer_id'],
+    'ix_reports_filter_plant_id': ['filter_plant_id'],
+}
+
+
+def upgrade() -> None:
+    # Built CONCURRENTLY outside the migration transaction, so reports can be
+    # written while an existing database is upgraded.
+    with op.get_context().autocommit_block():
+        for name, columns in REPORT_INDEXES.items():
+            op.create_index(name, 'reports', columns, unique=False, postgresql_concurrently=True)
+        for name in REPLACED_INDEXES:
+            op.drop_index(name, table_name='reports', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in REPLACED_INDEXES.items():
+            op.create_index(name, 'reports', columns, unique=False, postgresql_concurrently=True)
+        for name in REPORT_INDEXES:
+            op.drop_index(name, table_name='reports', postgresql_concurrently=True)
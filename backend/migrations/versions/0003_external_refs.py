@@ -0,0 +1,38 @@
+"""external refs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:14:41.027385
+
+The key a batch import's source system uses for customers, filter plants and
+components, unique below their parent.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARENT_COLUMNS = {
+    'customers': 'client_id',
+    'filter_plants': 'customer_id',
+    'components': 'filter_plant_id',
+}
+
+
+def upgrade() -> None:
+    for table, parent in PARENT_COLUMNS.items():
+        op.add_column(table, sa.Column('external_ref', sa.String(length=100), nullable=True))
+        # Every existing row has no ref yet, so the indexes are empty.
+        op.create_index(f'uq_{table}_{parent}_external_ref', table, [parent, 'external_ref'], unique=True, postgresql_where=sa.text('external_ref IS NOT NULL'))
+
+
+def downgrade() -> None:
+    for table, parent in PARENT_COLUMNS.items():
+        op.drop_index(f'uq_{table}_{parent}_external_ref', table_name=table, postgresql_where=sa.text('external_ref IS NOT NULL'))
+        op.drop_column(table, 'external_ref')
@@ -0,0 +1,31 @@
+"""version columns
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 09:17:26.880142
+
+Row versions for ETags and optimistic locking. Existing rows start at 1; a
+constant default adds the column without rewriting the table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ('clients', 'manufacturers', 'customers', 'filter_plants', 'components', 'reports')
+
+
+def upgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.drop_column(table, 'version')
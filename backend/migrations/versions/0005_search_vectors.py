@@ -0,0 +1,49 @@
+"""search vectors
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 09:21:52.371906
+
+Stored generated tsvector columns with GIN indexes for /search. Adding a
+generated column rewrites the table under an ACCESS EXCLUSIVE lock, so on an
+existing database this revision needs a maintenance window (see the README).
+The indexes are then built CONCURRENTLY and no longer add to it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Names are matched word for word, free text is stemmed.
+SEARCHED_COLUMNS = {
+    'manufacturers': ('name', 'simple'),
+    'customers': ('name', 'simple'),
+    'filter_plants': ('description', 'german'),
+    'components': ('name', 'simple'),
+    'report_components': ('description', 'german'),
+}
+
+
+def upgrade() -> None:
+    for table, (column, config) in SEARCHED_COLUMNS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(f"to_tsvector('{config}', {column})", persisted=True), nullable=True))
+    # Committed before the indexes are built, so the tables are writable again
+    # while they are.
+    with op.get_context().autocommit_block():
+        for table in SEARCHED_COLUMNS:
+            op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in SEARCHED_COLUMNS:
+            op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_using='gin', postgresql_concurrently=True)
+    for table in SEARCHED_COLUMNS:
+        op.drop_column(table, 'search_vector')
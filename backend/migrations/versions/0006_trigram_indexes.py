@@ -0,0 +1,65 @@
+"""trigram indexes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 15:40:12.204518
+
+Trigram indexes for fuzzy name matching. pg_trgm ships with the official
+Postgres images but is a contrib module; without it search falls back to
+full-text matching only and this revision does nothing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = {
+    "customers": "name",
+    "manufacturers": "name",
+    "filter_plants": "description",
+    "components": "name",
+}
+
+
+def _trigram_available() -> bool:
+    if op.get_context().as_sql:
+        # Offline scripts are written for the official images, which ship it.
+        return True
+    return op.get_bind().execute(
+        sa.text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')")
+    ).scalar()
+
+
+def upgrade() -> None:
+    if not _trigram_available():
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built CONCURRENTLY outside the migration transaction, so writes to these
+    # tables continue while an existing database is upgraded.
+    with op.get_context().autocommit_block():
+        for table, column in TRIGRAM_COLUMNS.items():
+            op.create_index(
+                f"ix_{table}_{column}_trgm",
+                table,
+                [sa.text(f"{column} gin_trgm_ops")],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in TRIGRAM_COLUMNS.items():
+            op.drop_index(
+                f"ix_{table}_{column}_trgm",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
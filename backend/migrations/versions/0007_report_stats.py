@@ -0,0 +1,239 @@
+"""report stats
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 09:30:18.642057
+
+Pre-aggregated report counters. Adds each report's item count and the
+report_stats table with the triggers that keep both current, then fills them
+from the existing rows as rebuild_report_stats does. Writes to reports and
+their items wait until it commits.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers see every row a statement changed through its
+# transition tables, so a bulk INSERT, a COPY or a cascaded DELETE costs one
+# upsert per touched scope instead of one per row.
+#
+# Report rows carry their own item count. A cascaded delete can therefore
+# subtract a report's items after those rows are gone. Filter plant and
+# manufacturer scopes are resolved through filter_plants. Deleting a plant
+# first moves its totals off its manufacturer; reports deleted after the plant
+# then find no plant and only update the other scopes.
+REPORT_STATS_DDL = (
+    """
+CREATE OR REPLACE FUNCTION report_stats_reports() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    columns constant text := 'customer_id, filter_plant_id, completed, item_count, created_at';
+    changes text;
+BEGIN
+    -- Transition tables are only visible to statements run by the trigger
+    -- function itself, hence one dynamic statement here.
+    IF TG_OP = 'INSERT' THEN
+        changes := 'SELECT 1 AS sign, ' || columns || ' FROM new_reports';
+    ELSIF TG_OP = 'DELETE' THEN
+        changes := 'SELECT -1 AS sign, ' || columns || ' FROM old_reports';
+    ELSE
+        changes := 'SELECT 1 AS sign, ' || columns || ' FROM new_reports '
+            'UNION ALL SELECT -1, ' || columns || ' FROM old_reports';
+    END IF;
+
+    EXECUTE 'WITH changes AS (' || changes || '), '
+        'scoped AS ('
+        '  SELECT ''all''::varchar AS scope, 0 AS scope_id, c.* FROM changes c'
+        '  UNION ALL SELECT ''customer'', c.customer_id, c.* FROM changes c'
+        '    JOIN customers ON customers.id = c.customer_id'
+        '  UNION ALL SELECT ''filter_plant'', c.filter_plant_id, c.* FROM changes c'
+        '    JOIN filter_plants ON filter_plants.id = c.filter_plant_id'
+        '  UNION ALL SELECT ''manufacturer'', filter_plants.manufacturer_id, c.* FROM changes c'
+        '    JOIN filter_plants ON filter_plants.id = c.filter_plant_id'
+        ') '
+        'INSERT INTO report_stats AS s (scope, scope_id, open_reports, completed_reports, '
+        '  report_components, open_created_at_sum) '
+        'SELECT scope, scope_id, '
+        '  sum(CASE WHEN completed THEN 0 ELSE sign END), '
+        '  sum(CASE WHEN completed THEN sign ELSE 0 END), '
+        '  sum(sign * item_count), '
+        '  sum(CASE WHEN completed THEN 0 ELSE sign * extract(epoch FROM created_at) END) '
+        'FROM scoped GROUP BY scope, scope_id '
+        'HAVING sum(CASE WHEN completed THEN 0 ELSE sign END) <> 0 '
+        '  OR sum(CASE WHEN completed THEN sign ELSE 0 END) <> 0 '
+        '  OR sum(sign * item_count) <> 0 '
+        'ORDER BY scope, scope_id '
+        'ON CONFLICT (scope, scope_id) DO UPDATE SET '
+        '  open_reports = s.open_reports + excluded.open_reports, '
+        '  completed_reports = s.completed_reports + excluded.completed_reports, '
+        '  report_components = s.report_components + excluded.report_components, '
+        '  open_created_at_sum = s.open_created_at_sum + excluded.open_created_at_sum';
+    RETURN NULL;
+END
+$$
+""",
+    """
+CREATE OR REPLACE FUNCTION report_stats_items() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reports SET item_count = item_count + added.count
+        FROM (SELECT report_id, count(*) AS count FROM new_items GROUP BY report_id) added
+        WHERE reports.id = added.report_id;
+    ELSE
+        UPDATE reports SET item_count = item_count - removed.count
+        FROM (SELECT report_id, count(*) AS count FROM old_items GROUP BY report_id) removed
+        WHERE reports.id = removed.report_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+""",
+    """
+CREATE OR REPLACE FUNCTION report_stats_move(
+    plant_id integer, manufacturer_id integer, sign integer
+) RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO report_stats AS s (scope, scope_id, open_reports, completed_reports,
+        report_components, open_created_at_sum)
+    SELECT 'manufacturer', manufacturer_id, sign * open_reports, sign * completed_reports,
+        sign * report_components, sign * open_created_at_sum
+    FROM report_stats WHERE scope = 'filter_plant' AND scope_id = plant_id
+    ON CONFLICT (scope, scope_id) DO UPDATE SET
+        open_reports = s.open_reports + excluded.open_reports,
+        completed_reports = s.completed_reports + excluded.completed_reports,
+        report_components = s.report_components + excluded.report_components,
+        open_created_at_sum = s.open_created_at_sum + excluded.open_created_at_sum
+$$
+""",
+    """
+CREATE OR REPLACE FUNCTION report_stats_filter_plants() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        PERFORM report_stats_move(OLD.id, OLD.manufacturer_id, -1);
+        PERFORM report_stats_move(NEW.id, NEW.manufacturer_id, 1);
+        RETURN NEW;
+    END IF;
+    PERFORM report_stats_move(OLD.id, OLD.manufacturer_id, -1);
+    DELETE FROM report_stats WHERE scope = 'filter_plant' AND scope_id = OLD.id;
+    RETURN OLD;
+END
+$$
+""",
+    """
+CREATE OR REPLACE FUNCTION report_stats_customers() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM report_stats WHERE scope = 'customer' AND scope_id = OLD.id;
+    RETURN OLD;
+END
+$$
+""",
+    """
+CREATE OR REPLACE TRIGGER report_stats_insert AFTER INSERT ON reports
+REFERENCING NEW TABLE AS new_reports
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_reports()
+""",
+    """
+CREATE OR REPLACE TRIGGER report_stats_update AFTER UPDATE ON reports
+REFERENCING OLD TABLE AS old_reports NEW TABLE AS new_reports
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_reports()
+""",
+    """
+CREATE OR REPLACE TRIGGER report_stats_delete AFTER DELETE ON reports
+REFERENCING OLD TABLE AS old_reports
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_reports()
+""",
+    """
+CREATE OR REPLACE TRIGGER report_stats_items_insert AFTER INSERT ON report_components
+REFERENCING NEW TABLE AS new_items
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_items()
+""",
+    """
+CREATE OR REPLACE TRIGGER report_stats_items_delete AFTER DELETE ON report_components
+REFERENCING OLD TABLE AS old_items
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_items()
+""",
+    """
+CREATE OR REPLACE TRIGGER report_stats_filter_plant_manufacturer
+AFTER UPDATE OF manufacturer_id ON filter_plants
+FOR EACH ROW WHEN (OLD.manufacturer_id IS DISTINCT FROM NEW.manufacturer_id)
+EXECUTE FUNCTION report_stats_filter_plants()
+""",
+    """
+CREATE OR REPLACE TRIGGER report_stats_filter_plant_delete BEFORE DELETE ON filter_plants
+FOR EACH ROW EXECUTE FUNCTION report_stats_filter_plants()
+""",
+    """
+CREATE OR REPLACE TRIGGER report_stats_customer_delete BEFORE DELETE ON customers
+FOR EACH ROW EXECUTE FUNCTION report_stats_customers()
+""",
+)
+
+BACKFILL = (
+    "LOCK TABLE reports, report_components IN SHARE MODE",
+    """
+    UPDATE reports SET item_count = counts.item_count
+    FROM (SELECT report_id, count(*) AS item_count FROM report_components GROUP BY report_id) counts
+    WHERE reports.id = counts.report_id
+    """,
+    """
+    INSERT INTO report_stats (scope, scope_id, open_reports, completed_reports,
+        report_components, open_created_at_sum)
+    SELECT
+        CASE GROUPING(reports.customer_id, reports.filter_plant_id, filter_plants.manufacturer_id)
+            WHEN 7 THEN 'all' WHEN 3 THEN 'customer' WHEN 5 THEN 'filter_plant'
+            ELSE 'manufacturer'
+        END,
+        coalesce(reports.customer_id, reports.filter_plant_id, filter_plants.manufacturer_id, 0),
+        count(*) FILTER (WHERE NOT reports.completed),
+        count(*) FILTER (WHERE reports.completed),
+        coalesce(sum(reports.item_count), 0),
+        coalesce(sum(extract(epoch FROM reports.created_at)) FILTER (WHERE NOT reports.completed), 0)
+    FROM reports JOIN filter_plants ON filter_plants.id = reports.filter_plant_id
+    GROUP BY GROUPING SETS (
+        (), (reports.customer_id), (reports.filter_plant_id), (filter_plants.manufacturer_id)
+    )
+    """,
+)
+
+
+def upgrade() -> None:
+    op.add_column('reports', sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('report_stats',
+    sa.Column('scope', sa.String(length=20), nullable=False),
+    sa.Column('scope_id', sa.Integer(), nullable=False),
+    sa.Column('open_reports', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('completed_reports', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('report_components', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('open_created_at_sum', sa.Numeric(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'scope_id')
+    )
+    # Counted before the triggers exist, under a lock that keeps writers out
+    # until the triggers take over at commit.
+    for statement in BACKFILL:
+        op.execute(statement)
+    for statement in REPORT_STATS_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for function in (
+        "report_stats_customers()",
+        "report_stats_filter_plants()",
+        "report_stats_move(integer, integer, integer)",
+        "report_stats_items()",
+        "report_stats_reports()",
+    ):
+        op.execute(f"DROP FUNCTION IF EXISTS {function} CASCADE")
+    op.drop_table('report_stats')
+    op.drop_column('reports', 'item_count')
@@ -0,0 +1,71 @@
+"""cascading deletes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 09:41:07.225913
+
+Deletes cascade in the database: the foreign keys below customers are
+recreated with ON DELETE CASCADE. Customers, filter plants and components get
+deleted_at for soft-delete mode; rows marked deleted give up their
+external_ref, so a batch import re-run creates them anew.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referred table), named as Postgres named them for create_all.
+CASCADING_FOREIGN_KEYS = (
+    ('filter_plants', 'customer_id', 'customers'),
+    ('components', 'filter_plant_id', 'filter_plants'),
+    ('reports', 'customer_id', 'customers'),
+    ('reports', 'filter_plant_id', 'filter_plants'),
+    ('report_components', 'report_id', 'reports'),
+    ('report_components', 'component_id', 'components'),
+)
+# Soft-deleted tables and their parent column, the scope of external_ref.
+SOFT_DELETED_TABLES = {
+    'customers': 'client_id',
+    'filter_plants': 'customer_id',
+    'components': 'filter_plant_id',
+}
+
+
+def _replace_foreign_keys(ondelete) -> None:
+    for table, column, referred in CASCADING_FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        # NOT VALID skips the scan of existing rows while the tables are locked.
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete=ondelete, postgresql_not_valid=True)
+    # Validating in a transaction of its own lets writes through meanwhile.
+    with op.get_context().autocommit_block():
+        for table, column, referred in CASCADING_FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey')
+
+
+def _replace_external_ref_index(table: str, parent: str, where: str) -> None:
+    name = f'uq_{table}_{parent}_external_ref'
+    op.drop_index(name, table_name=table)
+    op.create_index(name, table, [parent, 'external_ref'], unique=True, postgresql_where=sa.text(where))
+
+
+def upgrade() -> None:
+    _replace_foreign_keys('CASCADE')
+    for table, parent in SOFT_DELETED_TABLES.items():
+        op.add_column(table, sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+        op.create_index(f'ix_{table}_deleted', table, ['id'], unique=False, postgresql_where=sa.text('deleted_at IS NOT NULL'))
+        _replace_external_ref_index(table, parent, 'external_ref IS NOT NULL AND deleted_at IS NULL')
+
+
+def downgrade() -> None:
+    for table, parent in SOFT_DELETED_TABLES.items():
+        _replace_external_ref_index(table, parent, 'external_ref IS NOT NULL')
+        op.drop_index(f'ix_{table}_deleted', table_name=table, postgresql_where=sa.text('deleted_at IS NOT NULL'))
+        op.drop_column(table, 'deleted_at')
+    _replace_foreign_keys(None)
@@ -0,0 +1,34 @@
+"""seed initial data
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 15:52:37.918340
+
+The client and customer every worker used to create on startup.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "INSERT INTO clients (name) SELECT 'Initial Client' "
+        "WHERE NOT EXISTS (SELECT 1 FROM clients)"
+    )
+    op.execute(
+        "INSERT INTO customers (name, client_id) "
+        "SELECT 'Initial Customer', min(id) FROM clients "
+        "HAVING count(*) > 0 AND NOT EXISTS (SELECT 1 FROM customers)"
+    )
+
+
+def downgrade() -> None:
+    # Seed rows may be referenced by real data by now; they stay.
+    pass
@@ -0,0 +1,297 @@
+"""partition reports by month
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 17:05:41.530276
+
+Rebuilds reports and report_components as tables range partitioned by the
+report's creation month and copies the existing rows over. Writes to both
+tables are blocked while the rows are copied; run it in a maintenance window
+on large databases. Ids keep coming from the existing sequences.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created beyond the current one; the application keeps this many ahead.
+MONTHS_AHEAD = 3
+
+REPORT_INDEXES = {
+    'ix_reports_created_at_id': ['created_at', 'id'],
+    'ix_reports_customer_id_created_at_id': ['customer_id', 'created_at', 'id'],
+    'ix_reports_filter_plant_id_created_at_id': ['filter_plant_id', 'created_at', 'id'],
+    'ix_reports_completed_created_at_id': ['completed', 'created_at', 'id'],
+    'ix_reports_id': ['id'],
+}
+REPORT_COMPONENT_INDEXES = {
+    'ix_report_components_component_id': ['component_id'],
+    'ix_report_components_id': ['id'],
+    'ix_report_components_report_id': ['report_id'],
+}
+
+# One partition per UTC month for both tables, named <table>_pYYYY_MM. A month
+# whose rows already sit in the default partition is skipped with a warning:
+# those rows stay readable there, they are only not pruned.
+CREATE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION create_report_partitions(first_month date, last_month date)
+RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    month date := date_trunc('month', first_month);
+    suffix text;
+    created integer := 0;
+BEGIN
+    WHILE month <= last_month LOOP
+        suffix := to_char(month, 'YYYY_MM');
+        IF to_regclass('reports_p' || suffix) IS NULL THEN
+            BEGIN
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF reports FOR VALUES FROM (%L) TO (%L)',
+                    'reports_p' || suffix,
+                    month::timestamp AT TIME ZONE 'UTC',
+                    (month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+                );
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF report_components FOR VALUES FROM (%L) TO (%L)',
+                    'report_components_p' || suffix,
+                    month::timestamp AT TIME ZONE 'UTC',
+                    (month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+                );
+                created := created + 1;
+            EXCEPTION WHEN check_violation THEN
+                RAISE WARNING 'Rows of % are in the default partition; not partitioning it.',
+                    suffix;
+            END;
+        END IF;
+        month := month + interval '1 month';
+    END LOOP;
+    RETURN created;
+END
+$$
+"""
+
+# Also joins on the partition key, so each update touches one partition.
+REPORT_STATS_ITEMS = """
+CREATE OR REPLACE FUNCTION report_stats_items() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reports SET item_count = item_count + added.count
+        FROM (
+            SELECT report_id, report_created_at, count(*) AS count
+            FROM new_items GROUP BY report_id, report_created_at
+        ) added
+        WHERE reports.id = added.report_id AND reports.created_at = added.report_created_at;
+    ELSE
+        UPDATE reports SET item_count = item_count - removed.count
+        FROM (
+            SELECT report_id, report_created_at, count(*) AS count
+            FROM old_items GROUP BY report_id, report_created_at
+        ) removed
+        WHERE reports.id = removed.report_id AND reports.created_at = removed.report_created_at;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+REPORT_STATS_ITEMS_UNPARTITIONED = """
+CREATE OR REPLACE FUNCTION report_stats_items() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reports SET item_count = item_count + added.count
+        FROM (SELECT report_id, count(*) AS count FROM new_items GROUP BY report_id) added
+        WHERE reports.id = added.report_id;
+    ELSE
+        UPDATE reports SET item_count = item_count - removed.count
+        FROM (SELECT report_id, count(*) AS count FROM old_items GROUP BY report_id) removed
+        WHERE reports.id = removed.report_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# Same triggers as in 0007; they go with the tables they are defined on.
+REPORT_STATS_TRIGGERS = (
+    """
+CREATE TRIGGER report_stats_insert AFTER INSERT ON reports
+REFERENCING NEW TABLE AS new_reports
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_reports()
+""",
+    """
+CREATE TRIGGER report_stats_update AFTER UPDATE ON reports
+REFERENCING OLD TABLE AS old_reports NEW TABLE AS new_reports
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_reports()
+""",
+    """
+CREATE TRIGGER report_stats_delete AFTER DELETE ON reports
+REFERENCING OLD TABLE AS old_reports
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_reports()
+""",
+    """
+CREATE TRIGGER report_stats_items_insert AFTER INSERT ON report_components
+REFERENCING NEW TABLE AS new_items
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_items()
+""",
+    """
+CREATE TRIGGER report_stats_items_delete AFTER DELETE ON report_components
+REFERENCING OLD TABLE AS old_items
+FOR EACH STATEMENT EXECUTE FUNCTION report_stats_items()
+""",
+)
+
+
+def _set_aside(table: str, indexes) -> None:
+    # Frees the names for the new tables; the sequence must survive the old table.
+    op.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+    for name in indexes:
+        op.drop_index(name, table_name=table)
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.rename_table(table, f"{table}_unpartitioned")
+    op.execute(f"ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT {table}_pkey TO {table}_unpartitioned_pkey")
+
+
+def upgrade() -> None:
+    _set_aside('report_components', [*REPORT_COMPONENT_INDEXES, 'ix_report_components_search_vector'])
+    _set_aside('reports', REPORT_INDEXES)
+
+    op.create_table('reports',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('reports_id_seq')"), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('filter_plant_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('completed', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('item_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['filter_plant_id'], ['filter_plants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    for name, columns in REPORT_INDEXES.items():
+        op.create_index(name, 'reports', columns, unique=False)
+    op.create_table('report_components',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('report_components_id_seq')"), nullable=False),
+    sa.Column('report_id', sa.Integer(), nullable=False),
+    sa.Column('report_created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('component_id', sa.Integer(), nullable=False),
+    sa.Column('description', sa.String(length=1000), nullable=False),
+    sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("to_tsvector('german', description)", persisted=True), nullable=True),
+    sa.ForeignKeyConstraint(['component_id'], ['components.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['report_id', 'report_created_at'], ['reports.id', 'reports.created_at'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'report_created_at'),
+    postgresql_partition_by='RANGE (report_created_at)'
+    )
+    for name, columns in REPORT_COMPONENT_INDEXES.items():
+        op.create_index(name, 'report_components', columns, unique=False)
+    op.create_index('ix_report_components_search_vector', 'report_components', ['search_vector'], unique=False, postgresql_using='gin')
+    op.execute("ALTER SEQUENCE reports_id_seq OWNED BY reports.id")
+    op.execute("ALTER SEQUENCE report_components_id_seq OWNED BY report_components.id")
+
+    op.execute("CREATE TABLE reports_default PARTITION OF reports DEFAULT")
+    op.execute("CREATE TABLE report_components_default PARTITION OF report_components DEFAULT")
+    op.execute(CREATE_PARTITIONS)
+    # Only months that hold reports, so a stray old date adds one partition, not centuries.
+    op.execute(
+        "SELECT create_report_partitions(month, month) FROM ("
+        "SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date AS month "
+        "FROM reports_unpartitioned) months"
+    )
+    op.execute(
+        "SELECT create_report_partitions((now() AT TIME ZONE 'UTC')::date, "
+        f"((now() + interval '{MONTHS_AHEAD} months') AT TIME ZONE 'UTC')::date)"
+    )
+
+    # report_stats already counts these rows: the triggers come afterwards.
+    op.execute(
+        "INSERT INTO reports (id, customer_id, filter_plant_id, created_at, completed, "
+        "item_count, version) "
+        "SELECT id, customer_id, filter_plant_id, created_at, completed, item_count, version "
+        "FROM reports_unpartitioned"
+    )
+    op.execute(
+        "INSERT INTO report_components (id, report_id, report_created_at, component_id, "
+        "description) "
+        "SELECT items.id, items.report_id, reports.created_at, items.component_id, "
+        "items.description "
+        "FROM report_components_unpartitioned items "
+        "JOIN reports_unpartitioned reports ON reports.id = items.report_id"
+    )
+    op.drop_table('report_components_unpartitioned')
+    op.drop_table('reports_unpartitioned')
+
+    op.execute(REPORT_STATS_ITEMS)
+    for statement in REPORT_STATS_TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("LOCK TABLE reports, report_components IN EXCLUSIVE MODE")
+    op.execute("ALTER SEQUENCE reports_id_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE report_components_id_seq OWNED BY NONE")
+    op.rename_table('report_components', 'report_components_partitioned')
+    op.rename_table('reports', 'reports_partitioned')
+    for name in [*REPORT_COMPONENT_INDEXES, 'ix_report_components_search_vector']:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_partitioned")
+    for name in REPORT_INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_partitioned")
+    op.execute("ALTER TABLE report_components_partitioned RENAME CONSTRAINT report_components_pkey TO report_components_partitioned_pkey")
+    op.execute("ALTER TABLE reports_partitioned RENAME CONSTRAINT reports_pkey TO reports_partitioned_pkey")
+
+    op.create_table('reports',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('reports_id_seq')"), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('filter_plant_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('completed', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('item_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['filter_plant_id'], ['filter_plants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    for name, columns in REPORT_INDEXES.items():
+        op.create_index(name, 'reports', columns, unique=False)
+    op.create_table('report_components',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('report_components_id_seq')"), nullable=False),
+    sa.Column('report_id', sa.Integer(), nullable=False),
+    sa.Column('component_id', sa.Integer(), nullable=False),
+    sa.Column('description', sa.String(length=1000), nullable=False),
+    sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("to_tsvector('german', description)", persisted=True), nullable=True),
+    sa.ForeignKeyConstraint(['component_id'], ['components.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['report_id'], ['reports.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    for name, columns in REPORT_COMPONENT_INDEXES.items():
+        op.create_index(name, 'report_components', columns, unique=False)
+    op.create_index('ix_report_components_search_vector', 'report_components', ['search_vector'], unique=False, postgresql_using='gin')
+    op.execute("ALTER SEQUENCE reports_id_seq OWNED BY reports.id")
+    op.execute("ALTER SEQUENCE report_components_id_seq OWNED BY report_components.id")
+
+    op.execute(
+        "INSERT INTO reports (id, customer_id, filter_plant_id, created_at, completed, "
+        "item_count, version) "
+        "SELECT id, customer_id, filter_plant_id, created_at, completed, item_count, version "
+        "FROM reports_partitioned"
+    )
+    op.execute(
+        "INSERT INTO report_components (id, report_id, component_id, description) "
+        "SELECT id, report_id, component_id, description FROM report_components_partitioned"
+    )
+    op.drop_table('report_components_partitioned')
+    op.drop_table('reports_partitioned')
+    op.execute("DROP FUNCTION create_report_partitions(date, date)")
+
+    op.execute(REPORT_STATS_ITEMS_UNPARTITIONED)
+    for statement in REPORT_STATS_TRIGGERS:
+        op.execute(statement)
@@ -0,0 +1,143 @@
+"""shard report stats
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 11:12:07.305418
+
+Spreads every report_stats scope over up to REPORT_STATS_SHARDS rows. Each
+database session adds its deltas to the shard chosen by its backend pid, so
+concurrent report writers no longer queue on the single 'all' row. Reads sum
+the shards of a scope. Downgrading folds the shards back into one row.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REPORT_STATS_SHARDS = 16
+
+COUNTERS = ('open_reports', 'completed_reports', 'report_components', 'open_created_at_sum')
+
+# A session keeps its shard for as long as it lives, so one transaction never
+# holds locks on two shards of the same scope and cannot deadlock against
+# another writer over them.
+REPORT_STATS_SHARD = f"""
+CREATE OR REPLACE FUNCTION report_stats_shard() RETURNS smallint
+LANGUAGE sql STABLE AS $$ SELECT (pg_backend_pid() % {REPORT_STATS_SHARDS})::smallint $$
+"""
+
+# The functions from 0007, with the shard in their key when ``sharded``.
+REPORT_STATS_REPORTS = """
+CREATE OR REPLACE FUNCTION report_stats_reports() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    columns constant text := 'customer_id, filter_plant_id, completed, item_count, created_at';
+    changes text;
+BEGIN
+    -- Transition tables are only visible to statements run by the trigger
+    -- function itself, hence one dynamic statement here.
+    IF TG_OP = 'INSERT' THEN
+        changes := 'SELECT 1 AS sign, ' || columns || ' FROM new_reports';
+    ELSIF TG_OP = 'DELETE' THEN
+        changes := 'SELECT -1 AS sign, ' || columns || ' FROM old_reports';
+    ELSE
+        changes := 'SELECT 1 AS sign, ' || columns || ' FROM new_reports '
+            'UNION ALL SELECT -1, ' || columns || ' FROM old_reports';
+    END IF;
+
+    EXECUTE 'WITH changes AS (' || changes || '), '
+        'scoped AS ('
+        '  SELECT ''all''::varchar AS scope, 0 AS scope_id, c.* FROM changes c'
+        '  UNION ALL SELECT ''customer'', c.customer_id, c.* FROM changes c'
+        '    JOIN customers ON customers.id = c.customer_id'
+        '  UNION ALL SELECT ''filter_plant'', c.filter_plant_id, c.* FROM changes c'
+        '    JOIN filter_plants ON filter_plants.id = c.filter_plant_id'
+        '  UNION ALL SELECT ''manufacturer'', filter_plants.manufacturer_id, c.* FROM changes c'
+        '    JOIN filter_plants ON filter_plants.id = c.filter_plant_id'
+        ') '
+        'INSERT INTO report_stats AS s (scope, scope_id{shard_column}, open_reports, '
+        '  completed_reports, report_components, open_created_at_sum) '
+        'SELECT scope, scope_id{shard_value}, '
+        '  sum(CASE WHEN completed THEN 0 ELSE sign END), '
+        '  sum(CASE WHEN completed THEN sign ELSE 0 END), '
+        '  sum(sign * item_count), '
+        '  sum(CASE WHEN completed THEN 0 ELSE sign * extract(epoch FROM created_at) END) '
+        'FROM scoped GROUP BY scope, scope_id '
+        'HAVING sum(CASE WHEN completed THEN 0 ELSE sign END) <> 0 '
+        '  OR sum(CASE WHEN completed THEN sign ELSE 0 END) <> 0 '
+        '  OR sum(sign * item_count) <> 0 '
+        'ORDER BY scope, scope_id '
+        'ON CONFLICT ({key}) DO UPDATE SET '
+        '  open_reports = s.open_reports + excluded.open_reports, '
+        '  completed_reports = s.completed_reports + excluded.completed_reports, '
+        '  report_components = s.report_components + excluded.report_components, '
+        '  open_created_at_sum = s.open_created_at_sum + excluded.open_created_at_sum';
+    RETURN NULL;
+END
+$$
+"""
+
+REPORT_STATS_MOVE = """
+CREATE OR REPLACE FUNCTION report_stats_move(
+    plant_id integer, manufacturer_id integer, sign integer
+) RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO report_stats AS s (scope, scope_id{shard_column}, open_reports,
+        completed_reports, report_components, open_created_at_sum)
+    SELECT 'manufacturer', manufacturer_id{shard_value}, sign * sum(open_reports),
+        sign * sum(completed_reports), sign * sum(report_components),
+        sign * sum(open_created_at_sum)
+    FROM report_stats WHERE scope = 'filter_plant' AND scope_id = plant_id
+    GROUP BY scope_id
+    ON CONFLICT ({key}) DO UPDATE SET
+        open_reports = s.open_reports + excluded.open_reports,
+        completed_reports = s.completed_reports + excluded.completed_reports,
+        report_components = s.report_components + excluded.report_components,
+        open_created_at_sum = s.open_created_at_sum + excluded.open_created_at_sum
+$$
+"""
+
+
+def _replace_functions(sharded: bool) -> None:
+    parts = {
+        '{shard_column}': ', shard' if sharded else '',
+        '{shard_value}': ', report_stats_shard()' if sharded else '',
+        '{key}': 'scope, scope_id, shard' if sharded else 'scope, scope_id',
+    }
+    for function in (REPORT_STATS_REPORTS, REPORT_STATS_MOVE):
+        for placeholder, value in parts.items():
+            function = function.replace(placeholder, value)
+        op.execute(function)
+
+
+def upgrade() -> None:
+    op.add_column('report_stats', sa.Column('shard', sa.SmallInteger(), server_default='0', nullable=False))
+    op.drop_constraint('report_stats_pkey', 'report_stats', type_='primary')
+    op.create_primary_key('report_stats_pkey', 'report_stats', ['scope', 'scope_id', 'shard'])
+    op.execute(REPORT_STATS_SHARD)
+    _replace_functions(sharded=True)
+
+
+def downgrade() -> None:
+    # Under an exclusive lock so no writer adds to a shard after it was folded.
+    op.execute("LOCK TABLE report_stats IN EXCLUSIVE MODE")
+    sums = ', '.join(f'sum({column})' for column in COUNTERS)
+    updates = ', '.join(f'{column} = s.{column} + excluded.{column}' for column in COUNTERS)
+    op.execute(
+        f"INSERT INTO report_stats AS s (scope, scope_id, shard, {', '.join(COUNTERS)}) "
+        f"SELECT scope, scope_id, 0, {sums} FROM report_stats WHERE shard <> 0 "
+        f"GROUP BY scope, scope_id "
+        f"ON CONFLICT (scope, scope_id, shard) DO UPDATE SET {updates}"
+    )
+    op.execute("DELETE FROM report_stats WHERE shard <> 0")
+    op.drop_constraint('report_stats_pkey', 'report_stats', type_='primary')
+    op.create_primary_key('report_stats_pkey', 'report_stats', ['scope', 'scope_id'])
+    _replace_functions(sharded=False)
+    op.execute("DROP FUNCTION report_stats_shard()")
+    op.drop_column('report_stats', 'shard')
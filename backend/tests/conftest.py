@@ -1,7 +1,24 @@
 import os
 import sys
 
+import pytest
+
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    # The app no longer creates its schema on startup; bring the test
+    # database to the latest revision once per run.
+    from alembic import command
+
+    from app.core.lifecycle import alembic_config, ping_database
+
+    try:
+        ping_database()
+    except Exception:
+        return
+    command.upgrade(alembic_config(), "head")
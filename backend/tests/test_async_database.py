@@ -0,0 +1,79 @@
+import uuid
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from app.api.routes.customers import get_customer, list_customers
+from app.api.routing import run_with_async_session
+from app.core.database import ASYNC_DATABASE_URL, engine, get_async_db
+from app.main import app
+from app.schemas import CustomerRead
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+@pytest.fixture
+def async_client():
+    pytest.importorskip("asyncpg")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    # Every TestClient request runs on a fresh event loop, so connections must not be pooled.
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+    session_factory = async_sessionmaker(async_engine, autoflush=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    router = APIRouter()
+    router.add_api_route(
+        "/customers", run_with_async_session(list_customers), response_model=list[CustomerRead]
+    )
+    router.add_api_route(
+        "/customers/{customer_id}",
+        run_with_async_session(get_customer),
+        response_model=CustomerRead,
+    )
+    async_app = FastAPI()
+    async_app.include_router(router)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    yield TestClient(async_app)
+
+
+def test_async_session_routes_match_sync_routes(async_client):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    client_item = client.post("/clients", json={"name": f"Async Client {uuid.uuid4()}"}).json()
+    customer, _ = [
+        client.post(
+            "/customers",
+            json={"name": f"Async Customer {uuid.uuid4()}", "client_id": client_item["id"]},
+        ).json()
+        for _ in range(2)
+    ]
+
+    response = async_client.get(f"/customers/{customer['id']}")
+    assert response.status_code == 200
+    assert response.json() == client.get(f"/customers/{customer['id']}").json()
+
+    missing = async_client.get("/customers/0")
+    assert missing.status_code == 404
+
+    page = async_client.get("/customers", params={"limit": 1})
+    assert page.status_code == 200
+    assert len(page.json()) == 1
+    assert "X-Next-Cursor" in page.headers
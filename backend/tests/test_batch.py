@@ -0,0 +1,136 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _create_client() -> dict:
+    return client.post("/clients", json={"name": f"Batch Client {uuid.uuid4()}"}).json()
+
+
+def test_create_customers_batch_reports_errors_per_item():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    client_item = _create_client()
+    response = client.post(
+        "/customers/batch",
+        json={
+            "items": [
+                {"name": "Batch Kunde A", "client_id": client_item["id"]},
+                {"name": "   ", "client_id": client_item["id"]},
+                {"name": "Batch Kunde B", "client_id": 0},
+                {"name": "Batch Kunde C", "client_id": client_item["id"]},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert (payload["created"], payload["updated"], payload["failed"]) == (2, 0, 2)
+    assert [item["status"] for item in payload["items"]] == ["created", "error", "error", "created"]
+    assert payload["items"][1]["error"] == "Name is required."
+    assert payload["items"][2]["error"] == "Client not found."
+
+    created = client.get(f"/customers/{payload['items'][3]['id']}").json()
+    assert created["name"] == "Batch Kunde C"
+
+
+def test_create_filter_plants_batch_validates_parents():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    client_item = _create_client()
+    customer = client.post(
+        "/customers", json={"name": f"Batch Plant {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post(
+        "/manufacturers", json={"name": f"Batch Manufacturer {uuid.uuid4()}"}
+    ).json()
+    plant = {
+        "customer_id": customer["id"],
+        "manufacturer_id": manufacturer["id"],
+        "description": "Batch Anlage",
+        "year_built": 2015,
+    }
+    response = client.post(
+        "/filter-plants/batch",
+        json={
+            "items": [
+                plant,
+                dict(plant, manufacturer_id=0),
+                dict(plant, year_built=1700),
+                dict(plant, customer_id=0),
+            ]
+        },
+    )
+    assert response.status_code == 200
+    errors = [item["error"] for item in response.json()["items"]]
+    assert errors == [
+        None,
+        "Manufacturer not found.",
+        "Year built is invalid.",
+        "Customer not found.",
+    ]
+
+    plants = client.get(f"/customers/{customer['id']}/filter-plants").json()
+    assert [item["description"] for item in plants] == ["Batch Anlage"]
+
+
+def test_create_components_batch_upserts_on_external_ref():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    client_item = _create_client()
+    customer = client.post(
+        "/customers", json={"name": f"Batch Comp {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post(
+        "/manufacturers", json={"name": f"Batch Comp Manufacturer {uuid.uuid4()}"}
+    ).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Batch", "year_built": 2020, "manufacturer_id": manufacturer["id"]},
+    ).json()
+
+    items = [
+        {"filter_plant_id": plant["id"], "name": "Pumpe", "external_ref": "P-1"},
+        {"filter_plant_id": plant["id"], "name": "Ventil", "external_ref": "V-1"},
+        {"filter_plant_id": plant["id"], "name": "Schlauch"},
+    ]
+    first = client.post("/components/batch", json={"items": items}).json()
+    assert first["created"] == 3
+
+    rerun = client.post("/components/batch", json={"items": items[:2]}).json()
+    assert [item["error"] for item in rerun["items"]] == ["Already exists.", "Already exists."]
+
+    items[0]["name"] = "Pumpe XL"
+    upserted = client.post("/components/batch", json={"items": items, "upsert": True}).json()
+    assert [item["status"] for item in upserted["items"]] == ["updated", "updated", "created"]
+    assert upserted["items"][0]["id"] == first["items"][0]["id"]
+    assert client.get(f"/components/{first['items'][0]['id']}").json()["name"] == "Pumpe XL"
+
+    duplicate = client.post(
+        "/components/batch", json={"items": [items[1], items[1]], "upsert": True}
+    ).json()
+    assert [item["status"] for item in duplicate["items"]] == ["updated", "error"]
+
+
+def test_batch_rejects_empty_payload():
+    response = client.post("/customers/batch", json={"items": []})
+    assert response.status_code == 422
@@ -0,0 +1,142 @@
+import gzip
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core import compression, response_cache
+from app.core.database import engine
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = response_cache.ResponseCache(response_cache.MemoryBackend(max_entries=100), ttl=60)
+    monkeypatch.setattr(response_cache, "response_cache", cache)
+    return cache
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip;q=0.1", "gzip"),
+        ("*;q=0", None),
+    ],
+)
+def test_negotiate_honours_weights(header, expected):
+    assert compression.negotiate(header) == expected
+
+
+def test_negotiate_prefers_server_order_on_ties():
+    assert compression.negotiate("gzip, br, zstd") == compression.ENCODINGS[0]
+    assert compression.negotiate("*") == compression.ENCODINGS[0]
+
+
+def test_encode_round_trips_and_weakens_etag():
+    body = b'{"name":"Pumpe"}' * 200
+    headers, compressed = compression.encode(
+        "gzip", {"content-type": "application/json", "content-length": "3200", "etag": '"a"'}, body
+    )
+    assert gzip.decompress(compressed) == body
+    assert headers["content-encoding"] == "gzip"
+    assert headers["etag"] == 'W/"a"'
+    assert headers["vary"] == "Accept-Encoding"
+    assert "content-length" not in headers
+
+
+def _create_plant(component_count: int) -> tuple[dict, list[dict]]:
+    client_item = client.post("/clients", json={"name": f"Zip {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Zip {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post("/manufacturers", json={"name": f"Zip {uuid.uuid4()}"}).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Halle", "year_built": 2012, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    components = [
+        client.post(
+            f"/filter-plants/{plant['id']}/components", json={"name": f"Komponente {index}"}
+        ).json()
+        for index in range(component_count)
+    ]
+    return plant, components
+
+
+def test_small_responses_are_not_compressed():
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_cached_response_is_compressed_once_per_encoding(cache, monkeypatch):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    plant, components = _create_plant(40)
+    url = f"/filter-plants/{plant['id']}/components"
+
+    calls = []
+    encode = compression.encode
+    monkeypatch.setattr(
+        compression, "encode", lambda *args: calls.append(args[0]) or encode(*args)
+    )
+
+    first = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"].startswith("W/")
+    assert first.json() == components
+
+    second = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert second.headers["content-encoding"] == "gzip"
+    assert second.json() == components
+    assert calls == ["gzip"]
+
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == components
+    assert plain.headers["etag"] == first.headers["etag"].removeprefix("W/")
+
+    unchanged = client.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]}
+    )
+    assert unchanged.status_code == 304
+
+    client.patch(f"/components/{components[0]['id']}", json={"name": "Neu"})
+    renamed = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert renamed.json()[0]["name"] == "Neu"
+    assert calls == ["gzip", "gzip"]
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_uncached_response_is_compressed_by_middleware(encoding):
+    if encoding not in compression.ENCODINGS:
+        pytest.skip(f"{encoding} is not installed.")
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    plant, components = _create_plant(40)
+    response = client.get(
+        "/exports/inventory",
+        params={"customer_id": plant["customer_id"]},
+        headers={"Accept-Encoding": encoding},
+    )
+    assert response.headers["content-encoding"] == encoding
+    assert len(response.text.splitlines()) == len(components)
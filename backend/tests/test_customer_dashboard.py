@@ -0,0 +1,129 @@
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.core.database import engine
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+@contextmanager
+def _count_queries():
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _create_customer_with_plants(plant_count: int) -> tuple[dict, list[dict]]:
+    client_item = client.post("/clients", json={"name": f"Dashboard {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Dashboard {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post(
+        "/manufacturers", json={"name": f"Dashboard Hersteller {uuid.uuid4()}"}
+    ).json()
+
+    plants = []
+    for index in range(plant_count):
+        plant = client.post(
+            f"/customers/{customer['id']}/filter-plants",
+            json={
+                "description": f"Anlage {index}",
+                "year_built": 2000 + index,
+                "manufacturer_id": manufacturer["id"],
+            },
+        ).json()
+        plant["components"] = [
+            client.post(
+                f"/filter-plants/{plant['id']}/components", json={"name": f"K{index}-{i}"}
+            ).json()
+            for i in range(2)
+        ]
+        plants.append(plant)
+    return customer, plants
+
+
+def _create_report(customer: dict, plant: dict, completed: bool = False) -> dict:
+    descriptions = [
+        {"component_id": component["id"], "description": "OK"}
+        for component in plant["components"]
+    ]
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={"component_descriptions": descriptions},
+    ).json()
+    if completed:
+        client.patch(
+            f"/reports/{report['id']}",
+            json={"completed": True, "component_descriptions": descriptions},
+        )
+    return report
+
+
+def test_dashboard_aggregates_plants_components_and_reports():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, plants = _create_customer_with_plants(2)
+    _create_report(customer, plants[0], completed=True)
+    latest = _create_report(customer, plants[0])
+
+    response = client.get(f"/customers/{customer['id']}/dashboard")
+    assert response.status_code == 200
+    dashboard = response.json()
+    assert dashboard["name"] == customer["name"]
+    assert (dashboard["report_count"], dashboard["open_report_count"]) == (2, 1)
+    assert [report["id"] for report in dashboard["latest_reports"]][0] == latest["id"]
+
+    first, second = dashboard["filter_plants"]
+    assert first["manufacturer_name"].startswith("Dashboard Hersteller")
+    assert [component["name"] for component in first["components"]] == ["K0-0", "K0-1"]
+    assert (first["report_count"], first["open_report_count"]) == (2, 1)
+    assert first["latest_report"]["id"] == latest["id"]
+    assert second["report_count"] == 0
+    assert second["latest_report"] is None
+
+
+def test_dashboard_query_count_does_not_grow_with_plants():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    counts = []
+    for plant_count in (1, 5):
+        customer, plants = _create_customer_with_plants(plant_count)
+        for plant in plants:
+            _create_report(customer, plant)
+        with _count_queries() as statements:
+            response = client.get(f"/customers/{customer['id']}/dashboard")
+        assert len(response.json()["filter_plants"]) == plant_count
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1] == 5
+
+
+def test_dashboard_of_unknown_customer_is_not_found():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    assert client.get("/customers/0/dashboard").status_code == 404
@@ -0,0 +1,202 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.core.database import engine
+from app.main import app
+from app.services import deletion
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _create_customer(plant_count: int = 2, component_count: int = 3) -> tuple[dict, list[dict]]:
+    client_item = client.post("/clients", json={"name": f"Delete {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Delete {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post("/manufacturers", json={"name": f"Delete {uuid.uuid4()}"}).json()
+    plants = []
+    for _ in range(plant_count):
+        plant = client.post(
+            f"/customers/{customer['id']}/filter-plants",
+            json={
+                "description": "Halle",
+                "year_built": 2005,
+                "manufacturer_id": manufacturer["id"],
+            },
+        ).json()
+        components = [
+            client.post(
+                f"/filter-plants/{plant['id']}/components", json={"name": f"K {index}"}
+            ).json()
+            for index in range(component_count)
+        ]
+        for _ in range(2):
+            client.post(
+                f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+                json={
+                    "component_descriptions": [
+                        {"component_id": component["id"], "description": "OK"}
+                        for component in components
+                    ]
+                },
+            )
+        plants.append(plant)
+    return customer, plants
+
+
+def _remaining(customer_id: int) -> dict[str, int]:
+    with engine.connect() as connection:
+        return dict(
+            connection.execute(
+                text(
+                    "SELECT 'customers', count(*) FROM customers WHERE id = :id "
+                    "UNION ALL SELECT 'filter_plants', count(*) FROM filter_plants "
+                    "WHERE customer_id = :id "
+                    "UNION ALL SELECT 'reports', count(*) FROM reports WHERE customer_id = :id "
+                    "UNION ALL SELECT 'report_components', count(*) FROM report_components "
+                    "JOIN reports ON reports.id = report_components.report_id "
+                    "WHERE reports.customer_id = :id"
+                ),
+                {"id": customer_id},
+            ).all()
+        )
+
+
+def test_delete_customer_is_one_statement():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, _ = _create_customer()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.delete(f"/customers/{customer['id']}")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 204
+    assert [statement for statement in statements if statement.startswith("DELETE")] == [
+        "DELETE FROM customers WHERE customers.id = %(id)s AND customers.version = %(version)s"
+    ]
+    assert not any(
+        statement.startswith("SELECT") and "filter_plants" in statement for statement in statements
+    )
+    assert set(_remaining(customer["id"]).values()) == {0}
+
+
+def test_soft_delete_hides_then_purges_in_batches(monkeypatch):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    monkeypatch.setattr(deletion, "SOFT_DELETE", True)
+    scheduled = []
+    monkeypatch.setattr(deletion, "purge_deleted", lambda: scheduled.append(True))
+
+    customer, plants = _create_customer()
+    report_id = client.get(f"/customers/{customer['id']}/reports").json()[0]["id"]
+    before = client.get("/stats/reports").json()
+    assert client.delete(f"/customers/{customer['id']}").status_code == 204
+    assert scheduled == [True]
+
+    assert client.get(f"/customers/{customer['id']}").status_code == 404
+    assert client.get(f"/filter-plants/{plants[0]['id']}").status_code == 404
+    listed = client.get("/reports", params={"customer_id": customer["id"], "include": ""}).json()
+    assert listed == []
+    assert client.get(f"/reports/{report_id}").status_code == 404
+    assert client.get("/search", params={"q": customer["name"].split()[1]}).json() == []
+    assert _remaining(customer["id"]) == {
+        "customers": 1,
+        "filter_plants": 2,
+        "reports": 4,
+        "report_components": 12,
+    }
+
+    monkeypatch.undo()
+    assert deletion.purge_deleted(batch_size=5) >= 1 + 2 + 6 + 4 + 12
+    assert set(_remaining(customer["id"]).values()) == {0}
+    after = client.get("/stats/reports").json()
+    assert before["open_reports"] - after["open_reports"] == 4
+    assert before["report_components"] - after["report_components"] == 12
+
+
+def test_soft_deleted_component_is_hidden_from_its_plant(monkeypatch):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    monkeypatch.setattr(deletion, "SOFT_DELETE", True)
+    monkeypatch.setattr(deletion, "purge_deleted", lambda: None)
+
+    _, plants = _create_customer(plant_count=1)
+    components = client.get(f"/filter-plants/{plants[0]['id']}/components").json()
+    client.delete(f"/components/{components[0]['id']}")
+
+    remaining = client.get(f"/filter-plants/{plants[0]['id']}/components").json()
+    assert [component["id"] for component in remaining] == [
+        component["id"] for component in components[1:]
+    ]
+    assert client.get(f"/components/{components[0]['id']}").status_code == 404
+
+
+def test_reads_carry_no_soft_delete_filters_when_it_is_off():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, plants = _create_customer(plant_count=1)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        client.get("/reports", params={"customer_id": customer["id"]})
+        client.get(f"/filter-plants/{plants[0]['id']}/components")
+        client.get(f"/customers/{customer['id']}/dashboard")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements
+    assert not any("deleted_at IS" in statement for statement in statements)
+
+
+def test_reimporting_a_soft_deleted_customer_creates_it_anew(monkeypatch):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    monkeypatch.setattr(deletion, "SOFT_DELETE", True)
+    monkeypatch.setattr(deletion, "purge_deleted", lambda: None)
+
+    client_item = client.post("/clients", json={"name": f"Delete {uuid.uuid4()}"}).json()
+    batch = {
+        "items": [{"name": "Reimport", "client_id": client_item["id"], "external_ref": "K-1"}],
+        "upsert": True,
+    }
+    first = client.post("/customers/batch", json=batch).json()["items"][0]
+    assert client.delete(f"/customers/{first['id']}").status_code == 204
+
+    second = client.post("/customers/batch", json=batch).json()["items"][0]
+    assert second["status"] == "created"
+    assert second["id"] != first["id"]
+    assert client.get(f"/customers/{second['id']}").status_code == 200
+
+    monkeypatch.undo()
+    deletion.purge_deleted()
+    assert _remaining(first["id"])["customers"] == 0
+    assert _remaining(second["id"])["customers"] == 1
@@ -0,0 +1,143 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _create_customer() -> dict:
+    client_item = client.post("/clients", json={"name": f"ETag Client {uuid.uuid4()}"}).json()
+    return client.post(
+        "/customers", json={"name": f"ETag Kunde {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+
+
+def test_customer_detail_answers_if_none_match_with_304():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer = _create_customer()
+    first = client.get(f"/customers/{customer['id']}")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    cached = client.get(f"/customers/{customer['id']}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    weak = client.get(f"/customers/{customer['id']}", headers={"If-None-Match": f"W/{etag}"})
+    assert weak.status_code == 304
+
+    client.patch(
+        f"/customers/{customer['id']}",
+        json={"name": "Umbenannt", "client_id": customer["client_id"]},
+    )
+    changed = client.get(f"/customers/{customer['id']}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["name"] == "Umbenannt"
+    assert changed.headers["etag"] != etag
+
+
+def test_list_etag_changes_with_rows_and_cursor():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer = _create_customer()
+    manufacturer = client.post("/manufacturers", json={"name": f"ETag M {uuid.uuid4()}"}).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Halle", "year_built": 2001, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    url = f"/filter-plants/{plant['id']}/components"
+    component = client.post(url, json={"name": "Pumpe"}).json()
+
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.patch(f"/components/{component['id']}", json={"name": "Pumpe 2"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+    client.post(url, json={"name": "Ventil"})
+    paged = client.get(url, params={"limit": 1})
+    assert paged.headers["x-next-cursor"]
+    assert paged.headers["etag"] != client.get(url).headers["etag"]
+    not_modified = client.get(
+        url, params={"limit": 1}, headers={"If-None-Match": paged.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["x-next-cursor"] == paged.headers["x-next-cursor"]
+
+
+def test_patch_with_stale_if_match_is_rejected():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer = _create_customer()
+    etag = client.get(f"/customers/{customer['id']}").headers["etag"]
+    payload = {"name": "Erste Änderung", "client_id": customer["client_id"]}
+
+    updated = client.patch(f"/customers/{customer['id']}", json=payload, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    assert updated.headers["etag"] == client.get(f"/customers/{customer['id']}").headers["etag"]
+
+    stale = client.patch(
+        f"/customers/{customer['id']}",
+        json=dict(payload, name="Zweite Änderung"),
+        headers={"If-Match": etag},
+    )
+    assert stale.status_code == 412
+    assert client.get(f"/customers/{customer['id']}").json()["name"] == "Erste Änderung"
+
+
+def test_report_etag_follows_items_and_component_names():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer = _create_customer()
+    manufacturer = client.post("/manufacturers", json={"name": f"ETag M {uuid.uuid4()}"}).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Halle", "year_built": 2001, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    component = client.post(
+        f"/filter-plants/{plant['id']}/components", json={"name": "Pumpe"}
+    ).json()
+    descriptions = [{"component_id": component["id"], "description": "OK"}]
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={"component_descriptions": descriptions},
+    ).json()
+    url = f"/reports/{report['id']}"
+
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.patch(f"/components/{component['id']}", json={"name": "Pumpe neu"})
+    renamed = client.get(url, headers={"If-None-Match": etag})
+    assert renamed.status_code == 200
+    etag = renamed.headers["etag"]
+
+    update = {"completed": False, "component_descriptions": descriptions}
+    assert client.patch(url, json=update, headers={"If-Match": etag}).headers["etag"] == etag
+
+    update["component_descriptions"] = [dict(descriptions[0], description="Defekt")]
+    edited = client.patch(url, json=update, headers={"If-Match": etag})
+    assert edited.status_code == 200
+    assert edited.headers["etag"] != etag
+    assert client.patch(url, json=update, headers={"If-Match": etag}).status_code == 412
@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.main import app
+from app.services import data_export
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _create_inventory() -> dict:
+    client_item = client.post("/clients", json={"name": f"Export Client {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Export Kunde {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post(
+        "/manufacturers", json={"name": f"Export Hersteller {uuid.uuid4()}"}
+    ).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Halle 1", "year_built": 2012, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    components = [
+        client.post(f"/filter-plants/{plant['id']}/components", json={"name": name}).json()
+        for name in ("Pumpe", "Ventil")
+    ]
+    return {
+        "client": client_item,
+        "customer": customer,
+        "manufacturer": manufacturer,
+        "plant": plant,
+        "components": components,
+    }
+
+
+def test_export_reports_ndjson_nests_items(monkeypatch):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    monkeypatch.setattr(data_export, "STREAM_BATCH_SIZE", 1)
+    inventory = _create_inventory()
+    customer, plant = inventory["customer"], inventory["plant"]
+    pump, valve = inventory["components"]
+    created = [
+        client.post(
+            f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+            json={"component_descriptions": descriptions},
+        ).json()
+        for descriptions in (
+            [
+                {"component_id": valve["id"], "description": "Undicht"},
+                {"component_id": pump["id"], "description": "OK"},
+            ],
+            [{"component_id": pump["id"], "description": "Neu"}],
+        )
+    ]
+
+    response = client.get("/exports/reports", params={"customer_id": customer["id"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    reports = [json.loads(line) for line in response.text.splitlines()]
+    assert [report["id"] for report in reports] == [report["id"] for report in created]
+    assert reports[0]["customer_name"] == customer["name"]
+    assert reports[0]["components"] == [
+        {"component_id": valve["id"], "component_name": "Ventil", "description": "Undicht"},
+        {"component_id": pump["id"], "component_name": "Pumpe", "description": "OK"},
+    ]
+    assert [item["description"] for item in reports[1]["components"]] == ["Neu"]
+
+
+def test_export_reports_csv_has_one_line_per_item():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    inventory = _create_inventory()
+    customer, plant = inventory["customer"], inventory["plant"]
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={
+            "component_descriptions": [
+                {"component_id": item["id"], "description": 'Ölstand "niedrig"'}
+                for item in inventory["components"]
+            ]
+        },
+    ).json()
+
+    response = client.get(
+        "/exports/reports", params={"customer_id": customer["id"], "format": "csv"}
+    )
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["report_id"] for row in rows] == [str(report["id"])] * 2
+    assert [row["component_name"] for row in rows] == ["Pumpe", "Ventil"]
+    assert rows[0]["description"] == 'Ölstand "niedrig"'
+
+
+def test_export_inventory_csv_can_be_reimported():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    inventory = _create_inventory()
+    client.post("/customers", json={"name": "Ohne Anlage", "client_id": inventory["client"]["id"]})
+
+    response = client.get(
+        "/exports/inventory", params={"client_id": inventory["client"]["id"], "format": "csv"}
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["customer"], row["filter_plant"], row["component"]) for row in rows] == [
+        (inventory["customer"]["name"], "Halle 1", "Pumpe"),
+        (inventory["customer"]["name"], "Halle 1", "Ventil"),
+        ("Ohne Anlage", "", ""),
+    ]
+
+    reimport = client.post(
+        "/imports/inventory",
+        content=response.content,
+        headers={"content-type": "text/csv"},
+    ).json()
+    assert (reimport["skipped"], reimport["failed"]) == (2, 1)
+
+
+def test_export_rejects_unknown_format():
+    assert client.get("/exports/inventory", params={"format": "xml"}).status_code == 422
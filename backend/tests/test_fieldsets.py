@@ -0,0 +1,159 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.core.database import engine
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _get_with_statements(url: str, **params):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(url, params=params)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return response, statements
+
+
+def _create_report() -> tuple[dict, dict, list[dict], dict]:
+    client_item = client.post("/clients", json={"name": f"Fields {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Fields Kunde {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post("/manufacturers", json={"name": f"Fields {uuid.uuid4()}"}).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Halle", "year_built": 2001, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    components = [
+        client.post(f"/filter-plants/{plant['id']}/components", json={"name": name}).json()
+        for name in ("Pumpe", "Ventil")
+    ]
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={
+            "component_descriptions": [
+                {"component_id": component["id"], "description": "OK"}
+                for component in components
+            ]
+        },
+    ).json()
+    return customer, plant, components, report
+
+
+def test_report_list_selects_only_requested_columns():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, _, _, report = _create_report()
+    url = f"/customers/{customer['id']}/reports"
+
+    response, statements = _get_with_statements(url, fields="id,completed", include="")
+    assert response.status_code == 200
+    assert response.json() == [{"id": report["id"], "completed": False}]
+    assert response.headers["etag"]
+    assert "JOIN" not in statements[-1]
+    assert "customer_id," not in statements[-1].split("FROM")[0]
+
+    named = client.get(url, params={"fields": "id", "include": "customer"}).json()
+    assert named == [{"id": report["id"], "customer_name": customer["name"]}]
+    assert client.get(url).json()[0].keys() == {
+        "id",
+        "customer_id",
+        "customer_name",
+        "filter_plant_id",
+        "filter_plant_description",
+        "created_at",
+        "completed",
+    }
+
+
+def test_report_detail_without_components_skips_their_query():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    _, _, components, report = _create_report()
+    url = f"/reports/{report['id']}"
+
+    full = client.get(url).json()
+    assert [item["component_name"] for item in full["components"]] == ["Pumpe", "Ventil"]
+
+    response, statements = _get_with_statements(url, fields="id,completed", include="")
+    assert response.json() == {"id": report["id"], "completed": False}
+    assert len(statements) == 1
+
+    etag = response.headers["etag"]
+    client.patch(f"/components/{components[0]['id']}", json={"name": "Pumpe neu"})
+    sparse = client.get(url, params={"fields": "id,completed", "include": ""})
+    assert sparse.headers["etag"] == etag
+
+
+def test_filter_plant_embeds_manufacturer_and_components():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, plant, components, _ = _create_report()
+    url = f"/customers/{customer['id']}/filter-plants"
+    params = {"fields": "id,description", "include": "manufacturer,components"}
+
+    plants = client.get(url, params=params).json()
+    assert plants[0]["id"] == plant["id"]
+    assert plants[0]["manufacturer_name"].startswith("Fields")
+    assert [component["name"] for component in plants[0]["components"]] == ["Pumpe", "Ventil"]
+    assert set(plants[0]) == {"id", "description", "manufacturer_name", "components"}
+
+    client.patch(f"/components/{components[1]['id']}", json={"name": "Ventil neu"})
+    renamed = client.get(url, params=params).json()
+    assert [component["name"] for component in renamed[0]["components"]] == [
+        "Pumpe",
+        "Ventil neu",
+    ]
+
+    detail = client.get(f"/filter-plants/{plant['id']}", params={"include": "manufacturer"})
+    assert detail.json() == {**plant, "manufacturer_name": plants[0]["manufacturer_name"]}
+    assert client.get(f"/filter-plants/{plant['id']}").json() == plant
+
+
+def test_customer_fields_and_client_name():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, _, _, _ = _create_report()
+    url = f"/customers/{customer['id']}"
+
+    assert client.get(url, params={"fields": "name"}).json() == {"name": customer["name"]}
+    expanded = client.get(url, params={"include": "client"})
+    assert expanded.json()["client_name"].startswith("Fields")
+    assert expanded.headers["etag"] != client.get(url).headers["etag"]
+
+
+def test_unknown_fields_are_rejected():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    response = client.get("/reports", params={"fields": "id,secret"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown field: secret."
+
+    response = client.get("/customers", params={"include": "manufacturer"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown include: manufacturer."
@@ -5,6 +5,8 @@ from fastapi.testclient import TestClient
 from sqlalchemy import text
 
 from app.core.database import engine
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor
+from app.core.pool import CheckoutMetrics
 from app.main import app
 
 
@@ -66,7 +68,7 @@ def test_list_customers_includes_created_customer():
         "/customers", json={"name": name, "client_id": client_item["id"]}
     ).json()
 
-    response = client.get("/customers")
+    response = client.get("/customers", params={"cursor": encode_cursor([created["id"] - 1])})
     assert response.status_code == 200
     customers = response.json()
     assert any(customer["id"] == created["id"] for customer in customers)
@@ -101,7 +103,7 @@ def test_list_clients_includes_created_client():
 
     created = client.post("/clients", json={"name": f"List Client {uuid.uuid4()}"}).json()
 
-    response = client.get("/clients")
+    response = client.get("/clients", params={"cursor": encode_cursor([created["id"] - 1])})
     assert response.status_code == 200
     clients = response.json()
     assert any(item["id"] == created["id"] for item in clients)
@@ -126,7 +128,7 @@ def test_list_manufacturers_includes_created_manufacturer():
     name = f"List Manufacturer {uuid.uuid4()}"
     created = client.post("/manufacturers", json={"name": name}).json()
 
-    response = client.get("/manufacturers")
+    response = client.get("/manufacturers", params={"cursor": encode_cursor([created["id"] - 1])})
     assert response.status_code == 200
     manufacturers = response.json()
     assert any(item["id"] == created["id"] for item in manufacturers)
@@ -691,3 +693,72 @@ def test_update_report_and_mark_completed():
         },
     )
     assert second.status_code == 400
+
+
+def test_list_manufacturers_paginates_with_cursor():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    created = [
+        client.post("/manufacturers", json={"name": f"Page Manufacturer {uuid.uuid4()}"}).json()
+        for _ in range(3)
+    ]
+
+    seen = []
+    params = {"limit": 2, "cursor": encode_cursor([created[0]["id"] - 1])}
+    while True:
+        response = client.get("/manufacturers", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(item["id"] for item in page)
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert seen == sorted(set(seen))
+    assert all(item["id"] in seen for item in created)
+
+
+def test_lists_are_paged_by_default():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    with engine.begin() as connection:
+        ids = connection.execute(
+            text(
+                "INSERT INTO manufacturers (name) "
+                "SELECT 'Default Page ' || gen_random_uuid() FROM generate_series(1, :count) "
+                "RETURNING id"
+            ),
+            {"count": DEFAULT_PAGE_SIZE + 1},
+        ).scalars().all()
+
+    response = client.get("/manufacturers", params={"cursor": encode_cursor([min(ids) - 1])})
+    assert response.status_code == 200
+    assert len(response.json()) == DEFAULT_PAGE_SIZE
+    assert "X-Next-Cursor" in response.headers
+    assert client.get("/manufacturers", params={"limit": MAX_PAGE_SIZE + 1}).status_code == 422
+
+
+def test_checkout_metrics_histogram_is_cumulative():
+    metrics = CheckoutMetrics(buckets_ms=(1, 10))
+    metrics.observe(0.0005)
+    metrics.observe(0.005)
+    metrics.observe(0.5, timed_out=True)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["count"] == 3
+    assert snapshot["timeouts"] == 1
+    assert snapshot["buckets_ms"] == {"1": 1, "10": 2, "+Inf": 3}
+
+
+def test_db_pool():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    response = client.get("/db-pool")
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["sync"]["pool_class"] in {"QueuePool", "NullPool"}
+    assert payload["sync"]["checkout_wait"]["count"] >= 1
@@ -0,0 +1,228 @@
+import csv
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.main import app
+from app.services.inventory_import import InvalidUploadError, iter_lines, iter_records
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _chunks(data: bytes, size: int):
+    pieces = iter([data[i : i + size] for i in range(0, len(data), size)])
+    return lambda: next(pieces, None)
+
+
+def test_iter_records_parses_csv_split_across_chunks():
+    data = (
+        "﻿client,customer,manufacturer,filter_plant,year_built,component\n"
+        'A,Kunde,M,"Anlage\nHalle 2",2020,Pumpe\n'
+        "A,Kunde,M,Anlage,2020,Ventil"
+    ).encode()
+    records = list(iter_records(iter_lines(_chunks(data, 7)), "csv"))
+    assert [line for line, _ in records] == [3, 4]
+    assert records[0][1]["filter_plant"] == "Anlage\nHalle 2"
+    assert records[0][1]["client"] == "A"
+    assert records[1][1]["component"] == "Ventil"
+
+
+def test_iter_records_reports_invalid_ndjson_lines():
+    data = b'{"client": "A"}\nnot json\n\n[1]\n'
+    records = list(iter_records(iter_lines(_chunks(data, 5)), "ndjson"))
+    assert records == [
+        (1, {"client": "A"}),
+        (2, "Invalid JSON."),
+        (4, "Expected a JSON object."),
+    ]
+
+
+def test_iter_lines_splits_on_newlines_only():
+    data = (
+        "client,customer,manufacturer,filter_plant,year_built,component\r\n"
+        "A,Kunde\u2028Nord,M,Anlage\x0cHalle,2020,Pumpe\x85Ost\r\n"
+    ).encode()
+    records = list(iter_records(iter_lines(_chunks(data, 3)), "csv"))
+    assert [line for line, _ in records] == [2]
+    assert records[0][1]["customer"] == "Kunde\u2028Nord"
+    assert records[0][1]["filter_plant"] == "Anlage\x0cHalle"
+    assert records[0][1]["component"] == "Pumpe\x85Ost"
+
+    data = '{"client": "A\u2028B"}\r\n{"client": "C\u2029D"}'.encode()
+    records = list(iter_records(iter_lines(_chunks(data, 4)), "ndjson"))
+    assert records == [(1, {"client": "A\u2028B"}), (2, {"client": "C\u2029D"})]
+
+
+def test_iter_lines_rejects_invalid_utf8_at_its_line():
+    data = "client\nKunde\nMüller\n".encode() + "Müller\nMeier\n".encode("latin-1")
+    lines = iter_lines(_chunks(data, 4))
+    assert [next(lines) for _ in range(3)] == ["client\n", "Kunde\n", "Müller\n"]
+    with pytest.raises(InvalidUploadError, match="^Line 4 is not valid UTF-8.$"):
+        next(lines)
+
+
+def test_iter_records_reports_unparsable_csv_lines():
+    too_long = "x" * (csv.field_size_limit() + 1)
+    data = (
+        "client,customer,manufacturer,filter_plant,year_built,component\n"
+        "A,Kunde,M,Anlage,2020,Pumpe\n"
+        "A,Kunde\rNord,M,Anlage,2020,Ventil\n"
+        f"A,{too_long},M,Anlage,2020,Filter\n"
+        "A,Kunde,M,Anlage,2020,Motor\n"
+    ).encode()
+    records = list(iter_records(iter_lines(_chunks(data, 1000)), "csv"))
+    assert [line for line, _ in records] == [2, 3, 4, 5]
+    assert records[1][1] == records[2][1] == "Invalid CSV."
+    assert records[3][1]["component"] == "Motor"
+
+
+def test_iter_records_rejects_unparsable_csv_header():
+    data = f"client,{'x' * (csv.field_size_limit() + 1)}\nA,B\n".encode()
+    records = iter_records(iter_lines(_chunks(data, 1000)), "csv")
+    with pytest.raises(InvalidUploadError, match="^Line 1: invalid CSV header.$"):
+        next(records)
+
+
+def test_import_requires_known_format():
+    response = client.post(
+        "/imports/inventory", content=b"x", headers={"content-type": "text/plain"}
+    )
+    assert response.status_code == 415
+
+
+def _setup() -> tuple[dict, dict]:
+    client_item = client.post("/clients", json={"name": f"Import Client {uuid.uuid4()}"}).json()
+    manufacturer = client.post(
+        "/manufacturers", json={"name": f"Import Manufacturer {uuid.uuid4()}"}
+    ).json()
+    return client_item, manufacturer
+
+
+def _ndjson(rows: list[dict]) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+def test_import_ndjson_creates_hierarchy_and_is_idempotent():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    client_item, manufacturer = _setup()
+    customer_name = f"Import Kunde {uuid.uuid4()}"
+    base = {
+        "client": client_item["name"],
+        "customer": customer_name,
+        "manufacturer": manufacturer["name"],
+        "filter_plant": "Anlage 1",
+        "year_built": 2018,
+    }
+    rows = [
+        dict(base, component="Pumpe"),
+        dict(base, component="Ventil"),
+        dict(base, component="Ventil"),
+        dict(base, filter_plant="Anlage 2", component=""),
+        dict(base, client="Unbekannt"),
+        dict(base, year_built="alt"),
+    ]
+    headers = {"content-type": "application/x-ndjson"}
+
+    dry = client.post("/imports/inventory?dry_run=true", content=_ndjson(rows), headers=headers)
+    assert dry.status_code == 200
+    assert dry.json()["created_components"] == 2
+    customers = client.get("/customers", params={"client_id": client_item["id"]}).json()
+    assert customer_name not in [item["name"] for item in customers]
+
+    summary = client.post("/imports/inventory", content=_ndjson(rows), headers=headers).json()
+    assert summary["dry_run"] is False
+    assert (summary["rows"], summary["inserted"], summary["skipped"], summary["failed"]) == (
+        6,
+        3,
+        1,
+        2,
+    )
+    assert (
+        summary["created_customers"],
+        summary["created_filter_plants"],
+        summary["created_components"],
+    ) == (1, 2, 2)
+    assert summary["errors"] == [
+        {"line": 5, "error": "Client not found."},
+        {"line": 6, "error": "Year built is invalid."},
+    ]
+    assert {key: value for key, value in dry.json().items() if key != "dry_run"} == {
+        key: value for key, value in summary.items() if key != "dry_run"
+    }
+
+    rerun = client.post("/imports/inventory", content=_ndjson(rows), headers=headers).json()
+    assert (rerun["inserted"], rerun["skipped"], rerun["failed"]) == (0, 4, 2)
+
+
+def test_import_csv_uses_existing_customers():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    client_item, manufacturer = _setup()
+    customer = client.post(
+        "/customers", json={"name": f"CSV Kunde {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    body = (
+        "client,customer,manufacturer,filter_plant,year_built,component\n"
+        f"{client_item['name']},{customer['name']},{manufacturer['name']},Halle,2010,Filter\n"
+        f"{client_item['name']},{customer['name']},{manufacturer['name']},Halle,2010,Lüfter\n"
+    ).encode()
+
+    response = client.post(
+        "/imports/inventory?format=csv", content=body, headers={"content-type": "text/plain"}
+    )
+    assert response.status_code == 200
+    assert response.json()["created_customers"] == 0
+
+    plants = client.get(f"/customers/{customer['id']}/filter-plants").json()
+    assert [plant["description"] for plant in plants] == ["Halle"]
+    components = client.get(f"/filter-plants/{plants[0]['id']}/components").json()
+    assert sorted(item["name"] for item in components) == ["Filter", "Lüfter"]
+
+
+def test_import_stops_at_invalid_utf8_with_earlier_rows_imported():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    client_item, manufacturer = _setup()
+    customer_name = f"UTF Kunde {uuid.uuid4()}"
+    row = {
+        "client": client_item["name"],
+        "customer": customer_name,
+        "manufacturer": manufacturer["name"],
+        "filter_plant": "Anlage",
+        "year_built": 2018,
+        "component": "Pumpe",
+    }
+    body = _ndjson([row, dict(row, component="Ventil")]) + json.dumps(
+        dict(row, component="Düse"), ensure_ascii=False
+    ).encode("latin-1")
+
+    response = client.post(
+        "/imports/inventory", content=body, headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "Line 3 is not valid UTF-8. Rows imported before it: 2."
+    )
+    customers = client.get("/customers", params={"client_id": client_item["id"]}).json()
+    customer = next(item for item in customers if item["name"] == customer_name)
+    plants = client.get(f"/customers/{customer['id']}/filter-plants").json()
+    components = client.get(f"/filter-plants/{plants[0]['id']}/components").json()
+    assert sorted(item["name"] for item in components) == ["Pumpe", "Ventil"]
@@ -0,0 +1,154 @@
+import uuid
+
+import pytest
+from alembic import command
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, inspect, text
+
+from app.core.database import engine
+from app.core.lifecycle import alembic_config
+from app.main import app
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def test_database_is_at_head():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    with engine.connect() as connection:
+        assert MigrationContext.configure(connection).get_current_revision() == head
+
+
+@pytest.fixture
+def scratch_engine():
+    """An empty database of its own, dropped afterwards."""
+    if not _db_available():
+        pytest.skip("Database is not available.")
+    url = engine.url.set(database=f"migrations_{uuid.uuid4().hex[:12]}")
+    admin = engine.execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        with admin.connect() as connection:
+            connection.execute(text(f'CREATE DATABASE "{url.database}"'))
+    except Exception:
+        pytest.skip("Cannot create a scratch database.")
+    scratch = create_engine(url)
+    yield scratch
+    scratch.dispose()
+    with admin.connect() as connection:
+        connection.execute(text(f'DROP DATABASE "{url.database}"'))
+
+
+def _upgrade(scratch, revision: str) -> None:
+    with scratch.connect() as connection:
+        config = alembic_config()
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+        connection.commit()
+
+
+def test_upgrade_brings_a_create_all_database_up_to_date(scratch_engine):
+    # What the application's create_all built before migrations: 0001's
+    # tables, with data, and no alembic_version.
+    _upgrade(scratch_engine, "0001")
+    with scratch_engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+        connection.execute(text("INSERT INTO clients (name) VALUES ('Client')"))
+        connection.execute(text("INSERT INTO customers (client_id, name) VALUES (1, 'Customer')"))
+        connection.execute(text("INSERT INTO manufacturers (name) VALUES ('Maker')"))
+        connection.execute(
+            text(
+                "INSERT INTO filter_plants (customer_id, manufacturer_id, description, year_built) "
+                "VALUES (1, 1, 'Halle', 2001)"
+            )
+        )
+        connection.execute(text("INSERT INTO components (filter_plant_id, name) VALUES (1, 'Pumpe')"))
+        connection.execute(
+            text(
+                "INSERT INTO reports (customer_id, filter_plant_id, completed) "
+                "SELECT 1, 1, n % 2 = 0 FROM generate_series(1, 3) n"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO report_components (report_id, component_id, description) "
+                "SELECT report_id, 1, 'Dichtung' FROM generate_series(1, 3) report_id, "
+                "generate_series(1, 2)"
+            )
+        )
+
+    _upgrade(scratch_engine, "head")
+
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    with scratch_engine.connect() as connection:
+        assert MigrationContext.configure(connection).get_current_revision() == head
+        assert connection.execute(text("SELECT array_agg(item_count) FROM reports")).scalar() == [
+            2, 2, 2
+        ]
+        stats = connection.execute(
+            text(
+                "SELECT open_reports, completed_reports, report_components FROM report_stats "
+                "WHERE scope = 'all'"
+            )
+        ).one()
+        assert tuple(stats) == (2, 1, 6)
+        # The seed revision leaves existing data alone.
+        assert connection.execute(text("SELECT count(*) FROM clients")).scalar() == 1
+    columns = {column["name"] for column in inspect(scratch_engine).get_columns("customers")}
+    assert {"external_ref", "version", "deleted_at"} <= columns
+
+
+def test_migrations_match_models():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    # Raises AutogenerateDiffsDetected on any difference, using env.py's filters.
+    command.check(alembic_config())
+
+
+def test_migrations_create_report_stats_triggers():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    with engine.connect() as connection:
+        triggers = set(
+            connection.execute(
+                text("SELECT tgname FROM pg_trigger WHERE tgname LIKE 'report_stats_%'")
+            ).scalars()
+        )
+    assert {"report_stats_insert", "report_stats_items_insert"} <= triggers
+
+
+def test_seed_data_exists():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM clients")).scalar() > 0
+        assert connection.execute(text("SELECT count(*) FROM customers")).scalar() > 0
+
+
+def test_startup_runs_no_ddl_or_seed_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with TestClient(app):
+            pass
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    # At most the readiness ping.
+    assert set(statements) <= {"SELECT 1"}
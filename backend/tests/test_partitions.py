@@ -0,0 +1,243 @@
+import gzip
+import re
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+from app.core.database import SessionLocal, engine
+from app.main import app
+from app.models import ReportComponent
+from app.schemas import ReportFilter
+from app.services.partitions import (
+    ARCHIVE_SCHEMA,
+    archive_partition,
+    ensure_partitions,
+    partition_name,
+)
+from app.services.report_queries import apply_report_filter, report_list_query
+
+
+client = TestClient(app)
+
+PARTITION = re.compile(r"\b(reports|report_components)_(p\d{4}_\d{2}|default)\b")
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _this_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+@pytest.fixture
+def old_month():
+    """A month long before any real report, emptied and without partitions afterwards."""
+    if not _db_available():
+        pytest.skip("Database is not available.")
+    month = date(1990, 1, 1)
+    _drop_month(month)
+    yield month
+    _drop_month(month)
+
+
+def _drop_month(month: date) -> None:
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    end = datetime.combine(_add_months(month, 1), datetime.min.time(), timezone.utc)
+    with engine.begin() as connection:
+        # Deleted rather than dropped with their partition, so report_stats follows.
+        connection.execute(
+            text("DELETE FROM reports WHERE created_at >= :start AND created_at < :end"),
+            {"start": start, "end": end},
+        )
+        for table in ("report_components", "reports"):
+            name = partition_name(table, month)
+            if _exists(name):
+                # Report items reference the whole reports table, so detach before dropping.
+                connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            connection.execute(text(f"DROP TABLE IF EXISTS {name}, {ARCHIVE_SCHEMA}.{name}"))
+
+
+def _explain(statement) -> set[str]:
+    compiled = statement.compile(engine)
+    with engine.connect() as connection:
+        plan = "\n".join(
+            connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars()
+        )
+    return {match.group(0) for match in PARTITION.finditer(plan)}
+
+
+def _create_plant() -> tuple[dict, dict, dict]:
+    client_item = client.post("/clients", json={"name": f"Partition {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Partition {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post(
+        "/manufacturers", json={"name": f"Partition {uuid.uuid4()}"}
+    ).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Halle", "year_built": 2001, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    component = client.post(
+        f"/filter-plants/{plant['id']}/components", json={"name": "Pumpe"}
+    ).json()
+    return customer, plant, component
+
+
+def _insert_reports(month: date, count: int, completed: bool = True) -> list[int]:
+    customer, plant, component = _create_plant()
+    created_at = datetime(month.year, month.month, 15, tzinfo=timezone.utc)
+    with engine.begin() as connection:
+        report_ids = connection.execute(
+            text(
+                "INSERT INTO reports (customer_id, filter_plant_id, created_at, completed) "
+                "SELECT :customer_id, :filter_plant_id, :created_at, :completed "
+                "FROM generate_series(1, :count) RETURNING id"
+            ),
+            {
+                "customer_id": customer["id"],
+                "filter_plant_id": plant["id"],
+                "created_at": created_at,
+                "completed": completed,
+                "count": count,
+            },
+        ).scalars().all()
+        connection.execute(
+            text(
+                "INSERT INTO report_components "
+                "(report_id, report_created_at, component_id, description) "
+                "SELECT id, created_at, :component_id, 'Dichtung' FROM reports, "
+                "generate_series(1, 2) WHERE id = ANY(:ids) AND created_at = :created_at"
+            ),
+            {"component_id": component["id"], "ids": report_ids, "created_at": created_at},
+        )
+    return report_ids
+
+
+def _create_partitions(month: date) -> int:
+    with engine.begin() as connection:
+        return connection.execute(
+            text("SELECT create_report_partitions(:month, :month)"), {"month": month}
+        ).scalar()
+
+
+def _all_stats() -> dict:
+    return client.get("/stats/reports").json()
+
+
+def _exists(table: str) -> bool:
+    with engine.connect() as connection:
+        return connection.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": table}
+        ).scalar()
+
+
+def test_report_list_date_filter_prunes_partitions():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    ensure_partitions()
+    month = _this_month()
+    filters = ReportFilter(
+        created_from=datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+        created_to=datetime(month.year, month.month, 1, tzinfo=timezone.utc) + timedelta(days=20),
+    )
+    with SessionLocal() as db:
+        query = apply_report_filter(report_list_query(db), filters)
+        assert _explain(query.statement) == {partition_name("reports", month)}
+
+
+def test_report_items_are_read_from_their_reports_partition():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    ensure_partitions()
+    month = _this_month()
+    created_at = datetime(month.year, month.month, 1, 12, tzinfo=timezone.utc)
+    statement = select(ReportComponent.id).where(
+        ReportComponent.report_id == 1, ReportComponent.report_created_at == created_at
+    )
+    assert _explain(statement) == {partition_name("report_components", month)}
+
+
+def test_ensure_partitions_creates_months_ahead():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    ensure_partitions(months_ahead=5)
+    ahead = _add_months(_this_month(), 5)
+    assert _exists(partition_name("reports", ahead))
+    assert _exists(partition_name("report_components", ahead))
+    assert ensure_partitions(months_ahead=5) == 0
+
+
+def test_rows_without_a_partition_land_in_the_default_partition(old_month):
+    month = old_month
+    report_ids = _insert_reports(month, 2)
+    # The month cannot be split off while its rows sit in the default partition.
+    assert _create_partitions(month) == 0
+    assert client.get(f"/reports/{report_ids[0]}").status_code == 200
+
+
+def test_archive_partition_detaches_completed_month(old_month):
+    month = old_month
+    assert _create_partitions(month) == 1
+    report_ids = _insert_reports(month, 3)
+    before = _all_stats()
+
+    archived = archive_partition(month)
+
+    reports, items = partition_name("reports", month), partition_name("report_components", month)
+    assert archived == [f"{ARCHIVE_SCHEMA}.{reports}", f"{ARCHIVE_SCHEMA}.{items}"]
+    assert not _exists(reports)
+    after = _all_stats()
+    assert before["completed_reports"] - after["completed_reports"] == 3
+    assert before["report_components"] - after["report_components"] == 6
+    assert client.get(f"/reports/{report_ids[0]}").status_code == 404
+    with engine.connect() as connection:
+        assert connection.execute(text(f"SELECT count(*) FROM {archived[0]}")).scalar() == 3
+        assert connection.execute(text(f"SELECT count(*) FROM {archived[1]}")).scalar() == 6
+
+
+def test_archive_partition_exports_gzipped_csv(old_month, tmp_path):
+    month = old_month
+    _create_partitions(month)
+    _insert_reports(month, 2)
+
+    files = archive_partition(month, export_dir=tmp_path)
+
+    reports, items = partition_name("reports", month), partition_name("report_components", month)
+    assert files == [str(tmp_path / f"{reports}.csv.gz"), str(tmp_path / f"{items}.csv.gz")]
+    with gzip.open(files[0], "rt") as exported:
+        lines = exported.read().splitlines()
+    assert lines[0].startswith("id,customer_id,filter_plant_id,created_at,completed")
+    assert len(lines) == 3
+    assert not _exists(f"{ARCHIVE_SCHEMA}.{reports}")
+    assert not _exists(f"{ARCHIVE_SCHEMA}.{items}")
+
+
+def test_archive_partition_refuses_open_reports(old_month):
+    month = old_month
+    _create_partitions(month)
+    report_ids = _insert_reports(month, 1, completed=False)
+
+    with pytest.raises(ValueError, match="still open"):
+        archive_partition(month)
+    assert client.get(f"/reports/{report_ids[0]}").status_code == 200
+
+    with pytest.raises(ValueError, match="No report partition"):
+        archive_partition(date(1100, 1, 1))
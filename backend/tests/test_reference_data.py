@@ -0,0 +1,180 @@
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.core.cache import TTLCache
+from app.core.database import SessionLocal, engine
+from app.core.pagination import encode_cursor
+from app.main import app
+from app.models import Manufacturer
+from app.services import reference_data
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+class _StatementCounter:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self)
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=2, ttl=10)
+
+    cache.set(("clients", 1), "a")
+    cache.set(("clients", 2), "b")
+    assert cache.get(("clients", 1)) == "a"
+    cache.set(("manufacturers", 1), "c")
+    assert cache.get(("clients", 2)) is None
+
+    cache.invalidate("manufacturers")
+    assert cache.get(("manufacturers", 1)) is None
+    assert cache.get(("clients", 1)) == "a"
+
+    now[0] += 11
+    assert cache.get(("clients", 1)) is None
+
+
+def test_ttl_cache_skips_values_read_before_an_invalidation():
+    cache = TTLCache(max_entries=10, ttl=10)
+
+    generation = cache.generation("clients")
+    cache.invalidate("manufacturers")
+    cache.set(("clients", 1), "a", generation=generation)
+    assert cache.get(("clients", 1)) == "a"
+
+    generation = cache.generation("clients")
+    cache.invalidate("clients")
+    cache.set(("clients", 1), "stale", generation=generation)
+    assert cache.get(("clients", 1)) is None
+
+    generation = cache.generation("clients")
+    cache.invalidate()
+    cache.set(("clients", 1), "stale", generation=generation)
+    assert cache.get(("clients", 1)) is None
+
+
+def test_write_committed_during_a_read_is_not_hidden_by_the_cache():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    manufacturer = client.post("/manufacturers", json={"name": f"Race {uuid.uuid4()}"}).json()
+    url = f"/manufacturers/{manufacturer['id']}"
+    renamed = []
+
+    def rename(conn, cursor, statement, parameters, context, executemany):
+        # Runs once the read has its row, before the row is cached.
+        if renamed or "FROM manufacturers" not in statement:
+            return
+        renamed.append(True)
+        with SessionLocal() as db:
+            db.execute(
+                text("UPDATE manufacturers SET name = 'Neu', version = version + 1 WHERE id = :id"),
+                {"id": manufacturer["id"]},
+            )
+            reference_data.invalidate(db, Manufacturer)
+            db.commit()
+
+    reference_data.cache.invalidate("manufacturers")
+    event.listen(engine, "after_cursor_execute", rename)
+    try:
+        assert client.get(url).json()["name"] == manufacturer["name"]
+    finally:
+        event.remove(engine, "after_cursor_execute", rename)
+    assert client.get(url).json()["name"] == "Neu"
+
+
+def test_manufacturer_reads_are_served_from_cache():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    manufacturer = client.post("/manufacturers", json={"name": f"Cache {uuid.uuid4()}"}).json()
+    page = {"cursor": encode_cursor([manufacturer["id"] - 1])}
+    client.get(f"/manufacturers/{manufacturer['id']}")
+    client.get("/manufacturers", params=page)
+
+    with _StatementCounter() as counter:
+        detail = client.get(f"/manufacturers/{manufacturer['id']}")
+        listing = client.get("/manufacturers", params=page)
+    assert counter.statements == []
+    assert detail.json() == manufacturer
+    assert manufacturer in listing.json()
+
+    etag = detail.headers["etag"]
+    assert client.get(
+        f"/manufacturers/{manufacturer['id']}", headers={"If-None-Match": etag}
+    ).status_code == 304
+
+
+def test_create_client_invalidates_cached_list():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    first = client.post("/clients", json={"name": f"Cache Client {uuid.uuid4()}"}).json()
+    page = {"cursor": encode_cursor([first["id"] - 1])}
+    before = client.get("/clients", params=page).json()
+    created = client.post("/clients", json={"name": f"Cache Client {uuid.uuid4()}"}).json()
+    after = client.get("/clients", params=page).json()
+    assert after == before + [created]
+
+    customer = client.post(
+        "/customers", json={"name": "Cache Kunde", "client_id": created["id"]}
+    )
+    assert customer.status_code == 201
+
+
+def test_notify_from_another_worker_invalidates_cache():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    with TestClient(app) as test_client:
+        manufacturer = test_client.post(
+            "/manufacturers", json={"name": f"Listen {uuid.uuid4()}"}
+        ).json()
+        assert test_client.get(f"/manufacturers/{manufacturer['id']}").json() == manufacturer
+
+        # Another worker renames the manufacturer; only its NOTIFY reaches us.
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "UPDATE manufacturers SET name = 'Umbenannt', version = version + 1"
+                    " WHERE id = :id"
+                ),
+                {"id": manufacturer["id"]},
+            )
+            connection.execute(
+                text("SELECT pg_notify(:channel, 'manufacturers')"),
+                {"channel": reference_data.NOTIFY_CHANNEL},
+            )
+
+        deadline = time.monotonic() + 5
+        while reference_data.cache.get(("manufacturers", manufacturer["id"])) is not None:
+            assert time.monotonic() < deadline, "Invalidation was not received."
+            time.sleep(0.05)
+
+        renamed = test_client.get(f"/manufacturers/{manufacturer['id']}").json()
+        assert renamed["name"] == "Umbenannt"
@@ -0,0 +1,173 @@
+import asyncio
+import io
+import os
+import time
+import uuid
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.main import app
+from app.services import report_export
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _weasyprint_available() -> bool:
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_export, "EXPORT_DIR", tmp_path)
+    return tmp_path
+
+
+def _wait_for_job(client: TestClient, job_id: str, timeout: float = 60.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/reports/exports/{job_id}").json()
+        if job["status"] in {"completed", "failed"}:
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"Export {job_id} did not finish.")
+
+
+def test_export_zip_streams_one_entry_per_pdf(export_dir):
+    job = report_export.ExportJob(uuid.uuid4().hex, total=2, status="completed", rendered=2)
+    job.save()
+    (job.directory / "bericht-1.pdf").write_bytes(b"%PDF-1")
+    (job.directory / "bericht-2.pdf").write_bytes(b"%PDF-2")
+
+    chunks = list(report_export.iter_export_zip(job))
+    assert len(chunks) == 3
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.namelist() == ["bericht-1.pdf", "bericht-2.pdf"]
+        assert archive.read("bericht-2.pdf") == b"%PDF-2"
+
+
+def test_unknown_export_is_not_found(export_dir):
+    client = TestClient(app)
+    assert client.get(f"/reports/exports/{uuid.uuid4().hex}").status_code == 404
+    assert client.get("/reports/exports/..%2Fjob").status_code == 404
+
+
+def test_cancelled_export_is_marked_failed(export_dir, monkeypatch):
+    rendering = asyncio.Event()
+
+    async def render_forever(data):
+        rendering.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(report_export, "_load_batch", lambda report_ids: [{"id": 1}])
+    monkeypatch.setattr(report_export, "render_report_pdf", render_forever)
+    job = report_export.ExportJob(uuid.uuid4().hex, total=1)
+
+    async def cancel_while_rendering():
+        task = asyncio.create_task(report_export._run(job, [1]))
+        await rendering.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_while_rendering())
+    stored = report_export.load_job(job.id)
+    assert stored.status == "failed"
+    assert stored.error == "Export was interrupted."
+
+
+def test_running_export_without_progress_is_marked_failed(export_dir):
+    job = report_export.ExportJob(uuid.uuid4().hex, total=5, status="running", rendered=2)
+    job.save()
+    assert report_export.load_job(job.id).status == "running"
+
+    saved_at = time.time() - report_export.EXPORT_STALE_SECONDS - 1
+    os.utime(job.directory / "job.json", (saved_at, saved_at))
+    stale = report_export.load_job(job.id)
+    assert stale.status == "failed"
+    assert stale.rendered == 2
+    assert report_export.load_job(job.id).error == "Export was interrupted."
+
+
+def test_export_without_matches_completes_with_empty_zip(export_dir):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    with TestClient(app) as client:
+        response = client.post("/reports/exports", json={"customer_id": 0})
+        assert response.status_code == 202
+        assert response.json()["total"] == 0
+
+        job = _wait_for_job(client, response.json()["id"])
+        assert job["status"] == "completed"
+
+        download = client.get(f"/reports/exports/{job['id']}/download")
+        assert download.status_code == 200
+        assert download.headers["content-type"] == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(download.content)) as archive:
+            assert archive.namelist() == []
+
+
+def test_export_renders_filtered_reports(export_dir):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+    if not _weasyprint_available():
+        pytest.skip("WeasyPrint is not available.")
+
+    with TestClient(app) as client:
+        client_item = client.post("/clients", json={"name": f"Export {uuid.uuid4()}"}).json()
+        customer = client.post(
+            "/customers",
+            json={"name": f"Export Customer {uuid.uuid4()}", "client_id": client_item["id"]},
+        ).json()
+        manufacturer = client.post(
+            "/manufacturers", json={"name": f"Export Manufacturer {uuid.uuid4()}"}
+        ).json()
+        plant = client.post(
+            f"/customers/{customer['id']}/filter-plants",
+            json={
+                "description": "Export Plant",
+                "year_built": 2020,
+                "manufacturer_id": manufacturer["id"],
+            },
+        ).json()
+        component = client.post(
+            f"/filter-plants/{plant['id']}/components", json={"name": "Messpunkt Export"}
+        ).json()
+        reports = [
+            client.post(
+                f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+                json={
+                    "component_descriptions": [
+                        {"component_id": component["id"], "description": "OK"}
+                    ]
+                },
+            ).json()
+            for _ in range(3)
+        ]
+
+        response = client.post("/reports/exports", json={"customer_id": customer["id"]})
+        job = _wait_for_job(client, response.json()["id"])
+        assert job["status"] == "completed"
+        assert job["rendered"] == job["total"] == 3
+
+        download = client.get(f"/reports/exports/{job['id']}/download")
+        with zipfile.ZipFile(io.BytesIO(download.content)) as archive:
+            assert sorted(archive.namelist()) == sorted(
+                f"bericht-{report['id']}.pdf" for report in reports
+            )
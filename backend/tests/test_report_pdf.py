@@ -0,0 +1,191 @@
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.content_cache import ContentCache
+from app.core.database import engine
+from app.api.routes import reports as reports_routes
+from app.main import app
+from app.services import report_pdf
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _weasyprint_available() -> bool:
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+def _report_data(**overrides) -> dict:
+    data = {
+        "id": 7,
+        "customer_id": 1,
+        "customer_name": "Stadtwerke <Nord>",
+        "filter_plant_id": 2,
+        "filter_plant_description": "Industriefilter A",
+        "created_at": "2024-03-05T08:15:00+00:00",
+        "completed": True,
+        "components": [
+            {"component_id": 3, "component_name": "Pumpe A", "description": "Dichtung erneuert"}
+        ],
+    }
+    data.update(overrides)
+    return data
+
+
+def test_report_html_renders_escaped_report_data():
+    html = report_pdf.render_report_html(_report_data())
+    assert "Bericht #7" in html
+    assert "Stadtwerke &lt;Nord&gt;" in html
+    assert "05.03.2024 08:15" in html
+    assert "Dichtung erneuert" in html
+    assert "Abgeschlossen" in html
+
+
+def test_report_fingerprint_follows_report_data():
+    assert report_pdf.report_fingerprint(_report_data()) == report_pdf.report_fingerprint(
+        _report_data()
+    )
+    assert report_pdf.report_fingerprint(_report_data()) != report_pdf.report_fingerprint(
+        _report_data(completed=False)
+    )
+
+
+def test_content_cache_round_trip_and_pruning(tmp_path):
+    cache = ContentCache(tmp_path, suffix=".pdf", max_entries=2)
+    assert cache.get("missing") is None
+
+    for key in ("a", "b", "c"):
+        cache.put(key, key.encode())
+
+    assert cache.get("c") == b"c"
+    assert len(list(tmp_path.glob("*.pdf"))) == 2
+
+
+def test_content_cache_evicts_least_recently_used(tmp_path):
+    cache = ContentCache(tmp_path, suffix=".pdf", max_entries=2)
+    cache.put("a", b"a")
+    cache.put("b", b"b")
+    for index, key in enumerate(("a", "b")):
+        os.utime(tmp_path / f"{key}.pdf", (1000 + index, 1000 + index))
+
+    assert cache.get("a") == b"a"
+    cache.put("c", b"c")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a"
+    assert cache.get("c") == b"c"
+
+
+def test_content_cache_lists_the_directory_only_when_full(tmp_path, monkeypatch):
+    cache = ContentCache(tmp_path, suffix=".pdf", max_entries=10)
+    listings = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: listings.append(1) or entries())
+
+    for index in range(11):
+        cache.put(str(index), b"x")
+    assert len(listings) == 2
+    assert len(list(tmp_path.glob("*.pdf"))) == 9
+
+
+def test_get_report_pdf_answers_not_modified_without_rendering(monkeypatch):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    renders = []
+
+    async def render(data):
+        renders.append(data["id"])
+        return b"%PDF-1", report_pdf.report_fingerprint(data)
+
+    monkeypatch.setattr(reports_routes, "render_report_pdf", render)
+    client_item = client.post("/clients", json={"name": f"PDF Client {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"PDF Customer {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post(
+        "/manufacturers", json={"name": f"PDF Manufacturer {uuid.uuid4()}"}
+    ).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={
+            "description": "PDF Plant",
+            "year_built": 2020,
+            "manufacturer_id": manufacturer["id"],
+        },
+    ).json()
+    component = client.post(
+        f"/filter-plants/{plant['id']}/components", json={"name": "Messpunkt PDF"}
+    ).json()
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={"component_descriptions": [{"component_id": component["id"], "description": "OK"}]},
+    ).json()
+    url = f"/reports/{report['id']}/pdf"
+
+    first = client.get(url)
+    assert first.content == b"%PDF-1"
+    cached = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == first.headers["etag"]
+    assert renders == [report["id"]]
+
+
+def test_get_report_pdf_is_rendered_once(tmp_path, monkeypatch):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+    if not _weasyprint_available():
+        pytest.skip("WeasyPrint is not available.")
+
+    monkeypatch.setattr(report_pdf, "pdf_cache", ContentCache(tmp_path, suffix=".pdf"))
+    client_item = client.post("/clients", json={"name": f"PDF Client {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"PDF Customer {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post(
+        "/manufacturers", json={"name": f"PDF Manufacturer {uuid.uuid4()}"}
+    ).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={
+            "description": "PDF Plant",
+            "year_built": 2020,
+            "manufacturer_id": manufacturer["id"],
+        },
+    ).json()
+    component = client.post(
+        f"/filter-plants/{plant['id']}/components", json={"name": "Messpunkt PDF"}
+    ).json()
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={"component_descriptions": [{"component_id": component["id"], "description": "OK"}]},
+    ).json()
+
+    first = client.get(f"/reports/{report['id']}/pdf")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/pdf"
+    assert first.content.startswith(b"%PDF")
+    assert len(list(tmp_path.glob("*.pdf"))) == 1
+
+    second = client.get(f"/reports/{report['id']}/pdf")
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+
+    missing = client.get("/reports/0/pdf")
+    assert missing.status_code == 404
@@ -0,0 +1,234 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, func, select, text
+from sqlalchemy.pool import NullPool
+
+from app.core.database import SessionLocal, engine
+from app.main import app
+from app.models import ReportStats
+from app.services.report_stats import rebuild_report_stats
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _counts(stats: dict) -> tuple[int, int, int]:
+    return stats["open_reports"], stats["completed_reports"], stats["report_components"]
+
+
+def _create_customer() -> tuple[dict, list[dict], list[dict]]:
+    client_item = client.post("/clients", json={"name": f"Stats {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Stats {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturers = [
+        client.post("/manufacturers", json={"name": f"Stats {uuid.uuid4()}"}).json()
+        for _ in range(2)
+    ]
+    plants = [
+        client.post(
+            f"/customers/{customer['id']}/filter-plants",
+            json={
+                "description": "Halle",
+                "year_built": 2010,
+                "manufacturer_id": manufacturer["id"],
+            },
+        ).json()
+        for manufacturer in manufacturers
+    ]
+    return customer, plants, manufacturers
+
+
+def _create_report(customer: dict, plant: dict, component_count: int) -> dict:
+    components = [
+        client.post(f"/filter-plants/{plant['id']}/components", json={"name": f"K {index}"}).json()
+        for index in range(component_count)
+    ]
+    return client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={
+            "component_descriptions": [
+                {"component_id": component["id"], "description": "OK"} for component in components
+            ]
+        },
+    ).json()
+
+
+def _snapshot() -> dict:
+    """Counters per scope, summed over its shards."""
+    totals = {}
+    with SessionLocal() as db:
+        for row in db.execute(select(ReportStats)).scalars():
+            key = (row.scope, row.scope_id)
+            counters = (
+                row.open_reports,
+                row.completed_reports,
+                row.report_components,
+                row.open_created_at_sum,
+            )
+            totals[key] = tuple(map(sum, zip(totals.get(key, (0, 0, 0, 0)), counters)))
+    return totals
+
+
+def test_stats_follow_report_writes():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    before = client.get("/stats/reports").json()
+    customer, plants, manufacturers = _create_customer()
+    first = _create_report(customer, plants[0], 3)
+    _create_report(customer, plants[0], 1)
+    _create_report(customer, plants[1], 2)
+
+    stats = client.get(f"/stats/customers/{customer['id']}").json()
+    assert stats["customer_id"] == customer["id"]
+    assert _counts(stats) == (3, 0, 6)
+    assert stats["total_reports"] == 3
+    assert stats["average_components_per_report"] == 2
+    assert 0 <= stats["average_open_report_age_days"] < 1
+    manufacturer_url = f"/stats/manufacturers/{manufacturers[0]['id']}"
+    assert _counts(client.get(manufacturer_url).json()) == (2, 0, 4)
+
+    # Completing a report with one item fewer moves it and drops the item.
+    items = client.get(f"/reports/{first['id']}").json()["components"][:2]
+    client.patch(
+        f"/reports/{first['id']}",
+        json={
+            "completed": True,
+            "component_descriptions": [
+                {"component_id": item["component_id"], "description": "Erledigt"} for item in items
+            ],
+        },
+    )
+    assert _counts(client.get(f"/stats/customers/{customer['id']}").json()) == (2, 1, 5)
+    assert _counts(client.get(manufacturer_url).json()) == (1, 1, 3)
+
+    after = client.get("/stats/reports").json()
+    assert after["open_reports"] - before["open_reports"] == 2
+    assert after["completed_reports"] - before["completed_reports"] == 1
+    assert after["report_components"] - before["report_components"] == 5
+
+    listed = client.get("/stats/customers", params={"limit": 1000}).json()
+    assert customer["id"] in {row["customer_id"] for row in listed}
+
+
+def test_stats_follow_plants_and_deletes():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    before = _counts(client.get("/stats/reports").json())
+    customer, plants, manufacturers = _create_customer()
+    _create_report(customer, plants[0], 2)
+    old_url, new_url = (f"/stats/manufacturers/{item['id']}" for item in manufacturers)
+
+    moved = {"description": "Halle", "year_built": 2010, "manufacturer_id": manufacturers[1]["id"]}
+    client.patch(f"/filter-plants/{plants[0]['id']}", json=moved)
+    assert _counts(client.get(old_url).json()) == (0, 0, 0)
+    assert _counts(client.get(new_url).json()) == (1, 0, 2)
+
+    component = client.get(f"/filter-plants/{plants[0]['id']}/components").json()[0]
+    client.delete(f"/components/{component['id']}")
+    assert _counts(client.get(new_url).json()) == (1, 0, 1)
+
+    client.delete(f"/filter-plants/{plants[0]['id']}")
+    assert _counts(client.get(new_url).json()) == (0, 0, 0)
+
+    _create_report(customer, plants[1], 1)
+    client.delete(f"/customers/{customer['id']}")
+    assert client.get(f"/stats/customers/{customer['id']}").status_code == 404
+    assert _counts(client.get("/stats/reports").json()) == before
+    assert _counts(client.get(new_url).json()) == (0, 0, 0)
+
+
+def test_rebuild_matches_incremental_stats():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, plants, _ = _create_customer()
+    for plant in plants:
+        _create_report(customer, plant, 2)
+
+    incremental = _snapshot()
+    with SessionLocal() as db:
+        rebuild_report_stats(db)
+        db.commit()
+    rebuilt = _snapshot()
+    # Scopes that drained to zero keep their row until the entity is deleted.
+    assert {key: value for key, value in incremental.items() if any(value[:3])} == {
+        key: value for key, value in rebuilt.items() if any(value[:3])
+    }
+
+
+def test_stats_do_not_read_reports():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/stats/reports").status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert len(statements) == 1
+    assert "FROM report_stats" in statements[0]
+    assert "reports." not in statements[0].replace("report_stats.", "")
+
+
+def test_concurrent_writers_do_not_wait_for_each_other():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    first_customer, first_plants, _ = _create_customer()
+    second_customer, second_plants, _ = _create_customer()
+    insert = text(
+        "INSERT INTO reports (customer_id, filter_plant_id) VALUES (:customer_id, :plant_id)"
+    )
+    shard = text("SELECT report_stats_shard()")
+
+    sessions = create_engine(engine.url, poolclass=NullPool)
+    first = sessions.connect()
+    connections = [first]
+    try:
+        # A session on the first one's shard would wait for it; one of 16 more is elsewhere.
+        for _ in range(16):
+            connections.append(sessions.connect())
+            if connections[-1].execute(shard).scalar() != first.execute(shard).scalar():
+                break
+        second = connections[-1]
+        first.execute(
+            insert, {"customer_id": first_customer["id"], "plant_id": first_plants[0]["id"]}
+        )
+        second.execute(text("SET LOCAL lock_timeout = '2s'"))
+        # Would time out waiting for the first transaction on a single 'all' row.
+        second.execute(
+            insert, {"customer_id": second_customer["id"], "plant_id": second_plants[0]["id"]}
+        )
+        second.commit()
+        first.commit()
+    finally:
+        for connection in connections:
+            connection.close()
+        sessions.dispose()
+
+    assert _counts(client.get(f"/stats/customers/{first_customer['id']}").json()) == (1, 0, 0)
+    assert _counts(client.get(f"/stats/customers/{second_customer['id']}").json()) == (1, 0, 0)
+    with SessionLocal() as db:
+        shards = db.execute(
+            select(func.count()).where(ReportStats.scope == "all", ReportStats.open_reports != 0)
+        ).scalar()
+    assert shards >= 2
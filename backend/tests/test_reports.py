@@ -0,0 +1,266 @@
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.core.database import engine
+from app.api.routes import reports as reports_routes
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+@contextmanager
+def _count_queries():
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _create_customer() -> dict:
+    client_item = client.post("/clients", json={"name": f"Client {uuid.uuid4()}"}).json()
+    return client.post(
+        "/customers",
+        json={"name": f"Query Count {uuid.uuid4()}", "client_id": client_item["id"]},
+    ).json()
+
+
+def _create_plant_with_component(customer: dict) -> tuple[dict, dict]:
+    manufacturer = client.post(
+        "/manufacturers",
+        json={"name": f"Query Count Manufacturer {uuid.uuid4()}"},
+    ).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={
+            "description": "Query Count Plant",
+            "year_built": 2020,
+            "manufacturer_id": manufacturer["id"],
+        },
+    ).json()
+    component = client.post(
+        f"/filter-plants/{plant['id']}/components",
+        json={"name": "Messpunkt Q"},
+    ).json()
+    return plant, component
+
+
+def _create_report(customer: dict, plant: dict, component: dict) -> dict:
+    response = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={
+            "component_descriptions": [
+                {"component_id": component["id"], "description": "OK"}
+            ]
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.mark.parametrize("path", ["/reports", "/customers/{customer_id}/reports"])
+def test_report_list_query_count_is_constant(path):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer = _create_customer()
+    _create_report(customer, *_create_plant_with_component(customer))
+    url = path.format(customer_id=customer["id"])
+
+    with _count_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    baseline = len(statements)
+
+    # Every report gets its own plant so lazy loads could not hide in the identity map.
+    for _ in range(5):
+        _create_report(customer, *_create_plant_with_component(customer))
+
+    with _count_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert len(statements) == baseline
+
+    payload = response.json()
+    own = [report for report in payload if report["customer_id"] == customer["id"]]
+    assert len(own) == 6
+    assert all(report["customer_name"] == customer["name"] for report in own)
+    assert all(report["filter_plant_description"] == "Query Count Plant" for report in own)
+
+
+def test_list_reports_pages_with_cursor_and_filters():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer = _create_customer()
+    plant, component = _create_plant_with_component(customer)
+    created = [_create_report(customer, plant, component) for _ in range(3)]
+    client.patch(
+        f"/reports/{created[0]['id']}",
+        json={
+            "completed": True,
+            "component_descriptions": [
+                {"component_id": component["id"], "description": "Erledigt"}
+            ],
+        },
+    )
+
+    first = client.get("/reports", params={"customer_id": customer["id"], "limit": 2})
+    assert first.status_code == 200
+    assert [report["id"] for report in first.json()] == [created[2]["id"], created[1]["id"]]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get(
+        "/reports", params={"customer_id": customer["id"], "limit": 2, "cursor": cursor}
+    )
+    assert second.status_code == 200
+    assert [report["id"] for report in second.json()] == [created[0]["id"]]
+    assert "X-Next-Cursor" not in second.headers
+
+    completed = client.get(
+        "/reports", params={"filter_plant_id": plant["id"], "completed": True}
+    )
+    assert [report["id"] for report in completed.json()] == [created[0]["id"]]
+
+    invalid = client.get("/reports", params={"cursor": "not-a-cursor"})
+    assert invalid.status_code == 400
+
+
+def _patch_statement_count(report_id: int, descriptions: list[dict]) -> tuple[int, dict]:
+    with _count_queries() as statements:
+        response = client.patch(
+            f"/reports/{report_id}",
+            json={"completed": False, "component_descriptions": descriptions},
+        )
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+@pytest.mark.parametrize("size", [5, 40])
+def test_update_report_applies_item_diff_with_constant_statements(size):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer = _create_customer()
+    plant, first = _create_plant_with_component(customer)
+    components = [first] + [
+        client.post(f"/filter-plants/{plant['id']}/components", json={"name": f"K{i}"}).json()
+        for i in range(size)
+    ]
+    initial = [{"component_id": item["id"], "description": "OK"} for item in components[:-1]]
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={"component_descriptions": initial},
+    ).json()
+
+    # Change one description, drop the second item and add the last component.
+    changed = [dict(initial[0], description="Getauscht")] + initial[2:]
+    changed.append({"component_id": components[-1]["id"], "description": "Neu"})
+    count, payload = _patch_statement_count(report["id"], changed)
+
+    assert count <= 10
+    by_component = {item["component_id"]: item["description"] for item in payload["components"]}
+    assert by_component == {item["component_id"]: item["description"] for item in changed}
+
+    unchanged_count, _ = _patch_statement_count(report["id"], changed)
+    assert unchanged_count < count
+
+
+def test_update_report_keeps_validation():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer = _create_customer()
+    plant, component = _create_plant_with_component(customer)
+    report = _create_report(customer, plant, component)
+
+    blank = client.patch(
+        f"/reports/{report['id']}",
+        json={
+            "completed": False,
+            "component_descriptions": [{"component_id": component["id"], "description": " "}],
+        },
+    )
+    assert blank.status_code == 400
+
+    foreign = client.patch(
+        f"/reports/{report['id']}",
+        json={
+            "completed": False,
+            "component_descriptions": [{"component_id": 0, "description": "OK"}],
+        },
+    )
+    assert foreign.status_code == 400
+
+    empty = client.patch(
+        f"/reports/{report['id']}", json={"completed": False, "component_descriptions": []}
+    )
+    assert empty.status_code == 400
+
+    detail = client.get(f"/reports/{report['id']}").json()
+    assert [item["description"] for item in detail["components"]] == ["OK"]
+
+
+@pytest.mark.parametrize("copy_threshold", [1, 10_000])
+def test_create_report_bulk_inserts_items(copy_threshold, monkeypatch):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    monkeypatch.setattr(reports_routes, "REPORT_COPY_THRESHOLD", copy_threshold)
+    customer = _create_customer()
+    plant, first = _create_plant_with_component(customer)
+    components = [first] + [
+        client.post(f"/filter-plants/{plant['id']}/components", json={"name": f"K{i}"}).json()
+        for i in range(2)
+    ]
+    descriptions = ["OK", 'Filter, "Typ B" getauscht', "Zeile 1\nZeile 2"]
+
+    with _count_queries() as statements:
+        response = client.post(
+            f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+            json={
+                "component_descriptions": [
+                    {"component_id": component["id"], "description": description}
+                    for component, description in zip(components, descriptions)
+                ]
+            },
+        )
+    assert response.status_code == 201
+    assert response.json()["completed"] is False
+    assert len(statements) <= 6
+
+    detail = client.get(f"/reports/{response.json()['id']}").json()
+    assert [item["description"] for item in detail["components"]] == descriptions
+
+
+def test_create_report_validates_before_writing():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer = _create_customer()
+    plant, component = _create_plant_with_component(customer)
+    response = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={"component_descriptions": [{"component_id": component["id"], "description": ""}]},
+    )
+    assert response.status_code == 400
+    assert client.get(f"/customers/{customer['id']}/reports").json() == []
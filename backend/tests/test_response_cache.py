@@ -0,0 +1,232 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.core import response_cache
+from app.core.database import SessionLocal, engine
+from app.core.response_cache import invalidate_on_commit
+from app.main import app
+from app.models import Component
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return response_cache.MemoryBackend(max_entries=100)
+    return response_cache.SQLiteBackend(tmp_path / "cache.sqlite3")
+
+
+@pytest.fixture
+def cache(backend, monkeypatch):
+    cache = response_cache.ResponseCache(backend, ttl=60)
+    monkeypatch.setattr(response_cache, "response_cache", cache)
+    return cache
+
+
+def test_backend_invalidates_by_tag(backend):
+    backend.set("/a", b"A", ["customer:1", "filter_plant:2"], ttl=60)
+    backend.set("/b", b"B", ["customer:1"], ttl=60)
+    backend.set("/c", b"C", ["customer:3"], ttl=60)
+
+    backend.invalidate(["filter_plant:2"])
+    assert backend.get("/a") is None
+    assert backend.get("/b") == b"B"
+
+    backend.invalidate(["customer:1", "unknown"])
+    assert backend.get("/b") is None
+    assert backend.get("/c") == b"C"
+
+    backend.set("/c", b"C2", ["customer:4"], ttl=60)
+    backend.invalidate(["customer:3"])
+    assert backend.get("/c") == b"C2"
+
+
+def test_backend_entries_expire(backend):
+    backend.set("/a", b"A", ["customer:1"], ttl=-1)
+    assert backend.get("/a") is None
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = tmp_path / "shared.sqlite3"
+    first = response_cache.SQLiteBackend(path)
+    second = response_cache.SQLiteBackend(path)
+
+    first.set("/a", b"A", ["customer:1"], ttl=60)
+    assert second.get("/a") == b"A"
+    second.invalidate(["customer:1"])
+    assert first.get("/a") is None
+
+
+def test_backend_refuses_entries_read_before_an_invalidation(backend):
+    mark = backend.mark()
+    backend.invalidate(["customer:1"])
+
+    backend.set("/a", b"A", ["customer:1", "customer:2"], ttl=60, since=mark)
+    assert backend.get("/a") is None
+    backend.set("/b", b"B", ["customer:2"], ttl=60, since=mark)
+    assert backend.get("/b") == b"B"
+    backend.set("/a", b"A", ["customer:1"], ttl=60, since=backend.mark())
+    assert backend.get("/a") == b"A"
+
+
+def test_backend_refuses_entries_older_than_the_invalidation_horizon(backend, monkeypatch):
+    mark = backend.mark()
+    monkeypatch.setattr(response_cache, "INVALIDATION_HORIZON", 0)
+    backend.set("/a", b"A", ["customer:1"], ttl=60, since=mark)
+    assert backend.get("/a") is None
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = response_cache.MemoryBackend(max_entries=2)
+    backend.set("/a", b"A", ["t"], ttl=60)
+    backend.set("/b", b"B", ["t"], ttl=60)
+    backend.get("/a")
+    backend.set("/c", b"C", ["t"], ttl=60)
+    assert backend.get("/b") is None
+    assert backend.get("/a") == b"A"
+
+
+def _create_plant() -> tuple[dict, dict]:
+    client_item = client.post("/clients", json={"name": f"RC Client {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"RC Kunde {uuid.uuid4()}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post("/manufacturers", json={"name": f"RC {uuid.uuid4()}"}).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Halle", "year_built": 2005, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    return customer, plant
+
+
+def _count_statements(call) -> int:
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return len(statements)
+
+
+def test_component_list_is_cached_until_a_write(cache):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, plant = _create_plant()
+    url = f"/filter-plants/{plant['id']}/components"
+    pump = client.post(url, json={"name": "Pumpe"}).json()
+
+    first = client.get(url)
+    assert _count_statements(lambda: client.get(url)) == 0
+    assert client.get(url).json() == first.json() == [pump]
+
+    cached = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+
+    client.patch(f"/components/{pump['id']}", json={"name": "Pumpe XL"})
+    assert [item["name"] for item in client.get(url).json()] == ["Pumpe XL"]
+
+    client.delete(f"/customers/{customer['id']}")
+    assert client.get(url).status_code == 404
+
+
+def test_write_committed_during_a_miss_is_not_hidden_by_the_cache(cache):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    _, plant = _create_plant()
+    url = f"/filter-plants/{plant['id']}/components"
+    committed = []
+
+    def commit_a_component(conn, cursor, statement, parameters, context, executemany):
+        # Runs once the handler has read the list, before its response is stored.
+        if committed or "FROM components" not in statement:
+            return
+        committed.append(True)
+        with SessionLocal() as db:
+            db.add(Component(filter_plant_id=plant["id"], name="Neu"))
+            invalidate_on_commit(db, f"filter_plant:{plant['id']}")
+            db.commit()
+
+    event.listen(engine, "after_cursor_execute", commit_a_component)
+    try:
+        assert client.get(url).json() == []
+    finally:
+        event.remove(engine, "after_cursor_execute", commit_a_component)
+    assert [item["name"] for item in client.get(url).json()] == ["Neu"]
+
+
+def test_report_detail_is_invalidated_by_related_writes(cache):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, plant = _create_plant()
+    component = client.post(
+        f"/filter-plants/{plant['id']}/components", json={"name": "Ventil"}
+    ).json()
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={"component_descriptions": [{"component_id": component["id"], "description": "OK"}]},
+    ).json()
+    url = f"/reports/{report['id']}"
+
+    client.get(url)
+    assert _count_statements(lambda: client.get(url)) == 0
+
+    client.patch(f"/components/{component['id']}", json={"name": "Ventil neu"})
+    assert client.get(url).json()["components"][0]["component_name"] == "Ventil neu"
+
+    client.patch(
+        f"/customers/{customer['id']}",
+        json={"name": "RC umbenannt", "client_id": customer["client_id"]},
+    )
+    assert client.get(url).json()["customer_name"] == "RC umbenannt"
+
+    client.patch(
+        url,
+        json={
+            "completed": True,
+            "component_descriptions": [{"component_id": component["id"], "description": "Neu"}],
+        },
+    )
+    detail = client.get(url).json()
+    assert detail["completed"] is True
+    assert detail["components"][0]["description"] == "Neu"
+
+
+def test_filter_plant_list_sees_new_plants(cache):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    customer, plant = _create_plant()
+    url = f"/customers/{customer['id']}/filter-plants"
+    assert client.get(url).json() == [plant]
+
+    second = client.post(
+        url,
+        json={
+            "description": "Halle 2",
+            "year_built": 2010,
+            "manufacturer_id": plant["manufacturer_id"],
+        },
+    ).json()
+    assert client.get(url).json() == [plant, second]
@@ -0,0 +1,166 @@
+import re
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.database import SessionLocal, engine
+from app.main import app
+from app.services.search import SEARCH_SOURCES, _source_query, trigram_available
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def _create_inventory(token: str) -> dict:
+    client_item = client.post("/clients", json={"name": f"Suche {token}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Stadtwerke {token}", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post("/manufacturers", json={"name": f"Filtertechnik {token}"}).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={
+            "description": f"Filteranlage {token} Halle",
+            "year_built": 2015,
+            "manufacturer_id": manufacturer["id"],
+        },
+    ).json()
+    component = client.post(
+        f"/filter-plants/{plant['id']}/components", json={"name": f"Pumpe {token}"}
+    ).json()
+    report = client.post(
+        f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+        json={
+            "component_descriptions": [
+                {"component_id": component["id"], "description": f"Dichtungen {token} getauscht"}
+            ]
+        },
+    ).json()
+    return {
+        "customer": customer,
+        "manufacturer": manufacturer,
+        "filter_plant": plant,
+        "component": component,
+        "report": report,
+    }
+
+
+def test_search_finds_every_kind():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    token = uuid.uuid4().hex[:12]
+    created = _create_inventory(token)
+
+    response = client.get("/search", params={"q": token})
+    assert response.status_code == 200
+    results = {result["kind"]: result for result in response.json()}
+    assert set(results) == set(SEARCH_SOURCES)
+    assert results["customer"]["id"] == created["customer"]["id"]
+    assert results["manufacturer"]["title"] == created["manufacturer"]["name"]
+    assert results["component"]["customer_id"] == created["customer"]["id"]
+    assert results["component"]["filter_plant_id"] == created["filter_plant"]["id"]
+    assert results["report_item"]["report_id"] == created["report"]["id"]
+    ranks = [result["rank"] for result in response.json()]
+    assert ranks == sorted(ranks, reverse=True)
+
+    # Descriptions are stemmed: the singular finds the plural.
+    stemmed = client.get("/search", params={"q": f"Dichtung {token}", "kinds": "report_item"})
+    assert [result["kind"] for result in stemmed.json()] == ["report_item"]
+
+    only = client.get("/search", params={"q": token, "kinds": "customer,component"}).json()
+    assert {result["kind"] for result in only} == {"customer", "component"}
+
+
+def test_search_index_follows_writes():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    token = uuid.uuid4().hex[:12]
+    renamed = uuid.uuid4().hex[:12]
+    component = _create_inventory(token)["component"]
+
+    client.patch(f"/components/{component['id']}", json={"name": f"Ventil {renamed}"})
+    assert client.get("/search", params={"q": token, "kinds": "component"}).json() == []
+    results = client.get("/search", params={"q": renamed}).json()
+    assert [(result["kind"], result["id"]) for result in results] == [
+        ("component", component["id"])
+    ]
+
+
+def test_search_pages_with_cursor():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    token = uuid.uuid4().hex[:12]
+    plant = _create_inventory(token)["filter_plant"]
+    for index in range(7):
+        client.post(
+            f"/filter-plants/{plant['id']}/components", json={"name": f"Ventil {index} {token}"}
+        )
+
+    expected = client.get("/search", params={"q": token, "limit": 100}).json()
+    assert len(expected) == 12
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": token, "limit": 5, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/search", params=params)
+        seen.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_search_uses_gin_indexes():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    with SessionLocal() as db:
+        # GIN only supports bitmap scans; on tiny tables plain index scans win otherwise.
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        db.execute(text("SET LOCAL enable_indexscan = off"))
+        statement = _source_query(
+            "report_item", SEARCH_SOURCES["report_item"], "Dichtung", trigram_available(db)
+        )
+        compiled = statement.compile(engine)
+        plan = "\n".join(
+            db.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars()
+        )
+    # Each monthly partition carries its copy of ix_report_components_search_vector.
+    assert re.search(r"Bitmap Index Scan on report_components_\w+_search_vector_idx", plan)
+
+
+def test_fuzzy_search_tolerates_typos():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+    with SessionLocal() as db:
+        if not trigram_available(db):
+            pytest.skip("pg_trgm is not installed.")
+
+    token = uuid.uuid4().hex[:12]
+    customer = _create_inventory(token)["customer"]
+    misspelled = f"Stadtwerk {token}"
+    results = client.get("/search", params={"q": misspelled, "kinds": "customer"}).json()
+    assert [result["id"] for result in results] == [customer["id"]]
+
+
+def test_search_rejects_unknown_kinds():
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    response = client.get("/search", params={"q": "Pumpe", "kinds": "customer,invoice"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown kind: invoice."
@@ -0,0 +1,98 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import text
+from sqlalchemy.engine.result import result_tuple
+
+from app.core import serialization
+from app.core.database import engine
+from app.main import app
+from app.schemas import ReportListRead
+
+
+client = TestClient(app)
+
+
+def _db_available() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def test_dump_rows_matches_pydantic():
+    row = result_tuple(
+        [
+            "id",
+            "customer_id",
+            "filter_plant_id",
+            "created_at",
+            "completed",
+            "customer_name",
+            "filter_plant_description",
+        ]
+    )
+    rows = [
+        row((1, 2, 3, datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc), False, "Kunde", "Halle")),
+        row(
+            (
+                4,
+                5,
+                6,
+                datetime(2024, 5, 1, 8, 30, 0, 250, tzinfo=timezone(timedelta(hours=2))),
+                True,
+                "Müller \"AG\"",
+                "Anlage\n2",
+            )
+        ),
+    ]
+    adapter = TypeAdapter(list[ReportListRead])
+    expected = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    names = tuple(ReportListRead.model_fields)
+
+    assert serialization.dump_rows(rows, names) == expected
+    completed = serialization.dump_rows(rows, ("completed",))
+    assert completed == b'[{"completed":false},{"completed":true}]'
+    assert serialization.dump_rows([], names) == b"[]"
+
+
+def test_report_list_is_identical_with_and_without_fast_json(monkeypatch):
+    if not _db_available():
+        pytest.skip("Database is not available.")
+
+    client_item = client.post("/clients", json={"name": f"JSON {uuid.uuid4()}"}).json()
+    customer = client.post(
+        "/customers", json={"name": f"Kunde «{uuid.uuid4()}»", "client_id": client_item["id"]}
+    ).json()
+    manufacturer = client.post("/manufacturers", json={"name": f"JSON {uuid.uuid4()}"}).json()
+    plant = client.post(
+        f"/customers/{customer['id']}/filter-plants",
+        json={"description": "Halle", "year_built": 1999, "manufacturer_id": manufacturer["id"]},
+    ).json()
+    component = client.post(
+        f"/filter-plants/{plant['id']}/components", json={"name": "Pumpe"}
+    ).json()
+    for _ in range(3):
+        client.post(
+            f"/customers/{customer['id']}/filter-plants/{plant['id']}/reports",
+            json={
+                "component_descriptions": [{"component_id": component["id"], "description": "OK"}]
+            },
+        )
+
+    url = f"/customers/{customer['id']}/reports"
+    for params in ({}, {"fields": "created_at,id", "include": "filter_plant"}, {"limit": 2}):
+        monkeypatch.setattr(serialization, "FAST_JSON", True)
+        fast = client.get(url, params=params)
+        monkeypatch.setattr(serialization, "FAST_JSON", False)
+        validated = client.get(url, params=params)
+        assert fast.content == validated.content
+        assert fast.headers["etag"] == validated.headers["etag"]
+        assert fast.headers["content-type"] == "application/json"
+
+    assert len(client.get(url).json()) == 3
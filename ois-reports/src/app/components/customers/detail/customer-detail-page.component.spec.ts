@@ -5,6 +5,40 @@ import { ActivatedRoute, convertToParamMap, provideRouter } from '@angular/route
 
 import { CustomerDetailPage } from './customer-detail-page.component';
 
+const dashboard = {
+  id: 4,
+  name: 'Aqua Filters',
+  client_id: 21,
+  client_name: 'Auftraggeber A',
+  filter_plants: [
+    {
+      id: 12,
+      customer_id: 4,
+      manufacturer_id: 7,
+      description: 'Industriefilter A',
+      year_built: 2020,
+      manufacturer_name: 'FilterTech',
+      components: [],
+      report_count: 1,
+      open_report_count: 1,
+      latest_report: { id: 30, created_at: '2026-01-05T10:00:00Z', completed: false },
+    },
+  ],
+  report_count: 1,
+  open_report_count: 1,
+  latest_reports: [
+    {
+      id: 30,
+      customer_id: 4,
+      customer_name: 'Aqua Filters',
+      filter_plant_id: 12,
+      filter_plant_description: 'Industriefilter A',
+      created_at: '2026-01-05T10:00:00Z',
+      completed: false,
+    },
+  ],
+};
+
 describe('CustomerDetailPage', () => {
   let httpMock: HttpTestingController;
 
@@ -37,35 +71,9 @@ describe('CustomerDetailPage', () => {
     const fixture = TestBed.createComponent(CustomerDetailPage);
     fixture.detectChanges();
 
-    const request = httpMock.expectOne('http://localhost:8000/customers/4');
+    const request = httpMock.expectOne('http://localhost:8000/customers/4/dashboard');
     expect(request.request.method).toBe('GET');
-    request.flush({ id: 4, name: 'Aqua Filters', client_id: 21 });
-
-    const plantsRequest = httpMock.expectOne(
-      'http://localhost:8000/customers/4/filter-plants'
-    );
-    expect(plantsRequest.request.method).toBe('GET');
-    plantsRequest.flush([
-      {
-        id: 12,
-        customer_id: 4,
-        manufacturer_id: 7,
-        description: 'Industriefilter A',
-        year_built: 2020,
-      },
-    ]);
-
-    const clientsRequest = httpMock.expectOne('http://localhost:8000/clients');
-    expect(clientsRequest.request.method).toBe('GET');
-    clientsRequest.flush([{ id: 21, name: 'Auftraggeber A' }]);
-
-    const manufacturersRequest = httpMock.expectOne('http://localhost:8000/manufacturers');
-    expect(manufacturersRequest.request.method).toBe('GET');
-    manufacturersRequest.flush([{ id: 7, name: 'FilterTech' }]);
-
-    const reportsRequest = httpMock.expectOne('http://localhost:8000/customers/4/reports');
-    expect(reportsRequest.request.method).toBe('GET');
-    reportsRequest.flush([]);
+    request.flush(dashboard);
 
     fixture.detectChanges();
     const compiled = fixture.nativeElement as HTMLElement;
@@ -73,36 +81,14 @@ describe('CustomerDetailPage', () => {
     expect(compiled.textContent).toContain('#4');
     expect(compiled.textContent).toContain('Auftraggeber A');
     expect(compiled.textContent).toContain('FilterTech');
+    expect(compiled.textContent).toContain('Bericht #30');
   });
 
   it('should create a filter plant', () => {
     const fixture = TestBed.createComponent(CustomerDetailPage);
     fixture.detectChanges();
 
-    const request = httpMock.expectOne('http://localhost:8000/customers/4');
-    request.flush({ id: 4, name: 'Aqua Filters', client_id: 21 });
-
-    const plantsRequest = httpMock.expectOne(
-      'http://localhost:8000/customers/4/filter-plants'
-    );
-    plantsRequest.flush([
-      {
-        id: 12,
-        customer_id: 4,
-        manufacturer_id: 7,
-        description: 'Industriefilter A',
-        year_built: 2020,
-      },
-    ]);
-
-    const clientsRequest = httpMock.expectOne('http://localhost:8000/clients');
-    clientsRequest.flush([{ id: 21, name: 'Auftraggeber A' }]);
-
-    const manufacturersRequest = httpMock.expectOne('http://localhost:8000/manufacturers');
-    manufacturersRequest.flush([{ id: 7, name: 'FilterTech' }]);
-
-    const reportsRequest = httpMock.expectOne('http://localhost:8000/customers/4/reports');
-    reportsRequest.flush([]);
+    httpMock.expectOne('http://localhost:8000/customers/4/dashboard').flush(dashboard);
 
     const component = fixture.componentInstance as CustomerDetailPage & {
       plantDescription: string;
@@ -113,6 +99,12 @@ describe('CustomerDetailPage', () => {
     };
 
     component.togglePlantForm();
+    const manufacturersRequest = httpMock.expectOne('http://localhost:8000/manufacturers');
+    expect(manufacturersRequest.request.method).toBe('GET');
+    manufacturersRequest.flush([
+      { id: 3, name: 'AquaTech' },
+      { id: 7, name: 'FilterTech' },
+    ]);
     component.plantDescription = 'Industriefilter A';
     component.plantYear = 2020;
     component.selectedManufacturerId = 7;
@@ -146,30 +138,7 @@ describe('CustomerDetailPage', () => {
     const fixture = TestBed.createComponent(CustomerDetailPage);
     fixture.detectChanges();
 
-    const request = httpMock.expectOne('http://localhost:8000/customers/4');
-    request.flush({ id: 4, name: 'Aqua Filters', client_id: 21 });
-
-    const plantsRequest = httpMock.expectOne(
-      'http://localhost:8000/customers/4/filter-plants'
-    );
-    plantsRequest.flush([
-      {
-        id: 12,
-        customer_id: 4,
-        manufacturer_id: 7,
-        description: 'Industriefilter A',
-        year_built: 2020,
-      },
-    ]);
-
-    const clientsRequest = httpMock.expectOne('http://localhost:8000/clients');
-    clientsRequest.flush([{ id: 21, name: 'Auftraggeber A' }]);
-
-    const manufacturersRequest = httpMock.expectOne('http://localhost:8000/manufacturers');
-    manufacturersRequest.flush([{ id: 7, name: 'FilterTech' }]);
-
-    const reportsRequest = httpMock.expectOne('http://localhost:8000/customers/4/reports');
-    reportsRequest.flush([]);
+    httpMock.expectOne('http://localhost:8000/customers/4/dashboard').flush(dashboard);
 
     const component = fixture.componentInstance as CustomerDetailPage & {
       plantDescription: string;
@@ -180,6 +149,12 @@ describe('CustomerDetailPage', () => {
     };
 
     component.togglePlantForm();
+    const manufacturersRequest = httpMock.expectOne('http://localhost:8000/manufacturers');
+    expect(manufacturersRequest.request.method).toBe('GET');
+    manufacturersRequest.flush([
+      { id: 3, name: 'AquaTech' },
+      { id: 7, name: 'FilterTech' },
+    ]);
     component.plantDescription = 'Filteranlage Test';
     component.plantYear = 2021;
     component.selectedManufacturerId = 3;
@@ -199,5 +174,6 @@ describe('CustomerDetailPage', () => {
     fixture.detectChanges();
     const compiled = fixture.nativeElement as HTMLElement;
     expect(compiled.textContent).toContain('Filteranlage wurde angelegt.');
+    expect(compiled.textContent).toContain('AquaTech');
   });
 });
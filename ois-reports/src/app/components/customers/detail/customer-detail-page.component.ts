@@ -3,17 +3,17 @@ import { Component, OnInit, signal } from '@angular/core';
 import { FormsModule } from '@angular/forms';
 import { ActivatedRoute, RouterLink } from '@angular/router';
 
-import { Customer, CustomersService } from '../../../services/customers/customers.service';
-import { Client, ClientsService } from '../../../services/clients/clients.service';
 import {
-  FilterPlant,
-  FilterPlantsService,
-} from '../../../services/filter-plants/filter-plants.service';
+  CustomerDashboard,
+  CustomersService,
+  DashboardFilterPlant,
+} from '../../../services/customers/customers.service';
+import { FilterPlantsService } from '../../../services/filter-plants/filter-plants.service';
 import {
   Manufacturer,
   ManufacturersService,
 } from '../../../services/manufacturers/manufacturers.service';
-import { ReportRead, ReportsService } from '../../../services/reports/reports.service';
+import { ReportRead } from '../../../services/reports/reports.service';
 
 @Component({
   selector: 'app-customer-detail-page',
@@ -23,14 +23,12 @@ import { ReportRead, ReportsService } from '../../../services/reports/reports.se
   styleUrl: './customer-detail-page.component.scss',
 })
 export class CustomerDetailPage implements OnInit {
-  protected readonly customer = signal<Customer | null>(null);
-  protected readonly filterPlants = signal<FilterPlant[]>([]);
-  protected readonly clients = signal<Client[]>([]);
+  protected readonly customer = signal<CustomerDashboard | null>(null);
+  protected readonly filterPlants = signal<DashboardFilterPlant[]>([]);
   protected readonly manufacturers = signal<Manufacturer[]>([]);
   protected readonly reports = signal<ReportRead[]>([]);
   protected readonly isLoading = signal(false);
   protected readonly errorMessage = signal('');
-  protected readonly reportError = signal('');
   protected readonly showPlantForm = signal(false);
   protected readonly plantError = signal('');
   protected readonly plantSuccess = signal('');
@@ -41,10 +39,8 @@ export class CustomerDetailPage implements OnInit {
 
   constructor(
     private readonly customersService: CustomersService,
-    private readonly clientsService: ClientsService,
     private readonly filterPlantsService: FilterPlantsService,
     private readonly manufacturersService: ManufacturersService,
-    private readonly reportsService: ReportsService,
     private readonly route: ActivatedRoute
   ) {}
 
@@ -61,44 +57,21 @@ export class CustomerDetailPage implements OnInit {
       this.showPlantSuccess(`Filteranlage "${state.deletedPlant}" wurde gelöscht.`);
     }
 
+    // The dashboard carries the client name, the plants with their
+    // manufacturers and the latest reports, so the page needs one request.
     this.isLoading.set(true);
-    this.customersService.getCustomer(id).subscribe({
-      next: (customer) => {
-        this.customer.set(customer);
+    this.customersService.getDashboard(id).subscribe({
+      next: (dashboard) => {
+        this.customer.set(dashboard);
+        this.filterPlants.set(dashboard.filter_plants);
+        this.reports.set(dashboard.latest_reports);
         this.isLoading.set(false);
-        this.loadFilterPlants(customer.id);
-        this.loadReports(customer.id);
       },
       error: () => {
         this.errorMessage.set('Kunde nicht gefunden.');
         this.isLoading.set(false);
       },
     });
-
-    this.loadClients();
-    this.loadManufacturers();
-  }
-
-  private loadFilterPlants(customerId: number): void {
-    this.filterPlantsService.listFilterPlants(customerId).subscribe({
-      next: (plants) => {
-        this.filterPlants.set(plants);
-      },
-      error: () => {
-        this.errorMessage.set('Filteranlagen konnten nicht geladen werden.');
-      },
-    });
-  }
-
-  private loadReports(customerId: number): void {
-    this.reportsService.listCustomerReports(customerId).subscribe({
-      next: (reports) => {
-        this.reports.set(reports);
-      },
-      error: () => {
-        this.reportError.set('Berichte konnten nicht geladen werden.');
-      },
-    });
   }
 
   private loadManufacturers(): void {
@@ -112,31 +85,14 @@ export class CustomerDetailPage implements OnInit {
     });
   }
 
-  private loadClients(): void {
-    this.clientsService.listClients().subscribe({
-      next: (clients) => {
-        this.clients.set(clients);
-      },
-      error: () => {
-        this.errorMessage.set('Auftraggeber konnten nicht geladen werden.');
-      },
-    });
-  }
-
-  getManufacturerName(manufacturerId: number): string {
-    const match = this.manufacturers().find((item) => item.id === manufacturerId);
-    return match ? match.name : 'Unbekannt';
-  }
-
-  getClientName(clientId: number): string {
-    const match = this.clients().find((client) => client.id === clientId);
-    return match ? match.name : 'Unbekannt';
-  }
-
   togglePlantForm(): void {
     this.plantError.set('');
     this.plantSuccess.set('');
     this.showPlantForm.set(!this.showPlantForm());
+    // Only the form needs the manufacturers, so they load when it first opens.
+    if (this.showPlantForm() && this.manufacturers().length === 0) {
+      this.loadManufacturers();
+    }
   }
 
   createFilterPlant(): void {
@@ -172,7 +128,20 @@ export class CustomerDetailPage implements OnInit {
 
     this.filterPlantsService.createFilterPlant(customer.id, payload).subscribe({
         next: (plant) => {
-          this.filterPlants.update((items) => [...items, plant]);
+          const manufacturer = this.manufacturers().find(
+            (item) => item.id === plant.manufacturer_id
+          );
+          this.filterPlants.update((items) => [
+            ...items,
+            {
+              ...plant,
+              manufacturer_name: manufacturer?.name ?? 'Unbekannt',
+              components: [],
+              report_count: 0,
+              open_report_count: 0,
+              latest_report: null,
+            },
+          ]);
           this.plantDescription = '';
           this.plantYear = null;
           this.selectedManufacturerId = null;
@@ -41,17 +41,27 @@ describe('CustomerEditPage', () => {
     expect(clientsRequest.request.method).toBe('GET');
     clientsRequest.flush([{ id: 4, name: 'Auftraggeber A' }]);
 
-    const request = httpMock.expectOne('http://localhost:8000/customers');
+    const request = httpMock.expectOne('http://localhost:8000/customers/7');
     expect(request.request.method).toBe('GET');
-    request.flush([
-      { id: 3, name: 'Redwood Filters', client_id: 4 },
-      { id: 7, name: 'Nova Filters', client_id: 4 },
-    ]);
+    request.flush({ id: 7, name: 'Nova Filters', client_id: 4 });
 
     fixture.detectChanges();
     const compiled = fixture.nativeElement as HTMLElement;
     expect(compiled.textContent).toContain('Nova Filters');
-    expect(compiled.textContent).not.toContain('Redwood Filters');
+  });
+
+  it('should report a missing customer', () => {
+    const fixture = TestBed.createComponent(CustomerEditPage);
+    fixture.detectChanges();
+
+    httpMock.expectOne('http://localhost:8000/clients').flush([]);
+    httpMock
+      .expectOne('http://localhost:8000/customers/7')
+      .flush(null, { status: 404, statusText: 'Not Found' });
+
+    fixture.detectChanges();
+    const compiled = fixture.nativeElement as HTMLElement;
+    expect(compiled.textContent).toContain('Kunde nicht gefunden.');
   });
 
   it('should delete selected customer after confirmation', () => {
@@ -61,11 +71,8 @@ describe('CustomerEditPage', () => {
     const clientsRequest = httpMock.expectOne('http://localhost:8000/clients');
     clientsRequest.flush([{ id: 4, name: 'Auftraggeber A' }]);
 
-    const request = httpMock.expectOne('http://localhost:8000/customers');
-    request.flush([
-      { id: 7, name: 'Nova Filters', client_id: 4 },
-      { id: 9, name: 'Orion Filters', client_id: 4 },
-    ]);
+    const request = httpMock.expectOne('http://localhost:8000/customers/7');
+    request.flush({ id: 7, name: 'Nova Filters', client_id: 4 });
 
     const component = fixture.componentInstance as CustomerEditPage & {
       promptDelete: () => void;
@@ -91,11 +98,8 @@ describe('CustomerEditPage', () => {
     const clientsRequest = httpMock.expectOne('http://localhost:8000/clients');
     clientsRequest.flush([{ id: 4, name: 'Auftraggeber A' }]);
 
-    const request = httpMock.expectOne('http://localhost:8000/customers');
-    request.flush([
-      { id: 7, name: 'Nova Filters', client_id: 4 },
-      { id: 9, name: 'Orion Filters', client_id: 4 },
-    ]);
+    const request = httpMock.expectOne('http://localhost:8000/customers/7');
+    request.flush({ id: 7, name: 'Nova Filters', client_id: 4 });
 
     const component = fixture.componentInstance as CustomerEditPage & {
       promptDelete: () => void;
@@ -126,11 +130,8 @@ describe('CustomerEditPage', () => {
     const clientsRequest = httpMock.expectOne('http://localhost:8000/clients');
     clientsRequest.flush([{ id: 4, name: 'Auftraggeber A' }]);
 
-    const request = httpMock.expectOne('http://localhost:8000/customers');
-    request.flush([
-      { id: 7, name: 'Nova Filters', client_id: 4 },
-      { id: 9, name: 'Orion Filters', client_id: 4 },
-    ]);
+    const request = httpMock.expectOne('http://localhost:8000/customers/7');
+    request.flush({ id: 7, name: 'Nova Filters', client_id: 4 });
 
     const component = fixture.componentInstance as CustomerEditPage & {
       editName: string;
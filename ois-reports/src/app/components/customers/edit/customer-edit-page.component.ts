@@ -1,4 +1,5 @@
 import { CommonModule } from '@angular/common';
+import { HttpErrorResponse } from '@angular/common/http';
 import { Component, OnInit, signal } from '@angular/core';
 import { FormsModule } from '@angular/forms';
 import { ActivatedRoute, Router, RouterLink } from '@angular/router';
@@ -14,7 +15,6 @@ import { Client, ClientsService } from '../../../services/clients/clients.servic
   styleUrl: './customer-edit-page.component.scss',
 })
 export class CustomerEditPage implements OnInit {
-  protected readonly customers = signal<Customer[]>([]);
   protected readonly clients = signal<Client[]>([]);
   protected readonly isLoading = signal(false);
   protected readonly errorMessage = signal('');
@@ -35,7 +35,7 @@ export class CustomerEditPage implements OnInit {
 
   ngOnInit(): void {
     this.loadClients();
-    this.loadCustomers();
+    this.loadCustomer();
   }
 
   loadClients(): void {
@@ -49,31 +49,28 @@ export class CustomerEditPage implements OnInit {
     });
   }
 
-  loadCustomers(): void {
+  loadCustomer(): void {
+    const idParam = this.route.snapshot.paramMap.get('id');
+    const id = idParam ? Number(idParam) : null;
+    if (!id) {
+      return;
+    }
+
     this.isLoading.set(true);
     this.errorMessage.set('');
 
-    this.customersService.listCustomers().subscribe({
-      next: (customers) => {
-        this.customers.set(customers);
+    this.customersService.getCustomer(id).subscribe({
+      next: (customer) => {
+        this.editMode.set(true);
+        this.selectedCustomer.set(customer);
+        this.editName = customer.name;
+        this.selectedClientId = customer.client_id;
         this.isLoading.set(false);
-
-        const idParam = this.route.snapshot.paramMap.get('id');
-        const id = idParam ? Number(idParam) : null;
-        if (id) {
-          const match = customers.find((item) => item.id === id);
-          if (match) {
-            this.editMode.set(true);
-            this.selectedCustomer.set(match);
-            this.editName = match.name;
-            this.selectedClientId = match.client_id;
-          } else {
-            this.errorMessage.set('Kunde nicht gefunden.');
-          }
-        }
       },
-      error: () => {
-        this.errorMessage.set('Kunde konnte nicht geladen werden.');
+      error: (error: HttpErrorResponse) => {
+        this.errorMessage.set(
+          error.status === 404 ? 'Kunde nicht gefunden.' : 'Kunde konnte nicht geladen werden.'
+        );
         this.isLoading.set(false);
       },
     });
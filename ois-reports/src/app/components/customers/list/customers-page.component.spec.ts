@@ -41,6 +41,32 @@ describe('CustomersPage', () => {
     expect(compiled.textContent).toContain('Auftraggeber A');
   });
 
+  it('should load the next page on demand', () => {
+    const fixture = TestBed.createComponent(CustomersPage);
+    fixture.detectChanges();
+
+    httpMock.expectOne('http://localhost:8000/clients').flush([]);
+    httpMock
+      .expectOne('http://localhost:8000/customers')
+      .flush([{ id: 1, name: 'Acme Industries', client_id: 10 }], {
+        headers: { 'X-Next-Cursor': 'abc' },
+      });
+
+    fixture.detectChanges();
+    const compiled = fixture.nativeElement as HTMLElement;
+    const moreButton = compiled.querySelector('.list__more') as HTMLButtonElement;
+    moreButton.click();
+
+    httpMock
+      .expectOne('http://localhost:8000/customers?cursor=abc')
+      .flush([{ id: 2, name: 'Nova Filters', client_id: 10 }]);
+
+    fixture.detectChanges();
+    expect(compiled.querySelectorAll('.list__row').length).toBe(2);
+    expect(compiled.textContent).toContain('Nova Filters');
+    expect(compiled.querySelector('.list__more')).toBeNull();
+  });
+
   it('should add a customer', () => {
     const fixture = TestBed.createComponent(CustomersPage);
     fixture.detectChanges();
@@ -16,7 +16,9 @@ import { Client, ClientsService } from '../../../services/clients/clients.servic
 export class CustomersPage implements OnInit {
   protected readonly customers = signal<Customer[]>([]);
   protected readonly clients = signal<Client[]>([]);
+  protected readonly nextCursor = signal<string | null>(null);
   protected readonly isLoading = signal(false);
+  protected readonly isLoadingMore = signal(false);
   protected readonly errorMessage = signal('');
   protected readonly successMessage = signal('');
   protected newCustomerName = '';
@@ -53,8 +55,9 @@ export class CustomersPage implements OnInit {
     this.errorMessage.set('');
 
     this.customersService.listCustomers().subscribe({
-      next: (customers) => {
-        this.customers.set(customers);
+      next: (page) => {
+        this.customers.set(page.items);
+        this.nextCursor.set(page.nextCursor);
         this.isLoading.set(false);
       },
       error: () => {
@@ -64,6 +67,28 @@ export class CustomersPage implements OnInit {
     });
   }
 
+  loadMoreCustomers(): void {
+    const cursor = this.nextCursor();
+    if (!cursor || this.isLoadingMore()) {
+      return;
+    }
+
+    this.isLoadingMore.set(true);
+    this.errorMessage.set('');
+
+    this.customersService.listCustomers(cursor).subscribe({
+      next: (page) => {
+        this.customers.update((items) => [...items, ...page.items]);
+        this.nextCursor.set(page.nextCursor);
+        this.isLoadingMore.set(false);
+      },
+      error: () => {
+        this.errorMessage.set('Weitere Kunden konnten nicht geladen werden.');
+        this.isLoadingMore.set(false);
+      },
+    });
+  }
+
   addCustomer(): void {
     const name = this.newCustomerName.trim();
     if (!name) {
@@ -78,7 +103,10 @@ export class CustomersPage implements OnInit {
 
     this.customersService.createCustomer(name, this.selectedClientId).subscribe({
       next: (customer) => {
-        this.customers.update((items) => [...items, customer]);
+        // With more pages left the new customer arrives with the last of them.
+        if (!this.nextCursor()) {
+          this.customers.update((items) => [...items, customer]);
+        }
         this.newCustomerName = '';
         this.selectedClientId = null;
         this.errorMessage.set('');
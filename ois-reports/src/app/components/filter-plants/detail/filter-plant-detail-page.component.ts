@@ -27,7 +27,9 @@ export class FilterPlantDetailPage implements OnInit {
   protected readonly plant = signal<FilterPlant | null>(null);
   protected readonly components = signal<PlantComponent[]>([]);
   protected readonly manufacturers = signal<Manufacturer[]>([]);
+  protected readonly nextCursor = signal<string | null>(null);
   protected readonly isLoading = signal(false);
+  protected readonly isLoadingMore = signal(false);
   protected readonly errorMessage = signal('');
   protected readonly showComponentForm = signal(false);
   protected readonly componentError = signal('');
@@ -95,8 +97,9 @@ export class FilterPlantDetailPage implements OnInit {
 
   private loadComponents(filterPlantId: number): void {
     this.componentsService.listComponents(filterPlantId).subscribe({
-      next: (components) => {
-        this.components.set(components);
+      next: (page) => {
+        this.components.set(page.items);
+        this.nextCursor.set(page.nextCursor);
       },
       error: () => {
         this.errorMessage.set('Komponenten konnten nicht geladen werden.');
@@ -104,6 +107,27 @@ export class FilterPlantDetailPage implements OnInit {
     });
   }
 
+  loadMoreComponents(): void {
+    const plant = this.plant();
+    const cursor = this.nextCursor();
+    if (!plant || !cursor || this.isLoadingMore()) {
+      return;
+    }
+
+    this.isLoadingMore.set(true);
+    this.componentsService.listComponents(plant.id, cursor).subscribe({
+      next: (page) => {
+        this.components.update((items) => [...items, ...page.items]);
+        this.nextCursor.set(page.nextCursor);
+        this.isLoadingMore.set(false);
+      },
+      error: () => {
+        this.errorMessage.set('Weitere Komponenten konnten nicht geladen werden.');
+        this.isLoadingMore.set(false);
+      },
+    });
+  }
+
   toggleComponentForm(): void {
     this.componentError.set('');
     this.componentSuccess.set('');
@@ -124,7 +148,10 @@ export class FilterPlantDetailPage implements OnInit {
 
     this.componentsService.createComponent(plant.id, { name }).subscribe({
       next: (component) => {
-        this.components.update((items) => [...items, component]);
+        // With more pages left the new component arrives with the last of them.
+        if (!this.nextCursor()) {
+          this.components.update((items) => [...items, component]);
+        }
         this.componentName = '';
         this.componentError.set('');
         this.showComponentForm.set(false);
@@ -21,7 +21,9 @@ import {
 export class ManufacturerDetailPage implements OnInit {
   protected readonly manufacturer = signal<Manufacturer | null>(null);
   protected readonly filterPlants = signal<FilterPlant[]>([]);
+  protected readonly nextCursor = signal<string | null>(null);
   protected readonly isLoading = signal(false);
+  protected readonly isLoadingMore = signal(false);
   protected readonly errorMessage = signal('');
 
   constructor(
@@ -52,10 +54,32 @@ export class ManufacturerDetailPage implements OnInit {
     });
   }
 
+  loadMoreFilterPlants(): void {
+    const manufacturer = this.manufacturer();
+    const cursor = this.nextCursor();
+    if (!manufacturer || !cursor || this.isLoadingMore()) {
+      return;
+    }
+
+    this.isLoadingMore.set(true);
+    this.filterPlantsService.listFilterPlantsByManufacturer(manufacturer.id, cursor).subscribe({
+      next: (page) => {
+        this.filterPlants.update((items) => [...items, ...page.items]);
+        this.nextCursor.set(page.nextCursor);
+        this.isLoadingMore.set(false);
+      },
+      error: () => {
+        this.errorMessage.set('Weitere Filteranlagen konnten nicht geladen werden.');
+        this.isLoadingMore.set(false);
+      },
+    });
+  }
+
   private loadFilterPlants(manufacturerId: number): void {
     this.filterPlantsService.listFilterPlantsByManufacturer(manufacturerId).subscribe({
-      next: (plants) => {
-        this.filterPlants.set(plants);
+      next: (page) => {
+        this.filterPlants.set(page.items);
+        this.nextCursor.set(page.nextCursor);
       },
       error: () => {
         this.errorMessage.set('Filteranlagen konnten nicht geladen werden.');
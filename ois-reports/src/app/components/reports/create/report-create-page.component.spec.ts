@@ -45,7 +45,9 @@ describe('ReportCreatePage', () => {
     expect(customerRequest.request.method).toBe('GET');
     customerRequest.flush({ id: 4, name: 'Kunde A', client_id: 1 });
 
-    const plantRequest = httpMock.expectOne('http://localhost:8000/filter-plants/11');
+    const plantRequest = httpMock.expectOne(
+      'http://localhost:8000/filter-plants/11?include=components'
+    );
     expect(plantRequest.request.method).toBe('GET');
     plantRequest.flush({
       id: 11,
@@ -53,12 +55,9 @@ describe('ReportCreatePage', () => {
       manufacturer_id: 2,
       description: 'Filteranlage X',
       year_built: 2020,
+      components: [{ id: 5, filter_plant_id: 11, name: 'Pumpe A' }],
     });
 
-    const request = httpMock.expectOne('http://localhost:8000/filter-plants/11/components');
-    expect(request.request.method).toBe('GET');
-    request.flush([{ id: 5, filter_plant_id: 11, name: 'Pumpe A' }]);
-
     fixture.detectChanges();
     const compiled = fixture.nativeElement as HTMLElement;
     expect(compiled.textContent).toContain('Pumpe A');
@@ -74,18 +73,18 @@ describe('ReportCreatePage', () => {
     const customerRequest = httpMock.expectOne('http://localhost:8000/customers/4');
     customerRequest.flush({ id: 4, name: 'Kunde A', client_id: 1 });
 
-    const plantRequest = httpMock.expectOne('http://localhost:8000/filter-plants/11');
+    const plantRequest = httpMock.expectOne(
+      'http://localhost:8000/filter-plants/11?include=components'
+    );
     plantRequest.flush({
       id: 11,
       customer_id: 4,
       manufacturer_id: 2,
       description: 'Filteranlage X',
       year_built: 2020,
+      components: [{ id: 5, filter_plant_id: 11, name: 'Pumpe A' }],
     });
 
-    const request = httpMock.expectOne('http://localhost:8000/filter-plants/11/components');
-    request.flush([{ id: 5, filter_plant_id: 11, name: 'Pumpe A' }]);
-
     const component = fixture.componentInstance as ReportCreatePage & {
       saveReport: () => void;
       components: () => { id: number; name: string; description: string }[];
@@ -3,10 +3,6 @@ import { Component, OnInit, signal } from '@angular/core';
 import { FormsModule } from '@angular/forms';
 import { ActivatedRoute, Router, RouterLink } from '@angular/router';
 
-import {
-  Component as PlantComponent,
-  ComponentsService,
-} from '../../../services/components/components.service';
 import { Client, ClientsService } from '../../../services/clients/clients.service';
 import { Customer, CustomersService } from '../../../services/customers/customers.service';
 import {
@@ -42,7 +38,6 @@ export class ReportCreatePage implements OnInit {
   private successTimer: number | null = null;
 
   constructor(
-    private readonly componentsService: ComponentsService,
     private readonly clientsService: ClientsService,
     private readonly customersService: CustomersService,
     private readonly filterPlantsService: FilterPlantsService,
@@ -65,24 +60,6 @@ export class ReportCreatePage implements OnInit {
     this.loadClients();
     this.loadCustomer();
     this.loadPlant();
-
-    this.isLoading.set(true);
-    this.componentsService.listComponents(this.plantId).subscribe({
-      next: (components) => {
-        this.components.set(
-          components.map((component) => ({
-            id: component.id,
-            name: component.name,
-            description: '',
-          }))
-        );
-        this.isLoading.set(false);
-      },
-      error: () => {
-        this.errorMessage.set('Komponenten konnten nicht geladen werden.');
-        this.isLoading.set(false);
-      },
-    });
   }
 
   private loadClients(): void {
@@ -115,12 +92,24 @@ export class ReportCreatePage implements OnInit {
     if (!this.plantId) {
       return;
     }
-    this.filterPlantsService.getFilterPlant(this.plantId).subscribe({
-      next: (plant) => {
+    // The report needs every component, so they come embedded in the plant
+    // rather than page by page.
+    this.isLoading.set(true);
+    this.filterPlantsService.getFilterPlantWithComponents(this.plantId).subscribe({
+      next: ({ components, ...plant }) => {
         this.plant.set(plant);
+        this.components.set(
+          components.map((component) => ({
+            id: component.id,
+            name: component.name,
+            description: '',
+          }))
+        );
+        this.isLoading.set(false);
       },
       error: () => {
         this.errorMessage.set('Filteranlage konnte nicht geladen werden.');
+        this.isLoading.set(false);
       },
     });
   }
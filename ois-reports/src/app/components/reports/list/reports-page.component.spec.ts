@@ -46,4 +46,31 @@ describe('ReportsPage', () => {
     expect(compiled.textContent).toContain('Filteranlage A');
     expect(compiled.textContent).toContain('Abgeschlossen');
   });
+
+  it('should append the next page on demand', () => {
+    const fixture = TestBed.createComponent(ReportsPage);
+    fixture.detectChanges();
+
+    const report = {
+      customer_id: 4,
+      customer_name: 'Aqua Filters',
+      filter_plant_id: 11,
+      filter_plant_description: 'Filteranlage A',
+      created_at: '2025-01-01T10:00:00Z',
+      completed: false,
+    };
+    httpMock
+      .expectOne('http://localhost:8000/reports')
+      .flush([{ ...report, id: 2 }], { headers: { 'X-Next-Cursor': 'abc' } });
+
+    fixture.detectChanges();
+    const compiled = fixture.nativeElement as HTMLElement;
+    (compiled.querySelector('.list__more') as HTMLButtonElement).click();
+
+    httpMock.expectOne('http://localhost:8000/reports?cursor=abc').flush([{ ...report, id: 1 }]);
+
+    fixture.detectChanges();
+    expect(compiled.querySelectorAll('.list__row').length).toBe(2);
+    expect(compiled.querySelector('.list__more')).toBeNull();
+  });
 });
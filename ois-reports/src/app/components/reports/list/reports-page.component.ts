@@ -13,7 +13,9 @@ import { ReportsService, ReportRead } from '../../../services/reports/reports.se
 })
 export class ReportsPage implements OnInit {
   protected readonly reports = signal<ReportRead[]>([]);
+  protected readonly nextCursor = signal<string | null>(null);
   protected readonly isLoading = signal(false);
+  protected readonly isLoadingMore = signal(false);
   protected readonly errorMessage = signal('');
 
   constructor(private readonly reportsService: ReportsService) {}
@@ -21,8 +23,9 @@ export class ReportsPage implements OnInit {
   ngOnInit(): void {
     this.isLoading.set(true);
     this.reportsService.listReports().subscribe({
-      next: (reports) => {
-        this.reports.set(reports);
+      next: (page) => {
+        this.reports.set(page.items);
+        this.nextCursor.set(page.nextCursor);
         this.isLoading.set(false);
       },
       error: () => {
@@ -31,4 +34,25 @@ export class ReportsPage implements OnInit {
       },
     });
   }
+
+  loadMoreReports(): void {
+    const cursor = this.nextCursor();
+    if (!cursor || this.isLoadingMore()) {
+      return;
+    }
+
+    this.isLoadingMore.set(true);
+    this.errorMessage.set('');
+    this.reportsService.listReports(cursor).subscribe({
+      next: (page) => {
+        this.reports.update((items) => [...items, ...page.items]);
+        this.nextCursor.set(page.nextCursor);
+        this.isLoadingMore.set(false);
+      },
+      error: () => {
+        this.errorMessage.set('Weitere Berichte konnten nicht geladen werden.');
+        this.isLoadingMore.set(false);
+      },
+    });
+  }
 }
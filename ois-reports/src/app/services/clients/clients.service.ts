@@ -1,6 +1,8 @@
 import { HttpClient } from '@angular/common/http';
 import { inject, Injectable } from '@angular/core';
 
+import { getAllPages } from '../pagination';
+
 export type Client = {
   id: number;
   name: string;
@@ -10,16 +12,17 @@ export type Client = {
 export class ClientsService {
   private readonly http = inject(HttpClient);
   private readonly baseUrl = 'http://localhost:8000';
+  private readonly options = { withCredentials: true };
 
   listClients() {
-    return this.http.get<Client[]>(`${this.baseUrl}/clients`);
+    return getAllPages<Client>(this.http, `${this.baseUrl}/clients`, this.options);
   }
 
   getClient(clientId: number) {
-    return this.http.get<Client>(`${this.baseUrl}/clients/${clientId}`);
+    return this.http.get<Client>(`${this.baseUrl}/clients/${clientId}`, this.options);
   }
 
   createClient(name: string) {
-    return this.http.post<Client>(`${this.baseUrl}/clients`, { name });
+    return this.http.post<Client>(`${this.baseUrl}/clients`, { name }, this.options);
   }
 }
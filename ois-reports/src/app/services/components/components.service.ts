@@ -1,6 +1,8 @@
 import { HttpClient } from '@angular/common/http';
 import { inject, Injectable } from '@angular/core';
 
+import { getPage } from '../pagination';
+
 export type Component = {
   id: number;
   filter_plant_id: number;
@@ -15,29 +17,38 @@ export type ComponentCreate = {
 export class ComponentsService {
   private readonly http = inject(HttpClient);
   private readonly baseUrl = 'http://localhost:8000';
+  private readonly options = { withCredentials: true };
 
-  listComponents(filterPlantId: number) {
-    return this.http.get<Component[]>(
-      `${this.baseUrl}/filter-plants/${filterPlantId}/components`
+  listComponents(filterPlantId: number, cursor: string | null = null) {
+    return getPage<Component>(
+      this.http,
+      `${this.baseUrl}/filter-plants/${filterPlantId}/components`,
+      this.options,
+      cursor
     );
   }
 
   createComponent(filterPlantId: number, payload: ComponentCreate) {
     return this.http.post<Component>(
       `${this.baseUrl}/filter-plants/${filterPlantId}/components`,
-      payload
+      payload,
+      this.options
     );
   }
 
   getComponent(componentId: number) {
-    return this.http.get<Component>(`${this.baseUrl}/components/${componentId}`);
+    return this.http.get<Component>(`${this.baseUrl}/components/${componentId}`, this.options);
   }
 
   updateComponent(componentId: number, payload: ComponentCreate) {
-    return this.http.patch<Component>(`${this.baseUrl}/components/${componentId}`, payload);
+    return this.http.patch<Component>(
+      `${this.baseUrl}/components/${componentId}`,
+      payload,
+      this.options
+    );
   }
 
   deleteComponent(componentId: number) {
-    return this.http.delete(`${this.baseUrl}/components/${componentId}`);
+    return this.http.delete(`${this.baseUrl}/components/${componentId}`, this.options);
   }
 }
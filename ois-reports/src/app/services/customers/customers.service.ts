@@ -1,40 +1,71 @@
 import { HttpClient } from '@angular/common/http';
 import { inject, Injectable } from '@angular/core';
 
+import { Component } from '../components/components.service';
+import { FilterPlant } from '../filter-plants/filter-plants.service';
+import { getPage } from '../pagination';
+import { ReportRead } from '../reports/reports.service';
+
 export type Customer = {
   id: number;
   name: string;
   client_id: number;
 };
 
+export type DashboardFilterPlant = FilterPlant & {
+  manufacturer_name: string;
+  components: Component[];
+  report_count: number;
+  open_report_count: number;
+  latest_report: Pick<ReportRead, 'id' | 'created_at' | 'completed'> | null;
+};
+
+export type CustomerDashboard = Customer & {
+  client_name: string;
+  filter_plants: DashboardFilterPlant[];
+  report_count: number;
+  open_report_count: number;
+  latest_reports: ReportRead[];
+};
+
 @Injectable({ providedIn: 'root' })
 export class CustomersService {
   private readonly http = inject(HttpClient);
   private readonly baseUrl = 'http://localhost:8000';
+  private readonly options = { withCredentials: true };
 
-  listCustomers() {
-    return this.http.get<Customer[]>(`${this.baseUrl}/customers`);
+  listCustomers(cursor: string | null = null) {
+    return getPage<Customer>(this.http, `${this.baseUrl}/customers`, this.options, cursor);
   }
 
   getCustomer(id: number) {
-    return this.http.get<Customer>(`${this.baseUrl}/customers/${id}`);
+    return this.http.get<Customer>(`${this.baseUrl}/customers/${id}`, this.options);
+  }
+
+  getDashboard(id: number) {
+    return this.http.get<CustomerDashboard>(
+      `${this.baseUrl}/customers/${id}/dashboard`,
+      this.options
+    );
   }
 
   createCustomer(name: string, clientId: number) {
-    return this.http.post<Customer>(`${this.baseUrl}/customers`, {
-      name,
-      client_id: clientId,
-    });
+    return this.http.post<Customer>(
+      `${this.baseUrl}/customers`,
+      { name, client_id: clientId },
+      this.options
+    );
   }
 
   deleteCustomer(id: number) {
-    return this.http.delete(`${this.baseUrl}/customers/${id}`);
+    return this.http.delete(`${this.baseUrl}/customers/${id}`, this.options);
   }
 
   updateCustomer(id: number, name: string, clientId: number) {
-    return this.http.patch<Customer>(`${this.baseUrl}/customers/${id}`, {
-      name,
-      client_id: clientId,
-    });
+    return this.http.patch<Customer>(
+      `${this.baseUrl}/customers/${id}`,
+      { name, client_id: clientId },
+      this.options
+    );
   }
 }
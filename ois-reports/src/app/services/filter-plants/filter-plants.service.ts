@@ -1,6 +1,9 @@
 import { HttpClient } from '@angular/common/http';
 import { inject, Injectable } from '@angular/core';
 
+import { Component } from '../components/components.service';
+import { getPage } from '../pagination';
+
 export type FilterPlant = {
   id: number;
   customer_id: number;
@@ -9,6 +12,10 @@ export type FilterPlant = {
   year_built: number;
 };
 
+export type FilterPlantWithComponents = FilterPlant & {
+  components: Component[];
+};
+
 export type FilterPlantCreate = {
   description: string;
   year_built: number;
@@ -19,33 +26,58 @@ export type FilterPlantCreate = {
 export class FilterPlantsService {
   private readonly http = inject(HttpClient);
   private readonly baseUrl = 'http://localhost:8000';
+  private readonly options = { withCredentials: true };
 
-  listFilterPlants(customerId: number) {
-    return this.http.get<FilterPlant[]>(`${this.baseUrl}/customers/${customerId}/filter-plants`);
+  listFilterPlants(customerId: number, cursor: string | null = null) {
+    return getPage<FilterPlant>(
+      this.http,
+      `${this.baseUrl}/customers/${customerId}/filter-plants`,
+      this.options,
+      cursor
+    );
   }
 
-  listFilterPlantsByManufacturer(manufacturerId: number) {
-    return this.http.get<FilterPlant[]>(
-      `${this.baseUrl}/manufacturers/${manufacturerId}/filter-plants`
+  listFilterPlantsByManufacturer(manufacturerId: number, cursor: string | null = null) {
+    return getPage<FilterPlant>(
+      this.http,
+      `${this.baseUrl}/manufacturers/${manufacturerId}/filter-plants`,
+      this.options,
+      cursor
     );
   }
 
   createFilterPlant(customerId: number, payload: FilterPlantCreate) {
     return this.http.post<FilterPlant>(
       `${this.baseUrl}/customers/${customerId}/filter-plants`,
-      payload
+      payload,
+      this.options
     );
   }
 
   getFilterPlant(filterPlantId: number) {
-    return this.http.get<FilterPlant>(`${this.baseUrl}/filter-plants/${filterPlantId}`);
+    return this.http.get<FilterPlant>(
+      `${this.baseUrl}/filter-plants/${filterPlantId}`,
+      this.options
+    );
+  }
+
+  /** The plant with all of its components embedded, in one request. */
+  getFilterPlantWithComponents(filterPlantId: number) {
+    return this.http.get<FilterPlantWithComponents>(
+      `${this.baseUrl}/filter-plants/${filterPlantId}`,
+      { ...this.options, params: { include: 'components' } }
+    );
   }
 
   updateFilterPlant(filterPlantId: number, payload: FilterPlantCreate) {
-    return this.http.patch<FilterPlant>(`${this.baseUrl}/filter-plants/${filterPlantId}`, payload);
+    return this.http.patch<FilterPlant>(
+      `${this.baseUrl}/filter-plants/${filterPlantId}`,
+      payload,
+      this.options
+    );
   }
 
   deleteFilterPlant(filterPlantId: number) {
-    return this.http.delete(`${this.baseUrl}/filter-plants/${filterPlantId}`);
+    return this.http.delete(`${this.baseUrl}/filter-plants/${filterPlantId}`, this.options);
   }
 }
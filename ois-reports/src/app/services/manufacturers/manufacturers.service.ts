@@ -1,6 +1,8 @@
 import { HttpClient } from '@angular/common/http';
 import { inject, Injectable } from '@angular/core';
 
+import { getAllPages } from '../pagination';
+
 export type Manufacturer = {
   id: number;
   name: string;
@@ -10,16 +12,20 @@ export type Manufacturer = {
 export class ManufacturersService {
   private readonly http = inject(HttpClient);
   private readonly baseUrl = 'http://localhost:8000';
+  private readonly options = { withCredentials: true };
 
   listManufacturers() {
-    return this.http.get<Manufacturer[]>(`${this.baseUrl}/manufacturers`);
+    return getAllPages<Manufacturer>(this.http, `${this.baseUrl}/manufacturers`, this.options);
   }
 
   getManufacturer(manufacturerId: number) {
-    return this.http.get<Manufacturer>(`${this.baseUrl}/manufacturers/${manufacturerId}`);
+    return this.http.get<Manufacturer>(
+      `${this.baseUrl}/manufacturers/${manufacturerId}`,
+      this.options
+    );
   }
 
   createManufacturer(name: string) {
-    return this.http.post<Manufacturer>(`${this.baseUrl}/manufacturers`, { name });
+    return this.http.post<Manufacturer>(`${this.baseUrl}/manufacturers`, { name }, this.options);
   }
 }
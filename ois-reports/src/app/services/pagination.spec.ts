@@ -0,0 +1,80 @@
+import { HttpClient, provideHttpClient } from '@angular/common/http';
+import { provideHttpClientTesting, HttpTestingController } from '@angular/common/http/testing';
+import { TestBed } from '@angular/core/testing';
+
+import { getAllPages, getPage, Page } from './pagination';
+
+describe('getAllPages', () => {
+  let httpMock: HttpTestingController;
+
+  beforeEach(() => {
+    TestBed.configureTestingModule({
+      providers: [provideHttpClient(), provideHttpClientTesting()],
+    });
+
+    httpMock = TestBed.inject(HttpTestingController);
+  });
+
+  afterEach(() => {
+    httpMock.verify();
+  });
+
+  it('should follow the next cursor until the last page', () => {
+    const http = TestBed.inject(HttpClient);
+    let items: number[] | undefined;
+    getAllPages<number>(http, 'http://localhost:8000/clients', { withCredentials: true }).subscribe(
+      (result) => (items = result)
+    );
+
+    const first = httpMock.expectOne('http://localhost:8000/clients');
+    expect(first.request.withCredentials).toBe(true);
+    first.flush([1, 2], { headers: { 'X-Next-Cursor': 'abc' } });
+    expect(items).toBeUndefined();
+
+    const second = httpMock.expectOne('http://localhost:8000/clients?cursor=abc');
+    expect(second.request.withCredentials).toBe(true);
+    second.flush([3]);
+
+    expect(items).toEqual([1, 2, 3]);
+  });
+});
+
+describe('getPage', () => {
+  let httpMock: HttpTestingController;
+
+  beforeEach(() => {
+    TestBed.configureTestingModule({
+      providers: [provideHttpClient(), provideHttpClientTesting()],
+    });
+
+    httpMock = TestBed.inject(HttpTestingController);
+  });
+
+  afterEach(() => {
+    httpMock.verify();
+  });
+
+  it('should load only the page at the given cursor', () => {
+    const http = TestBed.inject(HttpClient);
+    let page: Page<number> | undefined;
+    getPage<number>(http, 'http://localhost:8000/reports', {}, 'abc').subscribe(
+      (result) => (page = result)
+    );
+
+    httpMock
+      .expectOne('http://localhost:8000/reports?cursor=abc')
+      .flush([3, 4], { headers: { 'X-Next-Cursor': 'def' } });
+
+    expect(page).toEqual({ items: [3, 4], nextCursor: 'def' });
+  });
+
+  it('should report no next cursor on the last page', () => {
+    const http = TestBed.inject(HttpClient);
+    let page: Page<number> | undefined;
+    getPage<number>(http, 'http://localhost:8000/reports').subscribe((result) => (page = result));
+
+    httpMock.expectOne('http://localhost:8000/reports').flush([1]);
+
+    expect(page).toEqual({ items: [1], nextCursor: null });
+  });
+});
@@ -0,0 +1,48 @@
+import { HttpClient, HttpParams } from '@angular/common/http';
+import { EMPTY, expand, map, Observable, reduce } from 'rxjs';
+
+export const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+/** One page of a list endpoint; `nextCursor` is null on the last page. */
+export type Page<T> = {
+  items: T[];
+  nextCursor: string | null;
+};
+
+/** Loads the page of a list endpoint that starts at `cursor`, or the first page without one. */
+export function getPage<T>(
+  http: HttpClient,
+  url: string,
+  options: { withCredentials?: boolean } = {},
+  cursor: string | null = null
+): Observable<Page<T>> {
+  return http
+    .get<T[]>(url, {
+      ...options,
+      observe: 'response',
+      params: cursor ? new HttpParams().set('cursor', cursor) : undefined,
+    })
+    .pipe(
+      map((response) => ({
+        items: response.body ?? [],
+        nextCursor: response.headers.get(NEXT_CURSOR_HEADER),
+      }))
+    );
+}
+
+/**
+ * Loads every page of a list endpoint by following its `X-Next-Cursor` header.
+ *
+ * Only meant for the small reference lists (clients, manufacturers) that fill
+ * select boxes; everything else is loaded page by page with `getPage`.
+ */
+export function getAllPages<T>(
+  http: HttpClient,
+  url: string,
+  options: { withCredentials?: boolean } = {}
+): Observable<T[]> {
+  return getPage<T>(http, url, options).pipe(
+    expand((page) => (page.nextCursor ? getPage<T>(http, url, options, page.nextCursor) : EMPTY)),
+    reduce((items: T[], page) => items.concat(page.items), [])
+  );
+}
@@ -1,6 +1,8 @@
 import { HttpClient } from '@angular/common/http';
 import { inject, Injectable } from '@angular/core';
 
+import { getPage } from '../pagination';
+
 export type ReportComponentCreate = {
   component_id: number;
   description: string;
@@ -39,27 +41,38 @@ export type ReportUpdate = {
 export class ReportsService {
   private readonly http = inject(HttpClient);
   private readonly baseUrl = 'http://localhost:8000';
+  private readonly options = { withCredentials: true };
 
   createReport(customerId: number, filterPlantId: number, payload: ReportCreate) {
     return this.http.post<ReportRead>(
       `${this.baseUrl}/customers/${customerId}/filter-plants/${filterPlantId}/reports`,
-      payload
+      payload,
+      this.options
     );
   }
 
-  listReports() {
-    return this.http.get<ReportRead[]>(`${this.baseUrl}/reports`);
+  listReports(cursor: string | null = null) {
+    return getPage<ReportRead>(this.http, `${this.baseUrl}/reports`, this.options, cursor);
   }
 
-  listCustomerReports(customerId: number) {
-    return this.http.get<ReportRead[]>(`${this.baseUrl}/customers/${customerId}/reports`);
+  listCustomerReports(customerId: number, cursor: string | null = null) {
+    return getPage<ReportRead>(
+      this.http,
+      `${this.baseUrl}/customers/${customerId}/reports`,
+      this.options,
+      cursor
+    );
   }
 
   getReport(reportId: number) {
-    return this.http.get<ReportDetailRead>(`${this.baseUrl}/reports/${reportId}`);
+    return this.http.get<ReportDetailRead>(`${this.baseUrl}/reports/${reportId}`, this.options);
   }
 
   updateReport(reportId: number, payload: ReportUpdate) {
-    return this.http.patch<ReportDetailRead>(`${this.baseUrl}/reports/${reportId}`, payload);
+    return this.http.patch<ReportDetailRead>(
+      `${this.baseUrl}/reports/${reportId}`,
+      payload,
+      this.options
+    );
   }
 }